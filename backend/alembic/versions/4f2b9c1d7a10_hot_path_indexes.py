@@ -0,0 +1,129 @@
+"""Composite indexes for hot query paths
+
+Tables are created by `init_db` (create_all), which builds these indexes on a
+fresh database but never adds indexes to tables that already exist. This
+revision adds the missing ones to existing databases and is a no-op where they
+are already present. On PostgreSQL indexes are built CONCURRENTLY, so writes
+are not blocked while they build.
+
+Duplicate initiative-task links are merged (values move to the oldest link)
+before the (initiative_id, task_id) unique constraint is added.
+
+Revision ID: 4f2b9c1d7a10
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2b9c1d7a10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns)
+INDEXES = [
+    # Keyset pagination of list endpoints
+    ("ix_projects_org_created", "projects", ["org_id", "created_at", "id"]),
+    ("ix_tasks_org_start", "tasks", ["org_id", "start_date", "id"]),
+    ("ix_tasks_project_start", "tasks", ["project_id", "start_date", "id"]),
+    ("ix_tasks_assignee_start", "tasks", ["assignee_id", "start_date", "id"]),
+    ("ix_resources_org_name", "resources", ["org_id", "name", "id"]),
+    ("ix_initiatives_org_created", "initiatives", ["org_id", "created_at", "id"]),
+    ("ix_users_name", "users", ["name", "id"]),
+    ("ix_user_assignments_created", "user_assignments", ["created_at", "id"]),
+    # Foreign keys used by joins, selectinloads and cascading deletes
+    ("ix_tasks_predecessor", "tasks", ["predecessor_id"]),
+    ("ix_tasks_linked_initiative", "tasks", ["linked_initiative_id"]),
+    ("ix_task_market_status_task", "task_market_status", ["task_id", "market"]),
+    ("ix_launch_details_project", "launch_details", ["project_id", "market"]),
+    ("ix_input_gateways_launch_detail", "input_gateways", ["launch_detail_id"]),
+    ("ix_gateway_versions_gateway", "gateway_versions", ["gateway_id", "version_number"]),
+    ("ix_initiative_value_metrics_initiative", "initiative_value_metrics", ["initiative_id"]),
+    ("ix_initiative_task_links_task", "initiative_task_links", ["task_id"]),
+    ("ix_initiative_task_values_link", "initiative_task_values", ["link_id"]),
+    # Per-org template lookups
+    ("ix_task_templates_org", "task_templates", ["org_id", "team", "scale", "task_order"]),
+    ("ix_gateway_templates_org", "gateway_templates", ["org_id", "team", "scale"]),
+    ("ix_teams_org", "teams", ["org_id", "name"]),
+    ("ix_markets_org", "markets", ["org_id", "name"]),
+]
+
+LINK_UNIQUE = "uq_initiative_task_link"
+
+# Links with an older link for the same (initiative, task)
+REDUNDANT_LINKS = """
+    SELECT dup.id FROM initiative_task_links dup
+    WHERE EXISTS (
+        SELECT 1 FROM initiative_task_links keep
+        WHERE keep.initiative_id = dup.initiative_id
+          AND keep.task_id = dup.task_id
+          AND (keep.date_linked < dup.date_linked OR (keep.date_linked = dup.date_linked AND keep.id < dup.id))
+    )
+"""
+
+
+def existing_names(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    names = {index["name"] for index in inspector.get_indexes(table)}
+    names |= {constraint["name"] for constraint in inspector.get_unique_constraints(table)}
+    return names
+
+
+def merge_duplicate_links() -> None:
+    op.execute(f"""
+        UPDATE initiative_task_values SET link_id = (
+            SELECT keep.id FROM initiative_task_links keep
+            JOIN initiative_task_links dup
+              ON dup.initiative_id = keep.initiative_id AND dup.task_id = keep.task_id
+            WHERE dup.id = initiative_task_values.link_id
+            ORDER BY keep.date_linked, keep.id
+            LIMIT 1
+        )
+        WHERE link_id IN ({REDUNDANT_LINKS})
+    """)
+    op.execute(f"DELETE FROM initiative_task_links WHERE id IN ({REDUNDANT_LINKS})")
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == "postgresql"
+
+    if LINK_UNIQUE not in existing_names("initiative_task_links"):
+        merge_duplicate_links()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if name not in existing_names(table):
+                op.create_index(name, table, columns, postgresql_concurrently=postgresql)
+
+        if LINK_UNIQUE not in existing_names("initiative_task_links"):
+            op.create_index(
+                LINK_UNIQUE, "initiative_task_links", ["initiative_id", "task_id"],
+                unique=True, postgresql_concurrently=postgresql
+            )
+            if postgresql:
+                op.execute(
+                    f"ALTER TABLE initiative_task_links ADD CONSTRAINT {LINK_UNIQUE} UNIQUE USING INDEX {LINK_UNIQUE}"
+                )
+
+
+def downgrade() -> None:
+    postgresql = op.get_bind().dialect.name == "postgresql"
+
+    if LINK_UNIQUE in existing_names("initiative_task_links"):
+        if postgresql:
+            op.drop_constraint(LINK_UNIQUE, "initiative_task_links", type_="unique")
+        else:
+            op.drop_index(LINK_UNIQUE, "initiative_task_links")
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            if name in existing_names(table):
+                op.drop_index(name, table, postgresql_concurrently=postgresql)
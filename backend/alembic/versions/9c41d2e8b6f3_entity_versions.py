@@ -0,0 +1,43 @@
+"""Version numbers on projects and tasks
+
+Real-time events carry deltas between entity versions; existing rows start at
+version 1. A no-op where the columns already exist (databases created by
+`init_db` after this change).
+
+Revision ID: 9c41d2e8b6f3
+Revises: 4f2b9c1d7a10
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c41d2e8b6f3"
+down_revision: Union[str, None] = "4f2b9c1d7a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ["projects", "tasks"]
+
+
+def has_version(table: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(column["name"] == "version" for column in inspector.get_columns(table))
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        if not has_version(table):
+            op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        if has_version(table):
+            with op.batch_alter_table(table) as batch:
+                batch.drop_column("version")
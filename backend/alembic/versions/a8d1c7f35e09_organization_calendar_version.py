@@ -0,0 +1,42 @@
+"""Calendar version on organizations
+
+Bumped with every change to an org's work week or holidays, in the same
+transaction, so compiled calendars cached by each worker are keyed on the
+calendar they were compiled from. A no-op where the column already exists
+(databases created by `init_db` after this change).
+
+Revision ID: a8d1c7f35e09
+Revises: e2f6b9a04c17
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d1c7f35e09"
+down_revision: Union[str, None] = "e2f6b9a04c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "organizations"
+
+
+def has_calendar_version() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(column["name"] == "calendar_version" for column in inspector.get_columns(TABLE))
+
+
+def upgrade() -> None:
+    if not has_calendar_version():
+        op.add_column(TABLE, sa.Column("calendar_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    if has_calendar_version():
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column("calendar_version")
@@ -0,0 +1,41 @@
+"""Real-time event sequence numbers per organization
+
+WebSocket frames carry a per-org sequence number so reconnecting clients can
+resume; with the PostgreSQL event bus the counter lives in this table. A
+no-op where the table already exists (databases created by `init_db` after
+this change).
+
+Revision ID: b7e3a5f19d24
+Revises: 9c41d2e8b6f3
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3a5f19d24"
+down_revision: Union[str, None] = "9c41d2e8b6f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "org_event_sequences"
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table(TABLE):
+        return
+    op.create_table(
+        TABLE,
+        sa.Column("org_id", sa.Uuid(), sa.ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table(TABLE):
+        op.drop_table(TABLE)
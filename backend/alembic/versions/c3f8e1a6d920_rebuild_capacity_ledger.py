@@ -0,0 +1,144 @@
+"""Rebuild the capacity ledger
+
+Fills the capacity ledger from assigned tasks, creating the table where it is
+missing. Databases upgraded from before the ledger had no entries, and undated
+tasks were not booked until they got the UNSCHEDULED bucket, so every org is
+rebuilt, for both bucket sizes so whichever CAPACITY_BUCKET is configured is
+filled. After changing CAPACITY_BUCKET later, startup rebuilds orgs without
+entries for it (or call `POST /api/admin/resources/capacity-ledger/rebuild`).
+
+The bucketing below is a copy of app.services.capacity_ledger as of this
+revision, so replaying it does not depend on the application code.
+
+Revision ID: c3f8e1a6d920
+Revises: a8d1c7f35e09
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Sequence, Union
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8e1a6d920"
+down_revision: Union[str, None] = "a8d1c7f35e09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "capacity_ledger"
+PERIODS = ("week", "month")
+
+# Bucket holding the bookings of tasks without dates
+UNSCHEDULED = date.min
+
+tasks = sa.table(
+    "tasks",
+    sa.column("org_id", sa.Uuid()),
+    sa.column("assignee_id", sa.Uuid()),
+    sa.column("estimate", sa.Integer()),
+    sa.column("start_date", sa.Date()),
+    sa.column("end_date", sa.Date()),
+)
+
+ledger = sa.table(
+    TABLE,
+    sa.column("id", sa.Uuid()),
+    sa.column("org_id", sa.Uuid()),
+    sa.column("assignee_id", sa.Uuid()),
+    sa.column("period", sa.String()),
+    sa.column("bucket_start", sa.Date()),
+    sa.column("booked_hours", sa.Float()),
+)
+
+
+def bucket_start(day: date, period: str) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_bucket(start: date, period: str) -> date:
+    if period == "week":
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def spread_hours(estimate, start, end, period: str) -> dict[date, float]:
+    """Estimate spread evenly over the task's days, per bucket; undated tasks go to UNSCHEDULED."""
+    start = start or end
+    end = end or start
+    if not estimate:
+        return {}
+    if not start:
+        return {UNSCHEDULED: float(estimate)}
+    if end < start:
+        start, end = end, start
+
+    total_days = (end - start).days + 1
+    spread = {}
+    bucket = bucket_start(start, period)
+    while bucket <= end:
+        following = next_bucket(bucket, period)
+        first = max(bucket, start)
+        last = min(following - timedelta(days=1), end)
+        spread[bucket] = estimate * ((last - first).days + 1) / total_days
+        bucket = following
+    return spread
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE):
+        op.create_table(
+            TABLE,
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column(
+                "org_id", sa.Uuid(), sa.ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("assignee_id", sa.Uuid(), nullable=False),
+            sa.Column("period", sa.String(10), nullable=False),
+            sa.Column("bucket_start", sa.Date(), nullable=False),
+            sa.Column("booked_hours", sa.Float(), nullable=False),
+            sa.UniqueConstraint(
+                "org_id", "assignee_id", "period", "bucket_start", name="uq_capacity_ledger_bucket"
+            ),
+        )
+        op.create_index(
+            "ix_capacity_ledger_assignee_bucket", TABLE, ["assignee_id", "period", "bucket_start"]
+        )
+
+    rows = bind.execute(
+        sa.select(tasks.c.org_id, tasks.c.assignee_id, tasks.c.estimate, tasks.c.start_date, tasks.c.end_date)
+        .where(tasks.c.assignee_id.is_not(None))
+    ).all()
+
+    for period in PERIODS:
+        totals = defaultdict(float)
+        for org_id, assignee_id, estimate, start, end in rows:
+            for bucket, hours in spread_hours(estimate, start, end, period).items():
+                totals[(org_id, assignee_id, bucket)] += hours
+
+        bind.execute(sa.delete(ledger).where(ledger.c.period == period))
+        if totals:
+            bind.execute(sa.insert(ledger), [
+                {
+                    "id": uuid4(),
+                    "org_id": org_id,
+                    "assignee_id": assignee_id,
+                    "period": period,
+                    "bucket_start": bucket,
+                    "booked_hours": hours,
+                }
+                for (org_id, assignee_id, bucket), hours in totals.items()
+            ])
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table(TABLE):
+        op.drop_table(TABLE)
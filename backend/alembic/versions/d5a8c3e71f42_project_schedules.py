@@ -0,0 +1,41 @@
+"""Schedule versions per project
+
+Critical paths and predecessor maps are cached per worker and keyed on a
+project's schedule version, which every change to its tasks, links or
+calendar bumps. Projects without a row are at version 0. A no-op where the
+table already exists (databases created by `init_db` after this change).
+
+Revision ID: d5a8c3e71f42
+Revises: b7e3a5f19d24
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a8c3e71f42"
+down_revision: Union[str, None] = "b7e3a5f19d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "project_schedules"
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table(TABLE):
+        return
+    op.create_table(
+        TABLE,
+        sa.Column("project_id", sa.Uuid(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table(TABLE):
+        op.drop_table(TABLE)
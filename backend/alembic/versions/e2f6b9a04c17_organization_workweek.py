@@ -0,0 +1,42 @@
+"""Work week on organizations
+
+Cascades and critical paths count working days of the org's work week
+(Monday first, 1 = working day); existing organizations start on Monday to
+Friday. A no-op where the column already exists (databases created by
+`init_db` after this change).
+
+Revision ID: e2f6b9a04c17
+Revises: d5a8c3e71f42
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f6b9a04c17"
+down_revision: Union[str, None] = "d5a8c3e71f42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "organizations"
+
+
+def has_workweek() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(column["name"] == "workweek" for column in inspector.get_columns(TABLE))
+
+
+def upgrade() -> None:
+    if not has_workweek():
+        op.add_column(TABLE, sa.Column("workweek", sa.String(7), nullable=False, server_default="1111100"))
+
+
+def downgrade() -> None:
+    if has_workweek():
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column("workweek")
@@ -19,6 +19,36 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24  # 24 hours
     
+    # Capacity ledger bucket size: "week" or "month"
+    capacity_bucket: str = "month"
+    
+    # Default time budget for the optimizing auto-assign solver
+    auto_assign_time_budget_ms: int = 2000
+    
+    # Assemble project read payloads as JSON in the database instead of via ORM objects
+    project_json_reads: bool = True
+    
+    # WebSocket fan-out: frames queued per client, what to do when a slow
+    # client's queue is full ("drop_oldest", "drop_newest" or "disconnect"),
+    # and how long one send may stall before the client is dropped
+    ws_send_queue_size: int = 256
+    ws_slow_consumer_policy: str = "drop_oldest"
+    ws_send_timeout_seconds: float = 10.0
+    
+    # Event bus for broadcasts across workers: "postgres" (LISTEN/NOTIFY),
+    # "memory" (this process only) or "auto" (postgres on a PostgreSQL
+    # database reached directly, memory behind a connection pooler)
+    ws_event_bus: str = "auto"
+    
+    # Broadcasts for an org are held this long, merged per entity and sent
+    # as one frame; 0 sends every broadcast immediately
+    ws_coalesce_window_ms: int = 50
+    
+    # Frames kept per org for clients resuming with /ws?since=<seq>, and how
+    # long a worker keeps buffering an org after its last client leaves
+    ws_replay_buffer_size: int = 1000
+    ws_replay_retention_seconds: float = 300.0
+    
     # CORS
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
     
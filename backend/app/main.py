@@ -8,8 +8,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from jose import jwt, JWTError
 
 from app.config import get_settings
-from app.database import init_db
-from app.routers import auth, projects, tasks, resources, initiatives, kvi, admin_resources
+from app.database import init_db, async_session_maker
+from app.dependencies import GlobalAdmin
+from app.pagination import NEXT_CURSOR_HEADER
+from app.services.capacity_ledger import CapacityLedgerService
+from app.routers import auth, projects, tasks, resources, initiatives, kvi, admin_resources, calendar
 from app.websocket import manager
 
 settings = get_settings()
@@ -20,8 +23,13 @@ async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown."""
     # Startup
     await init_db()
+    # Fill the capacity ledger of orgs that have none for the configured bucket
+    async with async_session_maker() as db:
+        await CapacityLedgerService(db).rebuild_missing()
+        await db.commit()
     yield
-    # Shutdown (cleanup if needed)
+    # Shutdown
+    await manager.close()
 
 
 app = FastAPI(
@@ -38,6 +46,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -48,6 +57,7 @@ app.include_router(resources.router, prefix="/api")
 app.include_router(initiatives.router, prefix="/api")
 app.include_router(kvi.router, prefix="/api")
 app.include_router(admin_resources.router, prefix="/api")
+app.include_router(calendar.router, prefix="/api")
 
 
 @app.get("/api/health")
@@ -56,12 +66,19 @@ async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
 
+@app.get("/api/health/websocket")
+async def websocket_health(admin: GlobalAdmin):
+    """WebSocket fan-out metrics of this worker, across organizations (global admins only)."""
+    return manager.metrics()
+
+
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: str | None = None):
+async def websocket_endpoint(websocket: WebSocket, token: str | None = None, since: int | None = None):
     """
     WebSocket endpoint for real-time updates.
     
     Connect with: ws://host/ws?token=<jwt_token>
+    Resume with:  ws://host/ws?token=<jwt_token>&since=<last seq received>
     """
     if not token:
         await websocket.close(code=4001, reason="Missing authentication token")
@@ -80,13 +97,17 @@ async def websocket_endpoint(websocket: WebSocket, token: str | None = None):
         return
     
     # Accept connection and register with org
-    await manager.connect(websocket, org_id)
+    await manager.connect(websocket, org_id, since)
     
     try:
         # Send welcome message
         await manager.send_personal_message(websocket, {
             "type": "CONNECTED",
-            "payload": {"org_id": str(org_id), "message": "Connected to ACCN-PM real-time updates"}
+            "payload": {
+                "org_id": str(org_id),
+                "message": "Connected to ACCN-PM real-time updates",
+                "seq": manager.last_seq(org_id)
+            }
         })
         
         # Keep connection alive and listen for ping/pong
@@ -94,8 +115,10 @@ async def websocket_endpoint(websocket: WebSocket, token: str | None = None):
             data = await websocket.receive_text()
             # Handle ping
             if data == "ping":
-                await websocket.send_text("pong")
+                await manager.send_personal_message(websocket, "pong")
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket, org_id)
 
 
@@ -3,22 +3,27 @@
 from app.models.organization import Organization
 from app.models.user import User
 from app.models.user_assignment import UserAssignment
-from app.models.project import Project, LaunchDetail, InputGateway, GatewayVersion
-from app.models.task import Task, TaskMarketStatus
+from app.models.project import Project, ProjectSchedule, LaunchDetail, InputGateway, GatewayVersion
+from app.models.task import Task, TaskMarketStatus, TaskDependency
 from app.models.resource import Resource
 from app.models.initiative import Initiative, InitiativeValueMetric, InitiativeTaskLink, InitiativeTaskValue
 from app.models.template import TaskTemplate, GatewayTemplate, Team, Market
+from app.models.capacity import CapacityLedgerEntry
+from app.models.calendar import Holiday
+from app.models.event_stream import OrgEventSequence
 
 __all__ = [
     "Organization",
     "User",
     "UserAssignment",
     "Project",
+    "ProjectSchedule",
     "LaunchDetail",
     "InputGateway",
     "GatewayVersion",
     "Task",
     "TaskMarketStatus",
+    "TaskDependency",
     "Resource",
     "Initiative",
     "InitiativeValueMetric",
@@ -28,5 +33,8 @@ __all__ = [
     "GatewayTemplate",
     "Team",
     "Market",
+    "CapacityLedgerEntry",
+    "Holiday",
+    "OrgEventSequence",
 ]
 
@@ -0,0 +1,29 @@
+"""Working calendar models - public holidays per organization or market."""
+
+import uuid
+from datetime import date
+from sqlalchemy import String, Date, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database import Base
+
+
+class Holiday(Base):
+    """Non-working day for a whole organization, or only for one of its markets."""
+    
+    __tablename__ = "holidays"
+    
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    # Null for org-wide holidays
+    market_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("markets.id", ondelete="CASCADE"))
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    name: Mapped[str | None] = mapped_column(String(255))
+    
+    # Relationships
+    market: Mapped["Market"] = relationship()
+    
+    __table_args__ = (
+        UniqueConstraint("org_id", "market_id", "day", name="uq_holiday_day"),
+        Index("ix_holidays_org_day", "org_id", "day"),
+    )
@@ -0,0 +1,27 @@
+"""Capacity ledger model - time-phased booked hours per assignee."""
+
+import uuid
+from datetime import date
+from sqlalchemy import String, Date, ForeignKey, Float, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CapacityLedgerEntry(Base):
+    """Booked hours for one assignee in one org for one week/month bucket."""
+    
+    __tablename__ = "capacity_ledger"
+    
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    # Task.assignee_id may reference a user or a resource, so no FK here
+    assignee_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    period: Mapped[str] = mapped_column(String(10), nullable=False)  # week, month
+    bucket_start: Mapped[date] = mapped_column(Date, nullable=False)
+    booked_hours: Mapped[float] = mapped_column(Float, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("org_id", "assignee_id", "period", "bucket_start", name="uq_capacity_ledger_bucket"),
+        Index("ix_capacity_ledger_assignee_bucket", "assignee_id", "period", "bucket_start"),
+    )
@@ -0,0 +1,20 @@
+"""Real-time event stream position per organization."""
+
+import uuid
+from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class OrgEventSequence(Base):
+    """
+    Last sequence number broadcast to an organization's WebSocket clients.
+    Incremented in the transaction that publishes each frame (PostgreSQL
+    event bus), so numbers are gapless and in delivery order across workers.
+    """
+    
+    __tablename__ = "org_event_sequences"
+    
+    org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import String, DateTime, Date, ForeignKey, Text, Numeric
+from sqlalchemy import String, DateTime, Date, ForeignKey, Text, Numeric, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -28,6 +28,11 @@ class Initiative(Base):
     organization: Mapped["Organization"] = relationship(back_populates="initiatives")
     value_metrics: Mapped[list["InitiativeValueMetric"]] = relationship(back_populates="initiative", cascade="all, delete-orphan")
     task_links: Mapped[list["InitiativeTaskLink"]] = relationship(back_populates="initiative", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination of the initiative list (newest first)
+        Index("ix_initiatives_org_created", "org_id", "created_at", "id"),
+    )
 
 
 class InitiativeValueMetric(Base):
@@ -41,6 +46,10 @@ class InitiativeValueMetric(Base):
     
     # Relationships
     initiative: Mapped["Initiative"] = relationship(back_populates="value_metrics")
+    
+    __table_args__ = (
+        Index("ix_initiative_value_metrics_initiative", "initiative_id"),
+    )
 
 
 class InitiativeTaskLink(Base):
@@ -57,6 +66,12 @@ class InitiativeTaskLink(Base):
     initiative: Mapped["Initiative"] = relationship(back_populates="task_links")
     task: Mapped["Task"] = relationship(back_populates="initiative_links")
     values: Mapped[list["InitiativeTaskValue"]] = relationship(back_populates="link", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # A task is linked to an initiative at most once
+        UniqueConstraint("initiative_id", "task_id", name="uq_initiative_task_link"),
+        Index("ix_initiative_task_links_task", "task_id"),
+    )
 
 
 class InitiativeTaskValue(Base):
@@ -71,3 +86,7 @@ class InitiativeTaskValue(Base):
     
     # Relationships
     link: Mapped["InitiativeTaskLink"] = relationship(back_populates="values")
+    
+    __table_args__ = (
+        Index("ix_initiative_task_values_link", "link_id"),
+    )
@@ -2,12 +2,14 @@
 
 import uuid
 from datetime import datetime, date
-from sqlalchemy import String, DateTime, Date, ForeignKey, Integer, Boolean, Text
+from sqlalchemy import String, DateTime, Date, ForeignKey, Integer, Boolean, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.models.versioning import versioned
 
 
+@versioned
 class Project(Base):
     """Project entity - core of project management."""
     
@@ -25,12 +27,36 @@ class Project(Base):
     end_date: Mapped[date | None] = mapped_column(Date)
     original_end_date: Mapped[date | None] = mapped_column(Date)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    # Bumped on every change; real-time events carry deltas between versions
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
     organization: Mapped["Organization"] = relationship(back_populates="projects")
     pm: Mapped["User"] = relationship(back_populates="managed_projects")
-    launch_details: Mapped[list["LaunchDetail"]] = relationship(back_populates="project", cascade="all, delete-orphan")
+    launch_details: Mapped[list["LaunchDetail"]] = relationship(
+        back_populates="project", cascade="all, delete-orphan", order_by="(LaunchDetail.market, LaunchDetail.id)"
+    )
     tasks: Mapped[list["Task"]] = relationship(back_populates="project", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination of the project list (newest first)
+        Index("ix_projects_org_created", "org_id", "created_at", "id"),
+    )
+
+
+class ProjectSchedule(Base):
+    """
+    Schedule version of a project, bumped in the transaction of every change
+    to its task dates, dependency links or calendar. Cached schedule
+    computations (critical path, predecessor maps) are keyed on it, so every
+    worker sees them go stale on commit. Kept apart from the project row so
+    task writes never wait on a lock of the project itself.
+    """
+    
+    __tablename__ = "project_schedules"
+    
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
 
 class LaunchDetail(Base):
@@ -45,9 +71,13 @@ class LaunchDetail(Base):
     
     # Relationships
     project: Mapped["Project"] = relationship(back_populates="launch_details")
-    input_gateways: Mapped[list["InputGateway"]] = relationship(back_populates="launch_detail", cascade="all, delete-orphan")
+    input_gateways: Mapped[list["InputGateway"]] = relationship(
+        back_populates="launch_detail", cascade="all, delete-orphan",
+        order_by="(InputGateway.expected_date, InputGateway.id)"
+    )
     
     __table_args__ = (
+        Index("ix_launch_details_project", "project_id", "market"),
         # Unique market per project
         {"sqlite_autoincrement": True},
     )
@@ -67,7 +97,13 @@ class InputGateway(Base):
     
     # Relationships
     launch_detail: Mapped["LaunchDetail"] = relationship(back_populates="input_gateways")
-    versions: Mapped[list["GatewayVersion"]] = relationship(back_populates="gateway", cascade="all, delete-orphan")
+    versions: Mapped[list["GatewayVersion"]] = relationship(
+        back_populates="gateway", cascade="all, delete-orphan", order_by="(GatewayVersion.version_number, GatewayVersion.id)"
+    )
+    
+    __table_args__ = (
+        Index("ix_input_gateways_launch_detail", "launch_detail_id"),
+    )
 
 
 class GatewayVersion(Base):
@@ -86,3 +122,7 @@ class GatewayVersion(Base):
     
     # Relationships
     gateway: Mapped["InputGateway"] = relationship(back_populates="versions")
+    
+    __table_args__ = (
+        Index("ix_gateway_versions_gateway", "gateway_id", "version_number"),
+    )
@@ -2,7 +2,7 @@
 
 import uuid
 from decimal import Decimal
-from sqlalchemy import String, ForeignKey, Integer, Numeric
+from sqlalchemy import String, ForeignKey, Integer, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -27,3 +27,8 @@ class Resource(Base):
     # Relationships
     organization: Mapped["Organization"] = relationship(back_populates="resources")
     assigned_tasks: Mapped[list["Task"]] = relationship(back_populates="assignee")
+    
+    __table_args__ = (
+        # Keyset pagination of the resource list (by name)
+        Index("ix_resources_org_name", "org_id", "name", "id"),
+    )
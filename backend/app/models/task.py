@@ -1,12 +1,14 @@
-"""Task models including market-specific status."""
+"""Task models including market-specific status and dependency links."""
 
 import uuid
-from sqlalchemy import String, Date, ForeignKey, Integer, Boolean
+from sqlalchemy import String, Date, ForeignKey, Integer, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.models.versioning import versioned
 
 
+@versioned
 class Task(Base):
     """Task entity - work items within projects."""
     
@@ -29,6 +31,8 @@ class Task(Base):
     gateway_source: Mapped[str | None] = mapped_column(String(255))
     linked_initiative_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("initiatives.id"))
     value_saved: Mapped[int | None] = mapped_column(Integer)
+    # Bumped on every change; real-time events carry deltas between versions
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
     project: Mapped["Project"] = relationship(back_populates="tasks")
@@ -36,6 +40,22 @@ class Task(Base):
     predecessor: Mapped["Task"] = relationship(remote_side=[id])
     market_statuses: Mapped[list["TaskMarketStatus"]] = relationship(back_populates="task", cascade="all, delete-orphan")
     initiative_links: Mapped[list["InitiativeTaskLink"]] = relationship(back_populates="task", cascade="all, delete-orphan")
+    incoming_dependencies: Mapped[list["TaskDependency"]] = relationship(
+        back_populates="successor", foreign_keys="TaskDependency.successor_id", cascade="all, delete-orphan"
+    )
+    outgoing_dependencies: Mapped[list["TaskDependency"]] = relationship(
+        back_populates="predecessor", foreign_keys="TaskDependency.predecessor_id", cascade="all, delete-orphan"
+    )
+    
+    __table_args__ = (
+        # Keyset pagination of task lists by start date, per org, project and assignee
+        Index("ix_tasks_org_start", "org_id", "start_date", "id"),
+        Index("ix_tasks_project_start", "project_id", "start_date", "id"),
+        Index("ix_tasks_assignee_start", "assignee_id", "start_date", "id"),
+        # Successor and initiative lookups
+        Index("ix_tasks_predecessor", "predecessor_id"),
+        Index("ix_tasks_linked_initiative", "linked_initiative_id"),
+    )
 
 
 class TaskMarketStatus(Base):
@@ -52,6 +72,35 @@ class TaskMarketStatus(Base):
     task: Mapped["Task"] = relationship(back_populates="market_statuses")
     
     __table_args__ = (
+        Index("ix_task_market_status_task", "task_id", "market"),
         # Unique market per task
         {"sqlite_autoincrement": True},
     )
+
+
+class TaskDependency(Base):
+    """
+    Typed dependency link between two tasks.
+    
+    Types: FS (finish-to-start), SS (start-to-start), FF (finish-to-finish),
+    SF (start-to-finish); `lag_days` delays (or, negative, leads) the successor.
+    `Task.predecessor_id` remains supported as an implicit FS link with no lag.
+    """
+    
+    __tablename__ = "task_dependencies"
+    
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    predecessor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    successor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    type: Mapped[str] = mapped_column(String(2), default="FS")  # FS, SS, FF, SF
+    lag_days: Mapped[int] = mapped_column(Integer, default=0)
+    
+    # Relationships
+    predecessor: Mapped["Task"] = relationship(back_populates="outgoing_dependencies", foreign_keys=[predecessor_id])
+    successor: Mapped["Task"] = relationship(back_populates="incoming_dependencies", foreign_keys=[successor_id])
+    
+    __table_args__ = (
+        UniqueConstraint("predecessor_id", "successor_id", name="uq_task_dependency_pair"),
+        Index("ix_task_dependencies_successor", "successor_id", "predecessor_id"),
+    )
@@ -1,7 +1,7 @@
 """Template models for tasks, gateways, teams, and markets."""
 
 import uuid
-from sqlalchemy import String, ForeignKey, Integer
+from sqlalchemy import String, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -20,6 +20,10 @@ class TaskTemplate(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     estimate: Mapped[int | None] = mapped_column(Integer)
     gateway_dependency: Mapped[str | None] = mapped_column(String(255))
+    
+    __table_args__ = (
+        Index("ix_task_templates_org", "org_id", "team", "scale", "task_order"),
+    )
 
 
 class GatewayTemplate(Base):
@@ -33,6 +37,10 @@ class GatewayTemplate(Base):
     scale: Mapped[str] = mapped_column(String(50), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     offset_weeks: Mapped[int] = mapped_column(Integer, default=0)
+    
+    __table_args__ = (
+        Index("ix_gateway_templates_org", "org_id", "team", "scale"),
+    )
 
 
 class Team(Base):
@@ -46,6 +54,10 @@ class Team(Base):
     
     # Relationships
     organization: Mapped["Organization"] = relationship(back_populates="teams")
+    
+    __table_args__ = (
+        Index("ix_teams_org", "org_id", "name"),
+    )
 
 
 class Market(Base):
@@ -59,3 +71,7 @@ class Market(Base):
     
     # Relationships
     organization: Mapped["Organization"] = relationship(back_populates="markets")
+    
+    __table_args__ = (
+        Index("ix_markets_org", "org_id", "name"),
+    )
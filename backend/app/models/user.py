@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import String, DateTime, Boolean, Numeric
+from sqlalchemy import String, DateTime, Boolean, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -35,6 +35,11 @@ class User(Base):
     assignments: Mapped[list["UserAssignment"]] = relationship(back_populates="user", cascade="all, delete-orphan")
     managed_projects: Mapped[list["Project"]] = relationship(back_populates="pm")
     
+    __table_args__ = (
+        # Keyset pagination of the admin user list (by name)
+        Index("ix_users_name", "name", "id"),
+    )
+    
     def get_primary_org_id(self) -> uuid.UUID | None:
         """Get the user's primary organization ID."""
         for assignment in self.assignments:
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -26,4 +26,6 @@ class UserAssignment(Base):
     
     __table_args__ = (
         UniqueConstraint("user_id", "org_id", name="uq_user_org_assignment"),
+        # Keyset pagination of the admin assignment list
+        Index("ix_user_assignments_created", "created_at", "id"),
     )
@@ -0,0 +1,21 @@
+"""Version numbers of entities whose changes are broadcast as deltas."""
+
+from sqlalchemy import event, inspect
+
+
+def versioned(model):
+    """
+    Class decorator for models with a `version` column: every ORM UPDATE of a
+    row bumps it, unless the flush sets `version` itself. Set-based UPDATEs
+    bypass this and bump it in their own statement (`version=Model.version + 1`).
+    """
+    @event.listens_for(model, "before_update")
+    def bump_version(mapper, connection, target):
+        state = inspect(target)
+        if state.attrs.version.history.has_changes():
+            return
+        if not state.session.is_modified(target, include_collections=False):
+            return
+        target.version = target.version + 1
+
+    return model
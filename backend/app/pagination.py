@@ -0,0 +1,94 @@
+"""Keyset (cursor) pagination for list endpoints."""
+
+import base64
+import json
+from typing import Annotated, Any
+
+from fastapi import Depends, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Select, and_, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """`limit` and `cursor` query parameters of a paginated list."""
+
+    def __init__(
+        self,
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(default=None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header")
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+Page = Annotated[PageParams, Depends()]
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Opaque cursor for the sort key of a row."""
+    raw = json.dumps(jsonable_encoder(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list[Any]:
+    """Sort key values of a cursor, typed like the key columns."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of values")
+        return [
+            None if value is None else TypeAdapter(column.type.python_type).validate_python(value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, ValidationError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset(query: Select, page: PageParams, *keys, descending: bool = False, nulls_last: bool = False) -> Select:
+    """
+    Order a query by `keys` and keep the rows after the page's cursor.
+
+    The last key must be unique (the primary key) so the order is total. With
+    `nulls_last`, the first key may be NULL; those rows come last. One row more
+    than the limit is fetched to know whether there is a next page (see
+    `page_of`).
+    """
+    first = keys[0]
+    if descending:
+        order = [key.desc() for key in keys]
+    elif nulls_last:
+        order = [first.asc().nulls_last(), *keys[1:]]
+    else:
+        order = list(keys)
+    query = query.order_by(*order).limit(page.limit + 1)
+
+    if page.cursor is None:
+        return query
+    values = decode_cursor(page.cursor, keys)
+    after = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+    if nulls_last:
+        if values[0] is None:
+            after = and_(first.is_(None), tuple_(*keys[1:]) > tuple_(*values[1:]))
+        else:
+            after = or_(after, first.is_(None))
+    return query.where(after)
+
+
+def page_of(rows: list, page: PageParams, response: Response, key) -> list:
+    """
+    Trim the extra row fetched by `keyset` and, if there is a next page, set
+    its cursor on the response. `key(row)` returns the row's sort key values.
+    """
+    if len(rows) <= page.limit:
+        return rows
+    rows = rows[:page.limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+    return rows
@@ -1,5 +1,5 @@
 """API Routers package init."""
 
-from app.routers import auth, projects, tasks, resources, initiatives, kvi, admin_resources
+from app.routers import auth, projects, tasks, resources, initiatives, kvi, admin_resources, calendar
 
-__all__ = ["auth", "projects", "tasks", "resources", "initiatives", "kvi", "admin_resources"]
+__all__ = ["auth", "projects", "tasks", "resources", "initiatives", "kvi", "admin_resources", "calendar"]
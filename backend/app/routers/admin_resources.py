@@ -4,16 +4,20 @@ Protected endpoints for Global Resource Managers to manage user assignments.
 """
 
 import uuid
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.dependencies import DbSession, GlobalAdmin, get_password_hash
+from app.pagination import Page, keyset, page_of
 from app.models import User, UserAssignment, Organization
+from app.services import CapacityLedgerService, run_portfolio_allocation
+from app.websocket import manager, EventType
 from app.schemas.user import (
     UserCreate, UserRead, UserAssignmentCreate, 
     UserAssignmentRead, UserAssignmentWithOrg
 )
+from app.schemas.task import PortfolioAutoAssignRequest, PortfolioAutoAssignResult
 
 router = APIRouter(prefix="/admin/resources", tags=["Global Admin"])
 
@@ -21,10 +25,26 @@ router = APIRouter(prefix="/admin/resources", tags=["Global Admin"])
 # --- User Management ---
 
 @router.get("/users", response_model=list[UserRead])
-async def list_all_users(admin: GlobalAdmin, db: DbSession):
-    """List all global users (requires Global Resource Manager role)."""
-    result = await db.execute(select(User).order_by(User.name))
-    users = result.scalars().all()
+async def list_all_users(
+    admin: GlobalAdmin,
+    db: DbSession,
+    page: Page,
+    response: Response,
+    global_role: str | None = None,
+    is_active: bool | None = None
+):
+    """
+    List global users by name, one page at a time (requires Global Resource
+    Manager role). The next page's cursor is in the X-Next-Cursor header.
+    """
+    query = select(User)
+    if global_role:
+        query = query.where(User.global_role == global_role)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    
+    result = await db.execute(keyset(query, page, User.name, User.id))
+    users = page_of(result.scalars().all(), page, response, lambda u: [u.name, u.id])
     return [UserRead.model_validate(u) for u in users]
 
 
@@ -72,14 +92,26 @@ async def get_user(user_id: uuid.UUID, admin: GlobalAdmin, db: DbSession):
 # --- Assignment Management ---
 
 @router.get("/assignments", response_model=list[UserAssignmentWithOrg])
-async def list_all_assignments(admin: GlobalAdmin, db: DbSession):
-    """List all user-org assignments."""
-    result = await db.execute(
-        select(UserAssignment)
-        .options(selectinload(UserAssignment.organization))
-        .order_by(UserAssignment.user_id)
-    )
-    assignments = result.scalars().all()
+async def list_all_assignments(
+    admin: GlobalAdmin,
+    db: DbSession,
+    page: Page,
+    response: Response,
+    user_id: uuid.UUID | None = None,
+    org_id: uuid.UUID | None = None
+):
+    """
+    List user-org assignments, oldest first, one page at a time. The next
+    page's cursor is in the X-Next-Cursor header.
+    """
+    query = select(UserAssignment).options(selectinload(UserAssignment.organization))
+    if user_id:
+        query = query.where(UserAssignment.user_id == user_id)
+    if org_id:
+        query = query.where(UserAssignment.org_id == org_id)
+    
+    result = await db.execute(keyset(query, page, UserAssignment.created_at, UserAssignment.id))
+    assignments = page_of(result.scalars().all(), page, response, lambda a: [a.created_at, a.id])
     
     return [
         UserAssignmentWithOrg(
@@ -287,3 +319,61 @@ async def get_user_availability(user_id: uuid.UUID, admin: GlobalAdmin, db: DbSe
             for a in assignments
         ]
     }
+
+
+# --- Capacity Ledger ---
+
+@router.post("/capacity-ledger/rebuild")
+async def rebuild_capacity_ledger(
+    admin: GlobalAdmin,
+    db: DbSession,
+    org_id: uuid.UUID | None = None
+):
+    """Rebuild the capacity ledger from tasks for one organization, or all of them."""
+    if org_id:
+        org_ids = [org_id]
+    else:
+        result = await db.execute(select(Organization.id))
+        org_ids = result.scalars().all()
+    
+    ledger = CapacityLedgerService(db)
+    entries = 0
+    for oid in org_ids:
+        entries += await ledger.rebuild(oid)
+    
+    return {
+        "period": ledger.period,
+        "organizations": len(org_ids),
+        "entries": entries
+    }
+
+
+# --- Portfolio Auto-Assign ---
+
+@router.post("/auto-assign", response_model=PortfolioAutoAssignResult)
+async def auto_assign_portfolio(request: PortfolioAutoAssignRequest, admin: GlobalAdmin):
+    """
+    Auto-assign tasks for many (or all) organizations in one pass.
+    
+    Orgs that share no users are allocated concurrently (up to `max_workers`);
+    all of them see one cross-org capacity view, so a shared user is never
+    booked past their full capacity. Each org is written in its own transaction
+    and receives its own TASKS_AUTO_ASSIGNED event.
+    """
+    result = await run_portfolio_allocation(
+        org_ids=request.org_ids,
+        mode=request.mode,
+        time_budget_ms=request.time_budget_ms,
+        dry_run=request.dry_run,
+        max_workers=request.max_workers
+    )
+    
+    if not request.dry_run:
+        for org_result in result['organizations']:
+            if 'error' not in org_result:
+                await manager.broadcast_to_org(uuid.UUID(org_result['org_id']), {
+                    "type": EventType.TASKS_AUTO_ASSIGNED,
+                    "payload": org_result
+                })
+    
+    return PortfolioAutoAssignResult(**result)
@@ -0,0 +1,111 @@
+"""Working calendar router: the org's work week and public holidays."""
+
+import uuid
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import select
+
+from app.dependencies import DbSession, CurrentSessionOrgId
+from app.models import Holiday, Market, Organization, Project
+from app.schemas.calendar import HolidayCreate, HolidayRead, WorkingCalendarRead, WorkingCalendarUpdate
+from app.websocket import manager, EventType
+from app.services.project_schedule import bump_schedule_versions
+from app.services.working_calendar import bump_calendar_version
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+
+async def _calendar_changed(db: DbSession, org_id: uuid.UUID) -> None:
+    """Retire compiled calendars and critical paths that used the old calendar."""
+    await bump_calendar_version(db, org_id)
+    result = await db.execute(select(Project.id).where(Project.org_id == org_id))
+    await bump_schedule_versions(db, result.scalars().all())
+    
+    # Broadcast event
+    await manager.broadcast_to_org(org_id, {
+        "type": EventType.CALENDAR_UPDATED,
+        "payload": {"org_id": str(org_id)}
+    })
+
+
+@router.get("", response_model=WorkingCalendarRead)
+async def get_calendar(db: DbSession, org_id: CurrentSessionOrgId):
+    """Get the organization's work week and holidays."""
+    result = await db.execute(select(Organization.workweek).where(Organization.id == org_id))
+    workweek = result.scalar_one()
+    
+    result = await db.execute(
+        select(Holiday).where(Holiday.org_id == org_id).order_by(Holiday.day)
+    )
+    return WorkingCalendarRead(
+        workweek=workweek,
+        holidays=[HolidayRead.model_validate(h) for h in result.scalars().all()]
+    )
+
+
+@router.patch("", response_model=WorkingCalendarRead)
+async def update_calendar(
+    updates: WorkingCalendarUpdate,
+    db: DbSession,
+    org_id: CurrentSessionOrgId
+):
+    """
+    Update the organization's work week (Monday first, e.g. "1111100").
+    
+    Existing task dates are kept; later cascades and critical paths use the
+    new calendar.
+    """
+    if "1" not in updates.workweek:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Work week needs a working day")
+    
+    result = await db.execute(select(Organization).where(Organization.id == org_id))
+    organization = result.scalar_one()
+    organization.workweek = updates.workweek
+    await db.flush()
+    await _calendar_changed(db, org_id)
+    
+    return await get_calendar(db, org_id)
+
+
+@router.post("/holidays", response_model=HolidayRead, status_code=status.HTTP_201_CREATED)
+async def create_holiday(holiday_data: HolidayCreate, db: DbSession, org_id: CurrentSessionOrgId):
+    """Add a holiday for the whole organization or for one market."""
+    if holiday_data.market_id:
+        result = await db.execute(
+            select(Market.id).where(Market.id == holiday_data.market_id, Market.org_id == org_id)
+        )
+        if not result.scalar_one_or_none():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market not found")
+    
+    result = await db.execute(
+        select(Holiday.id).where(
+            Holiday.org_id == org_id,
+            Holiday.day == holiday_data.day,
+            Holiday.market_id.is_(None) if holiday_data.market_id is None
+            else Holiday.market_id == holiday_data.market_id
+        )
+    )
+    if result.scalar_one_or_none():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Holiday already exists")
+    
+    holiday = Holiday(org_id=org_id, **holiday_data.model_dump())
+    db.add(holiday)
+    await db.flush()
+    await _calendar_changed(db, org_id)
+    
+    return HolidayRead.model_validate(holiday)
+
+
+@router.delete("/holidays/{holiday_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_holiday(holiday_id: uuid.UUID, db: DbSession, org_id: CurrentSessionOrgId):
+    """Remove a holiday."""
+    result = await db.execute(
+        select(Holiday).where(Holiday.id == holiday_id, Holiday.org_id == org_id)
+    )
+    holiday = result.scalar_one_or_none()
+    
+    if not holiday:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Holiday not found")
+    
+    await db.delete(holiday)
+    await db.flush()
+    await _calendar_changed(db, org_id)
@@ -1,11 +1,12 @@
 """Initiatives router with full CRUD and task linking."""
 
 import uuid
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.dependencies import DbSession, CurrentSessionOrgId
+from app.pagination import Page, keyset, page_of
 from app.models import Initiative, InitiativeValueMetric, InitiativeTaskLink, InitiativeTaskValue, Task
 from app.schemas.initiative import InitiativeCreate, InitiativeRead, InitiativeUpdate, TaskLinkCreate
 from app.websocket import manager, EventType
@@ -14,18 +15,31 @@ router = APIRouter(prefix="/initiatives", tags=["Initiatives"])
 
 
 @router.get("", response_model=list[InitiativeRead])
-async def list_initiatives(db: DbSession, org_id: CurrentSessionOrgId):
-    """List all initiatives for the current organization."""
-    result = await db.execute(
+async def list_initiatives(
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    page: Page,
+    response: Response,
+    status_filter: str | None = Query(default=None, alias="status")
+):
+    """
+    List the organization's initiatives, newest first, one page at a time.
+    
+    The next page's cursor is returned in the X-Next-Cursor header.
+    """
+    query = (
         select(Initiative)
         .where(Initiative.org_id == org_id)
         .options(
             selectinload(Initiative.value_metrics),
             selectinload(Initiative.task_links).selectinload(InitiativeTaskLink.values)
         )
-        .order_by(Initiative.created_at.desc())
     )
-    initiatives = result.scalars().all()
+    if status_filter:
+        query = query.where(Initiative.status == status_filter)
+    
+    result = await db.execute(keyset(query, page, Initiative.created_at, Initiative.id, descending=True))
+    initiatives = page_of(result.scalars().all(), page, response, lambda i: [i.created_at, i.id])
     
     # Transform to schema format
     initiatives_out = []
@@ -225,6 +239,15 @@ async def link_task_to_initiative(
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
+    result = await db.execute(
+        select(InitiativeTaskLink.id).where(
+            InitiativeTaskLink.initiative_id == initiative_id,
+            InitiativeTaskLink.task_id == link_data.task_id
+        )
+    )
+    if result.scalar_one_or_none():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Task already linked")
+    
     # Create link
     link = InitiativeTaskLink(
         initiative_id=initiative_id,
@@ -2,33 +2,164 @@
 
 import uuid
 from datetime import date, timedelta
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Select, select
+from sqlalchemy.orm import selectinload, noload, load_only
 
+from app.config import get_settings
 from app.dependencies import DbSession, CurrentSessionOrgId, CurrentUser
+from app.pagination import Page, PageParams, keyset, page_of
 from app.models import Project, LaunchDetail, InputGateway, GatewayVersion, Task, TaskMarketStatus
-from app.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate, InputGatewayUpdate
-from app.websocket import manager, EventType
+from app.schemas.project import (
+    ProjectCreate, ProjectRead, ProjectUpdate, LaunchDetailRead, InputGatewayUpdate, CriticalPathResult,
+    ProjectShiftRequest, ProjectShiftResult, ProjectBulkDelete, ProjectBulkDeleteResult
+)
+from app.websocket import manager, EventType, entity_delta
+from app.services import (
+    CapacityLedgerService, get_project_critical_path, bump_schedule_versions, shift_project,
+    bulk_delete_projects, project_documents, json_array, CalendarRangeError
+)
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+# Nested relationships of a project read, outermost first
+PROJECT_RELATIONSHIPS = (Project.launch_details, LaunchDetail.input_gateways, InputGateway.versions)
+PROJECT_INCLUDES = tuple(
+    ".".join(r.key for r in PROJECT_RELATIONSHIPS[:depth]) for depth in range(1, len(PROJECT_RELATIONSHIPS) + 1)
+)
+PROJECT_FIELDS = tuple(name for name in ProjectRead.model_fields if name != "launch_details")
 
-@router.get("", response_model=list[ProjectRead])
-async def list_projects(db: DbSession, org_id: CurrentSessionOrgId):
-    """List all projects for the current organization."""
-    result = await db.execute(
-        select(Project)
-        .where(Project.org_id == org_id)
-        .options(
-            selectinload(Project.launch_details)
-            .selectinload(LaunchDetail.input_gateways)
-            .selectinload(InputGateway.versions)
+
+class ProjectView:
+    """
+    `include` and `fields` query parameters of project reads: how deep nested
+    relationships are loaded, and which project fields are returned.
+    """
+    
+    def __init__(
+        self,
+        include: str | None = Query(
+            default=None,
+            description=f"Comma-separated relationships to load: {', '.join(PROJECT_INCLUDES)} "
+                        "(deeper paths imply their parents; empty for none; default all)"
+        ),
+        fields: str | None = Query(
+            default=None,
+            description=f"Comma-separated project fields to return (default all): {', '.join(PROJECT_FIELDS)}"
         )
-        .order_by(Project.created_at.desc())
-    )
-    projects = result.scalars().all()
-    return [ProjectRead.model_validate(p) for p in projects]
+    ):
+        self.depth = len(PROJECT_RELATIONSHIPS)
+        if include is not None:
+            paths = [p.strip() for p in include.split(",") if p.strip()]
+            unknown = [p for p in paths if p not in PROJECT_INCLUDES]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(PROJECT_INCLUDES)}"
+                )
+            self.depth = max((PROJECT_INCLUDES.index(p) + 1 for p in paths), default=0)
+        
+        self.fields = PROJECT_FIELDS
+        if fields is not None:
+            names = {f.strip() for f in fields.split(",") if f.strip()}
+            unknown = sorted(names - set(PROJECT_FIELDS))
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown field: {', '.join(unknown)}. Allowed: {', '.join(PROJECT_FIELDS)}"
+                )
+            self.fields = tuple(name for name in PROJECT_FIELDS if name in names or name == "id")
+    
+    def options(self) -> list:
+        """Loader options: only the requested columns and relationship levels are queried."""
+        columns = {"id", "created_at", *self.fields}  # created_at is the list's sort key
+        options = [load_only(*(getattr(Project, name) for name in columns))]
+        loader = None
+        for relationship in PROJECT_RELATIONSHIPS[:self.depth]:
+            loader = selectinload(relationship) if loader is None else loader.selectinload(relationship)
+        if self.depth < len(PROJECT_RELATIONSHIPS):
+            cut = PROJECT_RELATIONSHIPS[self.depth]
+            loader = noload(cut) if loader is None else loader.noload(cut)
+        options.append(loader)
+        return options
+    
+    def dump(self, project: Project) -> dict:
+        """Serialize only the requested fields and levels."""
+        out = {name: getattr(project, name) for name in self.fields}
+        if self.depth:
+            # Drop the first unloaded level, e.g. {"input_gateways": {"__all__": {"versions"}}}
+            exclude = None
+            if self.depth < len(PROJECT_RELATIONSHIPS):
+                exclude = {PROJECT_RELATIONSHIPS[self.depth].key}
+                for relationship in reversed(PROJECT_RELATIONSHIPS[1:self.depth]):
+                    exclude = {relationship.key: {"__all__": exclude}}
+            out["launch_details"] = [
+                LaunchDetailRead.model_validate(launch).model_dump(exclude=exclude)
+                for launch in project.launch_details
+            ]
+        return out
+
+
+ProjectViewParams = Annotated[ProjectView, Depends()]
+
+
+def project_list_query(
+    query: Select,
+    org_id: uuid.UUID,
+    page: PageParams,
+    status_filter: str | None = None,
+    pm_id: uuid.UUID | None = None,
+    start: date | None = None,
+    end: date | None = None
+) -> Select:
+    """
+    Filter `query` (of projects, or of project documents) to one page of the
+    project list (also EXPLAINed by benchmarks.check_query_plans).
+    """
+    filters = [Project.org_id == org_id]
+    if status_filter:
+        filters.append(Project.status == status_filter)
+    if pm_id:
+        filters.append(Project.pm_id == pm_id)
+    if start:
+        filters.append(Project.end_date >= start)
+    if end:
+        filters.append(Project.start_date <= end)
+    
+    return keyset(query.where(*filters), page, Project.created_at, Project.id, descending=True)
+
+
+@router.get("", response_model=None, responses={200: {"model": list[ProjectRead]}})
+async def list_projects(
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    page: Page,
+    view: ProjectViewParams,
+    response: Response,
+    status_filter: str | None = Query(default=None, alias="status"),
+    pm_id: uuid.UUID | None = None,
+    start: date | None = None,
+    end: date | None = None
+):
+    """
+    List the organization's projects, newest first, one page at a time.
+    
+    Filters combine; `start`/`end` keep projects overlapping that window. The
+    next page's cursor is returned in the X-Next-Cursor header. `include` and
+    `fields` trim the nested levels and project fields that are loaded.
+    """
+    criteria = (org_id, page, status_filter, pm_id, start, end)
+    if get_settings().project_json_reads:
+        query = project_list_query(project_documents(db, view.fields, view.depth), *criteria)
+        result = await db.execute(query)
+        rows = page_of(result.all(), page, response, lambda r: [r.created_at, r.id])
+        return Response(json_array([r.doc for r in rows]), media_type="application/json", headers=response.headers)
+    
+    query = project_list_query(select(Project).options(*view.options()), *criteria)
+    result = await db.execute(query)
+    projects = page_of(result.scalars().all(), page, response, lambda p: [p.created_at, p.id])
+    return [view.dump(p) for p in projects]
 
 
 @router.post("", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
@@ -93,24 +224,49 @@ async def create_project(
     return ProjectRead.model_validate(project)
 
 
-@router.get("/{project_id}", response_model=ProjectRead)
-async def get_project(project_id: uuid.UUID, db: DbSession, org_id: CurrentSessionOrgId):
-    """Get a specific project."""
+@router.get("/{project_id}", response_model=None, responses={200: {"model": ProjectRead}})
+async def get_project(
+    project_id: uuid.UUID,
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    view: ProjectViewParams
+):
+    """Get a specific project; `include` and `fields` work as for the list."""
+    if get_settings().project_json_reads:
+        result = await db.execute(
+            project_documents(db, view.fields, view.depth)
+            .where(Project.id == project_id, Project.org_id == org_id)
+        )
+        doc = result.scalar_one_or_none()
+        if doc is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        return Response(doc, media_type="application/json")
+    
     result = await db.execute(
         select(Project)
         .where(Project.id == project_id, Project.org_id == org_id)
-        .options(
-            selectinload(Project.launch_details)
-            .selectinload(LaunchDetail.input_gateways)
-            .selectinload(InputGateway.versions)
-        )
+        .options(*view.options())
     )
     project = result.scalar_one_or_none()
     
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    return ProjectRead.model_validate(project)
+    return view.dump(project)
+
+
+@router.get("/{project_id}/critical-path", response_model=CriticalPathResult)
+async def get_critical_path(project_id: uuid.UUID, db: DbSession, org_id: CurrentSessionOrgId):
+    """
+    Get the critical path of a project: early/late dates and slack per task and
+    the chain of tasks driving its finish. Cached until the project's schedule changes.
+    """
+    try:
+        return await get_project_critical_path(db, project_id, org_id)
+    except CalendarRangeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
 
 @router.patch("/{project_id}", response_model=ProjectRead)
@@ -120,39 +276,119 @@ async def update_project(
     db: DbSession,
     org_id: CurrentSessionOrgId
 ):
-    """Update a project."""
+    """Update a project; the broadcast carries only what changed (a patch between versions)."""
+    # Locked so the version the patch starts from is the one being changed
     result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.org_id == org_id)
+        select(Project)
+        .where(Project.id == project_id, Project.org_id == org_id)
+        .options(
+            selectinload(Project.launch_details)
+            .selectinload(LaunchDetail.input_gateways)
+            .selectinload(InputGateway.versions)
+        )
+        .with_for_update(of=Project)
     )
     project = result.scalar_one_or_none()
     
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
+    before = ProjectRead.model_validate(project).model_dump(mode="json")
     update_data = updates.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(project, field, value)
     
     await db.flush()
+    await bump_schedule_versions(db, [project_id])
+    project_read = ProjectRead.model_validate(project)
+    
+    # Broadcast update event
+    await manager.broadcast_to_org(org_id, {
+        "type": EventType.PROJECT_UPDATED,
+        "payload": entity_delta(before, project_read.model_dump(mode="json"))
+    })
+    
+    return project_read
+
+
+@router.post("/{project_id}/shift", response_model=ProjectShiftResult)
+async def shift_project_timeline(
+    project_id: uuid.UUID,
+    shift: ProjectShiftRequest,
+    db: DbSession,
+    org_id: CurrentSessionOrgId
+):
+    """
+    Move a project, all of its tasks, its launch go-live dates and its gateway
+    expected dates by N months and/or days, in one transaction.
+    
+    Moved task dates roll forward to working days of the project's calendar,
+    and tasks whose links the move broke (month ends clamp, so Jan 30 and
+    Jan 31 both land on Feb 28) are pushed to fit. Successors in other projects
+    are pushed if the move violates their links. Sends a single PROJECT_SHIFTED event.
+    """
+    if not shift.months and not shift.days:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to shift")
+    
+    try:
+        summary = await shift_project(db, project_id, org_id, shift.months, shift.days)
+    except CalendarRangeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
     # Reload with relationships
     result = await db.execute(
         select(Project)
-        .where(Project.id == project.id)
+        .where(Project.id == project_id)
         .options(
             selectinload(Project.launch_details)
             .selectinload(LaunchDetail.input_gateways)
+            .selectinload(InputGateway.versions)
         )
+        .execution_options(populate_existing=True)
     )
     project = result.scalar_one()
+    response = ProjectShiftResult(
+        project=ProjectRead.model_validate(project),
+        months=summary['months'],
+        days=summary['days'],
+        tasks_shifted=summary['tasks_shifted'],
+        launches_shifted=summary['launches_shifted'],
+        gateways_shifted=summary['gateways_shifted'],
+        cascaded_tasks=summary['cascaded_tasks']
+    )
     
-    # Broadcast update event
+    # Broadcast event
     await manager.broadcast_to_org(org_id, {
-        "type": EventType.PROJECT_UPDATED,
-        "payload": ProjectRead.model_validate(project).model_dump()
+        "type": EventType.PROJECT_SHIFTED,
+        "payload": response.model_dump()
     })
     
-    return ProjectRead.model_validate(project)
+    return response
+
+
+@router.post(":bulk-delete", response_model=ProjectBulkDeleteResult)
+async def delete_projects(criteria: ProjectBulkDelete, db: DbSession, org_id: CurrentSessionOrgId):
+    """
+    Delete many projects, with their tasks, launches and gateways: the listed
+    ids and/or every project with a status.
+    
+    Projects are deleted with set-based DELETEs in batches that are committed
+    one by one; a PROJECTS_DELETED event is broadcast for each batch.
+    """
+    if criteria.ids is None and not criteria.status:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Give ids or status")
+    
+    async def batch_deleted(project_ids: list[uuid.UUID]) -> None:
+        # Broadcast delete event
+        await manager.broadcast_to_org(org_id, {
+            "type": EventType.PROJECTS_DELETED,
+            "payload": {"ids": [str(project_id) for project_id in project_ids]}
+        })
+    
+    summary = await bulk_delete_projects(db, org_id, criteria.ids, criteria.status, on_batch=batch_deleted)
+    return ProjectBulkDeleteResult(**summary)
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -166,6 +402,7 @@ async def delete_project(project_id: uuid.UUID, db: DbSession, org_id: CurrentSe
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
+    await CapacityLedgerService(db).record_tasks_removed(Task.project_id == project_id)
     await db.delete(project)
     
     # Broadcast delete event
@@ -183,8 +420,13 @@ async def update_gateway(
     db: DbSession,
     org_id: CurrentSessionOrgId
 ):
-    """Update an input gateway status (triggers rework logic if needed)."""
-    # Get project and gateway
+    """
+    Update an input gateway status (triggers rework logic if needed).
+    
+    The gateway is part of its project's document: the project's version is
+    bumped and the broadcast carries the patch between the two versions.
+    """
+    # Get project and gateway (locked, as for update_project)
     result = await db.execute(
         select(Project)
         .where(Project.id == project_id, Project.org_id == org_id)
@@ -193,12 +435,15 @@ async def update_gateway(
             .selectinload(LaunchDetail.input_gateways)
             .selectinload(InputGateway.versions)
         )
+        .with_for_update(of=Project)
     )
     project = result.scalar_one_or_none()
     
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
+    before = ProjectRead.model_validate(project).model_dump(mode="json")
+    
     # Find the gateway
     gateway = None
     launch_detail = None
@@ -259,10 +504,12 @@ async def update_gateway(
             status="Planning"
         )
         db.add(market_status)
+        await bump_schedule_versions(db, [project.id])
     
+    project.version += 1
     await db.flush()
     
-    # Reload project
+    # Reload project (with the new version row)
     result = await db.execute(
         select(Project)
         .where(Project.id == project.id)
@@ -271,13 +518,14 @@ async def update_gateway(
             .selectinload(LaunchDetail.input_gateways)
             .selectinload(InputGateway.versions)
         )
+        .execution_options(populate_existing=True)
     )
-    project = result.scalar_one()
+    project_read = ProjectRead.model_validate(result.scalar_one())
     
     # Broadcast event
     await manager.broadcast_to_org(org_id, {
         "type": EventType.GATEWAY_UPDATED,
-        "payload": ProjectRead.model_validate(project).model_dump()
+        "payload": entity_delta(before, project_read.model_dump(mode="json"), gateway_id=str(gateway_id))
     })
     
-    return ProjectRead.model_validate(project)
+    return project_read
@@ -1,35 +1,60 @@
 """Resources router with full CRUD and tiered availability."""
 
 import uuid
-from fastapi import APIRouter, HTTPException, status
+from datetime import date
+from fastapi import APIRouter, HTTPException, Response, status
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.dependencies import DbSession, CurrentSessionOrgId
+from app.pagination import Page, keyset, page_of
 from app.models import Resource, User, UserAssignment
 from app.schemas.resource import ResourceCreate, ResourceRead, ResourceUpdate
 from app.websocket import manager, EventType
+from app.services.capacity_ledger import CapacityLedgerService, bucket_range, bucket_capacity
 
 router = APIRouter(prefix="/resources", tags=["Resources"])
 
 
 @router.get("", response_model=list[ResourceRead])
-async def list_resources(db: DbSession, org_id: CurrentSessionOrgId):
-    """List all resources for the current organization."""
-    result = await db.execute(
-        select(Resource)
-        .where(Resource.org_id == org_id)
-        .order_by(Resource.name)
-    )
-    resources = result.scalars().all()
+async def list_resources(
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    page: Page,
+    response: Response,
+    role: str | None = None,
+    team: str | None = None
+):
+    """
+    List the organization's resources by name, one page at a time.
+    
+    The next page's cursor is returned in the X-Next-Cursor header.
+    """
+    query = select(Resource).where(Resource.org_id == org_id)
+    if role:
+        query = query.where(Resource.role == role)
+    if team:
+        query = query.where(Resource.team == team)
+    
+    result = await db.execute(keyset(query, page, Resource.name, Resource.id))
+    resources = page_of(result.scalars().all(), page, response, lambda r: [r.name, r.id])
     return [ResourceRead.model_validate(r) for r in resources]
 
 
 @router.get("/available")
-async def get_available_resources(db: DbSession, org_id: CurrentSessionOrgId):
+async def get_available_resources(
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    start: date | None = None,
+    end: date | None = None
+):
     """
     Get tiered list of available resources for task assignment.
     
+    Booked and available hours are read from the capacity ledger for the
+    buckets covering `start`..`end` (defaults to the current bucket). Hours of
+    undated tasks count once towards the window.
+    
     Returns:
     - primary: Users assigned to this org as primary (is_primary=True)
     - shared: Users with capacity available (total allocation < 100%)
@@ -45,6 +70,36 @@ async def get_available_resources(db: DbSession, org_id: CurrentSessionOrgId):
     )
     primary_assignments = primary_result.scalars().all()
     
+    # Get shared resources (users not primary to this org but with available capacity)
+    # First get users assigned to this org but not as primary
+    non_primary_result = await db.execute(
+        select(UserAssignment)
+        .options(selectinload(UserAssignment.user))
+        .where(
+            UserAssignment.org_id == org_id,
+            UserAssignment.is_primary == False
+        )
+    )
+    non_primary_assignments = non_primary_result.scalars().all()
+    
+    # Booked hours for the window, one ledger read for every listed user
+    ledger = CapacityLedgerService(db)
+    start = start or end or date.today()
+    end = max(end or start, start)
+    buckets = bucket_range(start, end, ledger.period)
+    booked = await ledger.get_booked_hours(
+        start, end, org_id=org_id,
+        assignee_ids=[a.user_id for a in (*primary_assignments, *non_primary_assignments)],
+        spread_unscheduled=False
+    )
+    
+    def booked_hours(a: UserAssignment) -> float:
+        return round(sum(booked.get((org_id, a.user_id), {}).values()), 2)
+    
+    def available_hours(a: UserAssignment) -> float:
+        share = bucket_capacity(a.user.capacity_hours or 160, ledger.period) * (a.allocation_percent or 100) / 100
+        return round(share * len(buckets) - booked_hours(a), 2)
+    
     primary_resources = [
         {
             "id": str(a.user.id),
@@ -54,24 +109,14 @@ async def get_available_resources(db: DbSession, org_id: CurrentSessionOrgId):
             "capacity_hours": a.user.capacity_hours,
             "allocation_percent": a.allocation_percent,
             "is_primary": True,
+            "booked_hours": booked_hours(a),
+            "available_hours": available_hours(a),
             "cost_rate": float(a.user.cost_rate) if a.user.cost_rate else None,
             "billable_rate": float(a.user.billable_rate) if a.user.billable_rate else None
         }
         for a in primary_assignments if a.user.is_active
     ]
     
-    # Get shared resources (users not primary to this org but with available capacity)
-    # First get users assigned to this org but not as primary
-    non_primary_result = await db.execute(
-        select(UserAssignment)
-        .options(selectinload(UserAssignment.user))
-        .where(
-            UserAssignment.org_id == org_id,
-            UserAssignment.is_primary == False
-        )
-    )
-    non_primary_assignments = non_primary_result.scalars().all()
-    
     shared_resources = [
         {
             "id": str(a.user.id),
@@ -81,6 +126,8 @@ async def get_available_resources(db: DbSession, org_id: CurrentSessionOrgId):
             "capacity_hours": a.user.capacity_hours,
             "allocation_percent": a.allocation_percent,
             "is_primary": False,
+            "booked_hours": booked_hours(a),
+            "available_hours": available_hours(a),
             "cost_rate": float(a.user.cost_rate) if a.user.cost_rate else None,
             "billable_rate": float(a.user.billable_rate) if a.user.billable_rate else None
         }
@@ -91,6 +138,8 @@ async def get_available_resources(db: DbSession, org_id: CurrentSessionOrgId):
     # (This is for the Global Resource Manager to see candidates for assignment)
     
     return {
+        "period": ledger.period,
+        "buckets": [str(b) for b in buckets],
         "primary": primary_resources,
         "shared": shared_resources
     }
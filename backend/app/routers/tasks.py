@@ -1,35 +1,80 @@
 """Tasks router with full CRUD and auto-assignment."""
 
 import uuid
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from typing import Literal
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from sqlalchemy import Select, select, text
 from sqlalchemy.orm import selectinload
 
 from app.dependencies import DbSession, CurrentSessionOrgId
-from app.models import Task, TaskMarketStatus, Resource, Project
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate, AutoAssignResult
-from app.websocket import manager, EventType
-from app.services import auto_assign_resources, update_task_cascade
+from app.pagination import Page, PageParams, keyset, page_of
+from app.models import Task, TaskMarketStatus, TaskDependency, Resource, Project
+from app.schemas.task import (
+    TaskCreate, TaskRead, TaskUpdate, TaskUpdateResult, AutoAssignResult, AutoAssignApply,
+    TaskDependencyCreate, TaskDependencyRead, TaskDependencyResult,
+    CascadePreviewRequest, CascadePreviewResult, TaskBatchUpdate, TaskBatchResult,
+    TaskBulkDelete, TaskBulkDeleteResult
+)
+from app.websocket import manager, EventType, entity_delta
+from app.services import (
+    auto_assign_resources, CapacityLedgerService, booking_snapshot,
+    ResourceAllocationService, StaleProposalError, TaskDependencyService, bump_schedule_versions,
+    update_tasks_batch, bulk_delete_tasks
+)
+from app.services.task_dependencies import MAX_DEPENDENCY_DEPTH, DependencyCycleError
+from app.services.working_calendar import CalendarRangeError
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
+def task_list_query(
+    org_id: uuid.UUID,
+    page: PageParams,
+    project_id: uuid.UUID | None = None,
+    status_filter: str | None = None,
+    assignee_id: uuid.UUID | None = None,
+    start: date | None = None,
+    end: date | None = None
+) -> Select:
+    """Query of one page of the task list (also EXPLAINed by benchmarks.check_query_plans)."""
+    query = select(Task).where(Task.org_id == org_id)
+    
+    if project_id:
+        query = query.where(Task.project_id == project_id)
+    if status_filter:
+        query = query.where(Task.status == status_filter)
+    if assignee_id:
+        query = query.where(Task.assignee_id == assignee_id)
+    if start:
+        query = query.where(Task.end_date >= start)
+    if end:
+        query = query.where(Task.start_date <= end)
+    
+    return keyset(query, page, Task.start_date, Task.id, nulls_last=True)
+
+
 @router.get("", response_model=list[TaskRead])
 async def list_tasks(
     db: DbSession, 
     org_id: CurrentSessionOrgId,
-    project_id: uuid.UUID | None = None
+    page: Page,
+    response: Response,
+    project_id: uuid.UUID | None = None,
+    status_filter: str | None = Query(default=None, alias="status"),
+    assignee_id: uuid.UUID | None = None,
+    start: date | None = None,
+    end: date | None = None
 ):
-    """List tasks, optionally filtered by project."""
-    query = select(Task).where(Task.org_id == org_id).options(
-        selectinload(Task.market_statuses)
-    )
-    
-    if project_id:
-        query = query.where(Task.project_id == project_id)
+    """
+    List tasks by start date (undated last), one page at a time.
     
-    result = await db.execute(query.order_by(Task.start_date))
-    tasks = result.scalars().all()
+    Filters combine; `start`/`end` keep tasks overlapping that window. The
+    next page's cursor is returned in the X-Next-Cursor header.
+    """
+    query = task_list_query(org_id, page, project_id, status_filter, assignee_id, start, end)
+    result = await db.execute(query.options(selectinload(Task.market_statuses)))
+    tasks = page_of(result.scalars().all(), page, response, lambda t: [t.start_date, t.id])
     return [TaskRead.model_validate(t) for t in tasks]
 
 
@@ -69,6 +114,8 @@ async def create_task(task_data: TaskCreate, db: DbSession, org_id: CurrentSessi
                 db.add(market_status)
     
     await db.flush()
+    await CapacityLedgerService(db).record_change(None, booking_snapshot(task))
+    await bump_schedule_versions(db, [task.project_id])
     
     # Reload with relationships
     result = await db.execute(
@@ -101,41 +148,288 @@ async def get_task(task_id: uuid.UUID, db: DbSession, org_id: CurrentSessionOrgI
     return TaskRead.model_validate(task)
 
 
-@router.patch("/{task_id}", response_model=TaskRead)
+@router.get("/{task_id}/dependencies")
+async def get_task_dependencies(
+    task_id: uuid.UUID,
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    depth: int | None = Query(default=None, ge=1, le=MAX_DEPENDENCY_DEPTH)
+):
+    """
+    Get every upstream and downstream dependency of a task in one query.
+    
+    `depth` limits the number of hops walked in each direction.
+    """
+    try:
+        return await TaskDependencyService(db).get_dependencies(task_id, org_id, depth)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+
+async def _get_org_task(db, task_id: uuid.UUID, org_id: uuid.UUID) -> Task:
+    """Get a task of the current organization or raise 404."""
+    result = await db.execute(
+        select(Task).where(Task.id == task_id, Task.org_id == org_id)
+    )
+    task = result.scalar_one_or_none()
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return task
+
+
+@router.get("/{task_id}/predecessors", response_model=list[TaskDependencyRead])
+async def list_task_predecessors(task_id: uuid.UUID, db: DbSession, org_id: CurrentSessionOrgId):
+    """List the direct predecessors of a task with link type and lag."""
+    task = await _get_org_task(db, task_id, org_id)
+    return await TaskDependencyService(db).list_predecessors(task)
+
+
+@router.post(
+    "/{task_id}/predecessors",
+    response_model=TaskDependencyResult,
+    status_code=status.HTTP_201_CREATED
+)
+async def add_task_predecessor(
+    task_id: uuid.UUID,
+    link: TaskDependencyCreate,
+    db: DbSession,
+    org_id: CurrentSessionOrgId
+):
+    """
+    Add a typed predecessor link (FS/SS/FF/SF with lag) to a task.
+    
+    The task and its successors are pushed forward to satisfy the link; links
+    that would form a cycle are rejected.
+    """
+    task = await _get_org_task(db, task_id, org_id)
+    result = await db.execute(
+        select(Task.title).where(Task.id == link.predecessor_id, Task.org_id == org_id)
+    )
+    predecessor_title = result.scalar_one_or_none()
+    if predecessor_title is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Predecessor not found")
+    
+    result = await db.execute(
+        select(TaskDependency.id).where(
+            TaskDependency.predecessor_id == link.predecessor_id,
+            TaskDependency.successor_id == task_id
+        )
+    )
+    if result.scalar_one_or_none():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Dependency already exists")
+    
+    try:
+        dependency, cascaded = await TaskDependencyService(db).add_dependency(
+            task, link.predecessor_id, link.type, link.lag_days
+        )
+    except (DependencyCycleError, CalendarRangeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    response = TaskDependencyResult(
+        predecessor_id=dependency.predecessor_id,
+        successor_id=dependency.successor_id,
+        predecessor_title=predecessor_title,
+        type=dependency.type,
+        lag_days=dependency.lag_days,
+        cascaded_tasks=cascaded
+    )
+    
+    # Broadcast event
+    await manager.broadcast_to_org(org_id, {
+        "type": EventType.TASK_UPDATED,
+        "payload": {"id": str(task_id), **response.model_dump()}
+    })
+    
+    return response
+
+
+@router.delete("/{task_id}/predecessors/{predecessor_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_task_predecessor(
+    task_id: uuid.UUID,
+    predecessor_id: uuid.UUID,
+    db: DbSession,
+    org_id: CurrentSessionOrgId
+):
+    """Remove the link between a task and one of its predecessors."""
+    task = await _get_org_task(db, task_id, org_id)
+    if not await TaskDependencyService(db).remove_dependency(task, predecessor_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dependency not found")
+    
+    # Broadcast event
+    await manager.broadcast_to_org(org_id, {
+        "type": EventType.TASK_UPDATED,
+        "payload": {"id": str(task_id), "removed_predecessor_id": str(predecessor_id)}
+    })
+
+
+@router.post("/{task_id}/cascade-preview", response_model=CascadePreviewResult)
+async def preview_task_cascade(
+    task_id: uuid.UUID,
+    proposal: CascadePreviewRequest,
+    db: DbSession,
+    org_id: CurrentSessionOrgId
+):
+    """
+    Preview moving a task to new dates: the tasks that would be pushed, across
+    projects, and how each project's finish would change.
+    
+    Runs in a read-only transaction (a single snapshot on PostgreSQL), writes
+    nothing and broadcasts nothing.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"))
+    
+    try:
+        task = await _get_org_task(db, task_id, org_id)
+        start_date = proposal.start_date or task.start_date
+        end_date = proposal.end_date or task.end_date
+        if start_date and end_date and end_date < start_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date is before start_date")
+        
+        preview = await TaskDependencyService(db).preview_cascade(task, start_date, end_date)
+    except CalendarRangeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    finally:
+        await db.rollback()
+    
+    return CascadePreviewResult(**preview)
+
+
+@router.patch(":batch", response_model=TaskBatchResult)
+async def update_tasks(batch: TaskBatchUpdate, db: DbSession, org_id: CurrentSessionOrgId):
+    """
+    Update many tasks in one transaction.
+    
+    Each item carries a task id and only the fields to change. Rejected items
+    (unknown task, unknown predecessor, cycle, repeated task) are listed under
+    `errors` and the rest are applied. Date changes cascade once for the whole
+    batch, and a single TASKS_UPDATED event is broadcast.
+    """
+    try:
+        result = await update_tasks_batch(
+            db, org_id, [item.model_dump(exclude_unset=True) for item in batch.updates]
+        )
+    except CalendarRangeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response = TaskBatchResult(
+        tasks=[TaskRead.model_validate(t) for t in result['tasks']],
+        errors=result['errors'],
+        cascaded_tasks=result['cascaded_tasks']
+    )
+    
+    # Broadcast event
+    if response.tasks:
+        await manager.broadcast_to_org(org_id, {
+            "type": EventType.TASKS_UPDATED,
+            "payload": response.model_dump(exclude={"errors"})
+        })
+    
+    return response
+
+
+@router.post(":bulk-delete", response_model=TaskBulkDeleteResult)
+async def delete_tasks(criteria: TaskBulkDelete, db: DbSession, org_id: CurrentSessionOrgId):
+    """
+    Delete many tasks: the listed ids, or every task of a project and/or with
+    a status (criteria combine).
+    
+    Tasks are deleted with set-based DELETEs in batches that are committed one
+    by one, so a large delete does not hold its locks until the end; a
+    TASKS_DELETED event is broadcast for each batch.
+    """
+    if criteria.ids is None and not criteria.project_id and not criteria.status:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Give ids, project_id or status")
+    
+    async def batch_deleted(task_ids: list[uuid.UUID]) -> None:
+        # Broadcast event
+        await manager.broadcast_to_org(org_id, {
+            "type": EventType.TASKS_DELETED,
+            "payload": {"ids": [str(task_id) for task_id in task_ids]}
+        })
+    
+    summary = await bulk_delete_tasks(
+        db, org_id, criteria.ids, criteria.project_id, criteria.status, on_batch=batch_deleted
+    )
+    return TaskBulkDeleteResult(**summary)
+
+
+@router.patch("/{task_id}", response_model=TaskUpdateResult)
 async def update_task(
     task_id: uuid.UUID,
     updates: TaskUpdate,
     db: DbSession,
     org_id: CurrentSessionOrgId
 ):
-    """Update a task."""
+    """
+    Update a task.
+    
+    Changing its dates pushes dependent tasks forward (and setting a predecessor
+    pushes the task itself); the pushed tasks are returned under `cascaded_tasks`
+    and included in the single broadcast.
+    """
+    # Locked so the version the broadcast patch starts from is the one being changed
     result = await db.execute(
-        select(Task).where(Task.id == task_id, Task.org_id == org_id)
+        select(Task)
+        .where(Task.id == task_id, Task.org_id == org_id)
+        .options(selectinload(Task.market_statuses))
+        .with_for_update(of=Task)
     )
     task = result.scalar_one_or_none()
     
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
+    previous = TaskRead.model_validate(task).model_dump(mode="json")
+    before = booking_snapshot(task)
     update_data = updates.model_dump(exclude_unset=True)
+    if update_data.get('predecessor_id'):
+        result = await db.execute(
+            select(Task.id).where(Task.id == update_data['predecessor_id'], Task.org_id == org_id)
+        )
+        if not result.scalar_one_or_none():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Predecessor not found")
+        try:
+            await TaskDependencyService(db).check_predecessor(
+                task.id, task.project_id, update_data['predecessor_id']
+            )
+        except DependencyCycleError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     for field, value in update_data.items():
         setattr(task, field, value)
     
     await db.flush()
+    await CapacityLedgerService(db).record_change(before, booking_snapshot(task))
     
-    # Reload with relationships
+    # Push successors after new dates, and the task itself after a new predecessor
+    roots = []
+    if 'start_date' in update_data or 'end_date' in update_data:
+        roots.append((task.project_id, task.id))
+    if update_data.get('predecessor_id'):
+        roots.append((task.project_id, task.predecessor_id))
+    try:
+        cascaded = await TaskDependencyService(db).cascade_from_tasks(roots) if roots else []
+    except CalendarRangeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await bump_schedule_versions(db, [task.project_id])
+    
+    # Reload with relationships (a cascade may have moved the task itself)
     result = await db.execute(
-        select(Task).where(Task.id == task.id).options(selectinload(Task.market_statuses))
+        select(Task)
+        .where(Task.id == task.id)
+        .options(selectinload(Task.market_statuses))
+        .execution_options(populate_existing=True)
     )
-    task = result.scalar_one()
+    task_read = TaskRead.model_validate(result.scalar_one())
+    response = TaskUpdateResult(**task_read.model_dump(), cascaded_tasks=cascaded)
     
-    # Broadcast event
+    # Broadcast event: the patch between versions, plus the pushed successors
     await manager.broadcast_to_org(org_id, {
         "type": EventType.TASK_UPDATED,
-        "payload": TaskRead.model_validate(task).model_dump()
+        "payload": entity_delta(previous, task_read.model_dump(mode="json"), cascaded_tasks=cascaded)
     })
     
-    return TaskRead.model_validate(task)
+    return response
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -149,7 +443,9 @@ async def delete_task(task_id: uuid.UUID, db: DbSession, org_id: CurrentSessionO
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
+    await CapacityLedgerService(db).record_change(booking_snapshot(task), None)
     await db.delete(task)
+    await bump_schedule_versions(db, [task.project_id])
     
     # Broadcast event
     await manager.broadcast_to_org(org_id, {
@@ -159,15 +455,61 @@ async def delete_task(task_id: uuid.UUID, db: DbSession, org_id: CurrentSessionO
 
 
 @router.post("/auto-assign", response_model=AutoAssignResult)
-async def auto_assign_tasks(db: DbSession, org_id: CurrentSessionOrgId):
+async def auto_assign_tasks(
+    db: DbSession,
+    org_id: CurrentSessionOrgId,
+    mode: Literal["greedy", "optimize"] = "greedy",
+    time_budget_ms: int | None = Query(default=None, ge=10, le=10000),
+    dry_run: bool = False
+):
     """
     Auto-assign tasks to resources using 3-tier algorithm:
     1. Primary resources (belong to current portfolio)
     2. Shared resources (from other portfolios with allocation)
     3. Cross-portfolio suggestions (candidates for reallocation)
+    
+    `mode=optimize` replaces the greedy first fit of tiers 1-2 with a
+    bin-packing solver bounded by `time_budget_ms`.
+    
+    `dry_run=true` returns the proposed assignments and a `proposal_token`
+    without writing or broadcasting anything; apply it with `/auto-assign/apply`.
     """
     # Use the service layer for business logic
-    result = await auto_assign_resources(db, org_id)
+    result = await auto_assign_resources(db, org_id, mode, time_budget_ms, dry_run)
+    
+    if not dry_run:
+        # Broadcast event
+        await manager.broadcast_to_org(org_id, {
+            "type": EventType.TASKS_AUTO_ASSIGNED,
+            "payload": result
+        })
+    
+    return AutoAssignResult(
+        assigned_count=result['summary']['assigned'],
+        gaps=result['gaps'],
+        shared_assignments=result.get('shared_assignments', []),
+        cross_portfolio_suggestions=result.get('cross_portfolio_suggestions', []),
+        solver=result.get('solver'),
+        dry_run=dry_run,
+        proposed_assignments=result.get('proposed_assignments', []),
+        proposal_token=result.get('proposal_token')
+    )
+
+
+@router.post("/auto-assign/apply", response_model=AutoAssignResult)
+async def apply_auto_assign_proposal(
+    request: AutoAssignApply,
+    db: DbSession,
+    org_id: CurrentSessionOrgId
+):
+    """Apply a dry-run auto-assign proposal exactly as it was computed."""
+    service = ResourceAllocationService(db, org_id)
+    try:
+        result = await service.apply_proposal(request.proposal_token)
+    except StaleProposalError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     # Broadcast event
     await manager.broadcast_to_org(org_id, {
@@ -177,8 +519,7 @@ async def auto_assign_tasks(db: DbSession, org_id: CurrentSessionOrgId):
     
     return AutoAssignResult(
         assigned_count=result['summary']['assigned'],
-        gaps=result['gaps'],
-        shared_assignments=result.get('shared_assignments', []),
-        cross_portfolio_suggestions=result.get('cross_portfolio_suggestions', [])
+        gaps=[],
+        proposed_assignments=result['proposed_assignments']
     )
 
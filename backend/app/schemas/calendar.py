@@ -0,0 +1,31 @@
+"""Working calendar schemas."""
+
+import uuid
+from datetime import date
+from pydantic import BaseModel, Field
+
+
+class HolidayCreate(BaseModel):
+    """Schema for adding a holiday (org-wide unless a market is given)."""
+    day: date
+    name: str | None = None
+    market_id: uuid.UUID | None = None
+
+
+class HolidayRead(HolidayCreate):
+    """Schema for reading a holiday."""
+    id: uuid.UUID
+    
+    class Config:
+        from_attributes = True
+
+
+class WorkingCalendarUpdate(BaseModel):
+    """Schema for updating the work week, Monday first, 1 = working day."""
+    workweek: str = Field(pattern=r"^[01]{7}$")
+
+
+class WorkingCalendarRead(BaseModel):
+    """Schema for reading an organization's working calendar."""
+    workweek: str
+    holidays: list[HolidayRead] = []
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import date, datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class InputGatewayVersionRead(BaseModel):
@@ -90,7 +90,64 @@ class ProjectRead(ProjectBase):
     pm_id: uuid.UUID | None
     original_end_date: date | None
     created_at: datetime
+    version: int
     launch_details: list[LaunchDetailRead] = []
     
     class Config:
         from_attributes = True
+
+
+class ProjectShiftRequest(BaseModel):
+    """Move a project's timeline by calendar months and/or days (negative = earlier)."""
+    months: int = Field(default=0, ge=-120, le=120)
+    days: int = Field(default=0, ge=-3650, le=3650)
+
+
+class ProjectShiftResult(BaseModel):
+    """Shifted project plus what moved with it."""
+    project: ProjectRead
+    months: int
+    days: int
+    tasks_shifted: int
+    launches_shifted: int
+    gateways_shifted: int
+    cascaded_tasks: list[dict] = []  # successors pushed in other projects
+
+
+class ProjectBulkDelete(BaseModel):
+    """Projects to delete: the listed ids, narrowed by status if given."""
+    ids: list[uuid.UUID] | None = Field(default=None, max_length=10000)
+    status: str | None = None
+
+
+class ProjectBulkDeleteResult(BaseModel):
+    """Outcome of a bulk project delete."""
+    deleted: int
+    batches: int  # committed separately, one PROJECTS_DELETED event each
+
+
+class CriticalPathTask(BaseModel):
+    """CPM dates and slack of one task."""
+    id: uuid.UUID
+    title: str
+    start_date: date | None
+    end_date: date | None
+    early_start: date
+    early_finish: date
+    late_start: date
+    late_finish: date
+    slack_days: int
+    critical: bool
+
+
+class CriticalPathResult(BaseModel):
+    """Critical path analysis of a project."""
+    project_id: uuid.UUID
+    project_end_date: date | None
+    computed_finish: date | None
+    end_date_variance_days: int | None  # computed finish minus planned end date
+    tasks: list[CriticalPathTask]
+    critical_path: list[uuid.UUID]  # driving chain, first to last
+    unscheduled: list[uuid.UUID] = []  # tasks without dates
+    cyclic: list[uuid.UUID] = []  # tasks on a predecessor cycle
+    cached: bool = False
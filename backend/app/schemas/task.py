@@ -2,7 +2,8 @@
 
 import uuid
 from datetime import date
-from pydantic import BaseModel
+from typing import Literal
+from pydantic import BaseModel, Field
 
 
 class TaskMarketStatusRead(BaseModel):
@@ -41,6 +42,7 @@ class TaskUpdate(BaseModel):
     actual: int | None = None
     start_date: date | None = None
     end_date: date | None = None
+    predecessor_id: uuid.UUID | None = None
     linked_initiative_id: uuid.UUID | None = None
 
 
@@ -56,16 +58,134 @@ class TaskRead(TaskBase):
     gateway_source: str | None
     linked_initiative_id: uuid.UUID | None
     value_saved: int | None
+    version: int
     market_statuses: list[TaskMarketStatusRead] = []
     
     class Config:
         from_attributes = True
 
 
+class TaskDependencyCreate(BaseModel):
+    """Schema for linking a task after a predecessor."""
+    predecessor_id: uuid.UUID
+    type: Literal["FS", "SS", "FF", "SF"] = "FS"
+    lag_days: int = Field(default=0, ge=-3650, le=3650)  # negative = lead
+
+
+class TaskDependencyRead(BaseModel):
+    """Schema for reading a dependency link."""
+    predecessor_id: uuid.UUID
+    successor_id: uuid.UUID
+    predecessor_title: str | None = None
+    type: str
+    lag_days: int
+    
+    class Config:
+        from_attributes = True
+
+
+class TaskDependencyResult(TaskDependencyRead):
+    """Created link plus the tasks it pushed."""
+    cascaded_tasks: list[dict] = []
+
+
+class TaskUpdateResult(TaskRead):
+    """Updated task plus the successors its date change pushed."""
+    cascaded_tasks: list[dict] = []  # id, title, project_id, old/new start and end
+
+
+class TaskBatchItem(TaskUpdate):
+    """One update in a batch; only the fields sent are changed."""
+    id: uuid.UUID
+
+
+class TaskBatchUpdate(BaseModel):
+    """Schema for updating many tasks in one request."""
+    updates: list[TaskBatchItem] = Field(min_length=1, max_length=1000)
+
+
+class TaskBatchError(BaseModel):
+    """An update of a batch that was rejected."""
+    index: int  # position in `updates`
+    id: uuid.UUID
+    detail: str
+
+
+class TaskBatchResult(BaseModel):
+    """Updated tasks, rejected updates and the successors the batch pushed."""
+    tasks: list[TaskRead] = []
+    errors: list[TaskBatchError] = []
+    cascaded_tasks: list[dict] = []
+
+
+class TaskBulkDelete(BaseModel):
+    """Tasks to delete: the listed ids, narrowed by project and/or status if given."""
+    ids: list[uuid.UUID] | None = Field(default=None, max_length=10000)
+    project_id: uuid.UUID | None = None
+    status: str | None = None
+
+
+class TaskBulkDeleteResult(BaseModel):
+    """Outcome of a bulk task delete."""
+    deleted: int
+    batches: int  # committed separately, one TASKS_DELETED event each
+
+
+class CascadePreviewRequest(BaseModel):
+    """Proposed dates for a task; omitted dates keep their current value."""
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+class ProjectFinishChange(BaseModel):
+    """How a project's finish (latest task end) would move."""
+    project_id: uuid.UUID
+    name: str
+    end_date: date | None  # planned project end
+    old_finish: date | None
+    new_finish: date | None
+    slip_days: int | None
+
+
+class CascadePreviewResult(BaseModel):
+    """What moving a task would do, computed without writing anything."""
+    task_id: uuid.UUID
+    start_date: date | None
+    end_date: date | None
+    affected_tasks: list[dict] = []  # as in TaskUpdateResult.cascaded_tasks
+    affected_task_count: int
+    affected_project_count: int
+    project_changes: list[ProjectFinishChange] = []
+
+
 class AutoAssignResult(BaseModel):
     """Result of auto-assignment operation."""
     assigned_count: int
     gaps: list[dict]
     shared_assignments: list[dict] = []
     cross_portfolio_suggestions: list[dict] = []
+    solver: dict | None = None  # mode, iterations, objective, wall_time_ms
+    dry_run: bool = False
+    proposed_assignments: list[dict] = []
+    proposal_token: str | None = None
+
+
+class AutoAssignApply(BaseModel):
+    """Request to apply a dry-run auto-assign proposal."""
+    proposal_token: str
+
+
+class PortfolioAutoAssignRequest(BaseModel):
+    """Request to auto-assign tasks across many organizations in one pass."""
+    org_ids: list[uuid.UUID] | None = None  # None = all organizations
+    mode: Literal["greedy", "optimize"] = "greedy"
+    time_budget_ms: int | None = Field(default=None, ge=10, le=10000)
+    dry_run: bool = False
+    max_workers: int = Field(default=4, ge=1, le=32)
+
 
+class PortfolioAutoAssignResult(BaseModel):
+    """Per-organization results of a portfolio-wide auto-assign run."""
+    organizations: list[dict]
+    groups: list[list[str]]  # orgs that could book the same users, run in sequence
+    summary: dict
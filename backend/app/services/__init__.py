@@ -5,8 +5,26 @@ Contains service modules that encapsulate business rules:
 - resource_allocation: 3-tier auto-assignment algorithm
 - task_dependencies: Cascading date resolution
 - kvi_service: Value metrics calculations
+- capacity_ledger: Time-phased booked hours per assignee
+- portfolio_allocation: Auto-assignment across many organizations
+- critical_path: Cached CPM analysis per project
+- project_schedule: Schedule versions that cached schedule computations are keyed on
+- working_calendar: Business-day calendars per organization and market
+- project_shift: Set-based timeline shift of a whole project
+- task_batch: Many task updates in one transaction
+- bulk_delete: Set-based deletes of many tasks or projects in batches
+- project_json: Project read payloads assembled as JSON in the database
 """
 
-from .resource_allocation import auto_assign_resources, ResourceAllocationService
+from .resource_allocation import auto_assign_resources, ResourceAllocationService, StaleProposalError
 from .task_dependencies import update_task_cascade, TaskDependencyService
 from .kvi_service import get_portfolio_kvi, KVIService
+from .capacity_ledger import CapacityLedgerService, booking_snapshot
+from .portfolio_allocation import run_portfolio_allocation, SharedCapacityView
+from .critical_path import get_project_critical_path, CriticalPathService, critical_path_cache
+from .project_schedule import bump_schedule_versions
+from .working_calendar import CalendarRangeError, WorkingCalendar, get_org_calendar, get_project_calendar, calendar_cache, bump_calendar_version
+from .project_shift import shift_project, ProjectShiftService
+from .task_batch import update_tasks_batch, TaskBatchService
+from .bulk_delete import bulk_delete_tasks, bulk_delete_projects, BulkDeleteService
+from .project_json import project_documents, json_array, ProjectJsonService
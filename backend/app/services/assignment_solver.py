@@ -0,0 +1,232 @@
+"""
+Assignment Solver
+
+Optimizing alternative to the greedy first-fit tiers, used by
+`POST /api/tasks/auto-assign?mode=optimize`.
+
+Auto-assign is treated as a multi-bucket bin-packing problem over tasks x
+eligible slots (same team, primary or shared). The objective, lower is better:
+
+    unassigned_tasks * UNASSIGNED_PENALTY
+    + sum(estimate * cost_rate * tier_weight) over assigned tasks
+
+so assigning more tasks always wins, then cheaper and primary resources are
+preferred. The solver starts from the better of two constructions (the greedy
+tiers' most-headroom pick and a cheapest-feasible pick) and improves it with
+local search (ejecting a blocking task onto another slot to make room for an
+unassigned one, and relocating tasks to cheaper slots) until no move improves or
+the time budget runs out, so it never does worse than greedy.
+"""
+
+import time
+from typing import Optional
+from app.services.candidate_index import CandidateIndex, PRIMARY, SHARED
+
+# Weighting of shared over primary resources in the objective
+TIER_WEIGHTS = {PRIMARY: 1.0, SHARED: 1.5}
+
+# Cost of leaving a task unassigned; dominates any assignment cost
+UNASSIGNED_PENALTY = 1_000_000.0
+
+# Candidate slots examined per task and move, keeps one pass bounded
+MAX_CANDIDATES = 64
+
+
+def assignment_objective(tasks: list[dict], index: CandidateIndex, slots: dict) -> float:
+    """Objective value of an assignment (task id -> slot)."""
+    rates = _effective_rates(index)
+    objective = 0.0
+    for task in tasks:
+        slot = slots.get(task['id'])
+        if slot is None:
+            objective += UNASSIGNED_PENALTY
+        else:
+            objective += task['estimate'] * rates[slot] * TIER_WEIGHTS[index.tiers[slot]]
+    return objective
+
+
+def _effective_rates(index: CandidateIndex) -> list[float]:
+    """Cost rate per slot, with missing rates priced at the mean known rate."""
+    known = [r for r in index.cost_rate if r > 0]
+    fallback = sum(known) / len(known) if known else 1.0
+    return [r if r > 0 else fallback for r in index.cost_rate]
+
+
+class AssignmentSolver:
+    """Time-bounded bin-packing solver over a candidate index."""
+
+    def __init__(self, tasks: list[dict], index: CandidateIndex, time_budget_ms: int):
+        self.tasks = tasks
+        self.index = index
+        self.deadline = time.perf_counter() + time_budget_ms / 1000
+        self.rates = _effective_rates(index)
+        self.slots: dict = {}  # task id -> slot
+        self.by_slot: dict[int, list[dict]] = {}
+        self.iterations = 0
+        self._candidates: dict = {}
+
+    def solve(self) -> dict:
+        """
+        Solve in place: books the chosen slots in the index and returns stats.
+
+        Returns:
+            {task_id: slot} under 'slots', plus iterations, objective and timing
+        """
+        started = time.perf_counter()
+
+        # Construction: keep the better of headroom-first and cheapest-first
+        self._construct(self._headroom_fit)
+        headroom = initial = self._objective()
+        headroom_slots = dict(self.slots)
+        if not self._expired():
+            self._reset()
+            # An interrupted construction is incomplete, so fall back to headroom
+            initial = self._objective() if self._construct(self._cheapest_fit, bounded=True) else headroom
+        if headroom_slots != self.slots and headroom <= initial:
+            self._reset()
+            for task in self.tasks:
+                if task['id'] in headroom_slots:
+                    self._assign(task, headroom_slots[task['id']])
+            initial = headroom
+
+        # Local search until no move improves or the budget is spent
+        improved = True
+        timed_out = False
+        while improved and not timed_out:
+            improved = False
+            for task in sorted(self.tasks, key=lambda t: t['estimate']):
+                if self._expired():
+                    timed_out = True
+                    break
+                self.iterations += 1
+                if task['id'] not in self.slots:
+                    improved |= self._try_eject(task)
+                else:
+                    improved |= self._try_relocate(task)
+
+        return {
+            'slots': self.slots,
+            'iterations': self.iterations,
+            'initial_objective': round(initial, 2),
+            'objective': round(self._objective(), 2),
+            'wall_time_ms': round((time.perf_counter() - started) * 1000, 2),
+            'timed_out': timed_out,
+        }
+
+    def _expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+    def _objective(self) -> float:
+        return assignment_objective(self.tasks, self.index, self.slots)
+
+    def _cost(self, task: dict, slot: int) -> float:
+        return task['estimate'] * self.rates[slot] * TIER_WEIGHTS[self.index.tiers[slot]]
+
+    def _candidates_for(self, task: dict) -> list[int]:
+        """Eligible slots for a task's team, cheapest first."""
+        team = task['required_team']
+        candidates = self._candidates.get(team)
+        if candidates is None:
+            index = self.index
+            candidates = sorted(
+                index.slots_for(team),
+                key=lambda s: (self.rates[s] * TIER_WEIGHTS[index.tiers[s]], s)
+            )
+            self._candidates[team] = candidates
+        return candidates
+
+    def _construct(self, pick, bounded: bool = False) -> bool:
+        """
+        Assign tasks in order (they arrive by start date) with a slot picker.
+
+        Returns False if a bounded construction ran out of time.
+        """
+        for i, task in enumerate(self.tasks):
+            if bounded and i % 256 == 0 and self._expired():
+                return False
+            slot = pick(task)
+            if slot is not None:
+                self._assign(task, slot)
+        return True
+
+    def _reset(self) -> None:
+        """Release every assignment made so far."""
+        for task in self.tasks:
+            if task['id'] in self.slots:
+                self._release(task)
+
+    def _headroom_fit(self, task: dict) -> Optional[int]:
+        """Slot with the most headroom, primary before shared, as the greedy tiers pick."""
+        for tier in (PRIMARY, SHARED):
+            slot = self.index.find(tier, task['required_team'], task['demand'])
+            if slot is not None:
+                return slot
+        return None
+
+    def _cheapest_fit(self, task: dict, exclude: Optional[int] = None) -> Optional[int]:
+        """
+        Cheapest slot that can take a task.
+
+        Scans a bounded prefix of the cost-ordered candidates, then falls back to
+        the slot with the most headroom from the index heaps (primary first).
+        """
+        index = self.index
+        demand = task['demand']
+        for slot in self._candidates_for(task)[:MAX_CANDIDATES]:
+            if slot != exclude and index.fits(slot, demand):
+                return slot
+        for tier in (PRIMARY, SHARED):
+            slot = index.find(tier, task['required_team'], demand)
+            if slot is not None and slot != exclude:
+                return slot
+        return None
+
+    def _assign(self, task: dict, slot: int) -> None:
+        self.index.book(slot, task['demand'])
+        self.slots[task['id']] = slot
+        self.by_slot.setdefault(slot, []).append(task)
+
+    def _release(self, task: dict) -> int:
+        slot = self.slots.pop(task['id'])
+        self.index.unbook(slot, task['demand'])
+        self.by_slot[slot].remove(task)
+        return slot
+
+    def _try_eject(self, task: dict) -> bool:
+        """
+        Make room for an unassigned task by moving one blocking task elsewhere.
+
+        For each eligible slot, tentatively release one of its tasks; if the
+        unassigned task then fits and the released task can be re-placed on
+        another slot, keep the move.
+        """
+        slot = self._cheapest_fit(task)
+        if slot is not None:
+            self._assign(task, slot)
+            return True
+
+        for slot in self._candidates_for(task)[:MAX_CANDIDATES]:
+            for blocker in list(self.by_slot.get(slot, [])):
+                self._release(blocker)
+                if self.index.fits(slot, task['demand']):
+                    self._assign(task, slot)
+                    target = self._cheapest_fit(blocker, exclude=slot)
+                    if target is not None:
+                        self._assign(blocker, target)
+                        return True
+                    self._release(task)
+                self._assign(blocker, slot)
+        return False
+
+    def _try_relocate(self, task: dict) -> bool:
+        """Move an assigned task to a strictly cheaper slot that can take it."""
+        current = self.slots[task['id']]
+        current_cost = self._cost(task, current)
+        for slot in self._candidates_for(task)[:MAX_CANDIDATES]:
+            if self._cost(task, slot) >= current_cost:
+                break
+            if self.index.fits(slot, task['demand']):
+                self._release(task)
+                self._assign(task, slot)
+                return True
+        return False
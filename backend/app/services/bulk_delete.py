@@ -0,0 +1,260 @@
+"""
+Bulk Delete Service
+
+Deletes many tasks or projects, selected by id list or by filter, with
+set-based DELETEs instead of loading every row and cascading through the ORM.
+
+Rows are deleted in bounded batches, each committed on its own, so locks are
+held for one batch at a time and other writers can interleave. The tasks of
+deleted projects are deleted first, in batches of their own, so a batch of
+projects never takes an unbounded number of task rows with it. Dependent rows
+(market statuses, initiative links, dependency links, launch details,
+gateways and their versions) go through the `ondelete="CASCADE"` foreign
+keys on PostgreSQL; SQLite (development) does not enforce foreign keys by
+default, so they are deleted explicitly there.
+"""
+
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, or_
+from app.models import (
+    Project, ProjectSchedule, LaunchDetail, InputGateway, GatewayVersion,
+    Task, TaskMarketStatus, TaskDependency, InitiativeTaskLink, InitiativeTaskValue
+)
+from app.services.capacity_ledger import CapacityLedgerService
+from app.services.project_schedule import bump_schedule_versions
+
+# Rows deleted (and committed) per batch
+BATCH_SIZE = 500
+
+BatchCallback = Callable[[list[UUID]], Awaitable[None]]
+
+
+class BulkDeleteService:
+    """Deletes tasks or projects of one organization in committed batches."""
+
+    def __init__(self, db: AsyncSession, org_id: UUID, batch_size: int = BATCH_SIZE):
+        self.db = db
+        self.org_id = org_id
+        self.batch_size = batch_size
+        self.ledger = CapacityLedgerService(db)
+        self.cascades = db.get_bind().dialect.name == "postgresql"
+
+    async def delete_tasks(
+        self,
+        ids: Optional[list[UUID]] = None,
+        project_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        on_batch: Optional[BatchCallback] = None
+    ) -> dict:
+        """
+        Delete tasks matching every given criterion. Commits after each batch.
+
+        Args:
+            ids: Tasks to delete
+            project_id: Only tasks of this project
+            status: Only tasks with this status
+            on_batch: Awaited with the ids of each committed batch
+
+        Returns:
+            Number of tasks deleted and number of batches
+        """
+        criteria = [Task.org_id == self.org_id]
+        if project_id:
+            criteria.append(Task.project_id == project_id)
+        if status:
+            criteria.append(Task.status == status)
+        return await self._run(Task, criteria, ids, self._delete_task_batch, on_batch)
+
+    async def delete_projects(
+        self,
+        ids: Optional[list[UUID]] = None,
+        status: Optional[str] = None,
+        on_batch: Optional[BatchCallback] = None
+    ) -> dict:
+        """
+        Delete projects, with all their tasks and launches, matching every
+        given criterion. Commits after each batch of tasks and of projects.
+
+        Args:
+            ids: Projects to delete
+            status: Only projects with this status
+            on_batch: Awaited with the ids of each committed batch
+
+        Returns:
+            Number of projects deleted and number of batches
+        """
+        criteria = [Project.org_id == self.org_id]
+        if status:
+            criteria.append(Project.status == status)
+        return await self._run(Project, criteria, ids, self._delete_project_batch, on_batch)
+
+    async def _run(self, model, criteria: list, ids: Optional[list[UUID]], delete_batch, on_batch) -> dict:
+        """Select up to batch_size matching ids, delete them, commit; repeat until none match."""
+        deleted = 0
+        batches = 0
+        pending = list(dict.fromkeys(ids)) if ids is not None else None
+        while pending is None or pending:
+            query = select(model.id).where(*criteria)
+            if pending is not None:
+                query = query.where(model.id.in_(pending[:self.batch_size]))
+                pending = pending[self.batch_size:]
+            else:
+                query = query.limit(self.batch_size)
+            result = await self.db.execute(query)
+            batch = list(result.scalars().all())
+            if not batch:
+                if pending is None:
+                    break
+                continue
+
+            await delete_batch(batch)
+            await self.db.commit()
+            deleted += len(batch)
+            batches += 1
+            if on_batch:
+                await on_batch(batch)
+
+        return {'deleted': deleted, 'batches': batches}
+
+    async def _delete_task_batch(self, task_ids: list[UUID]) -> None:
+        result = await self.db.execute(
+            select(Task.project_id).where(Task.id.in_(task_ids)).distinct()
+        )
+        project_ids = set(result.scalars().all())
+
+        await self.ledger.record_tasks_removed(Task.id.in_(task_ids))
+        project_ids |= await self._detach_successors(Task.id.in_(task_ids))
+        if not self.cascades:
+            await self._delete_task_rows(Task.id.in_(task_ids))
+        await self.db.execute(
+            delete(Task).where(Task.id.in_(task_ids)).execution_options(synchronize_session=False)
+        )
+
+        await bump_schedule_versions(self.db, project_ids)
+
+    async def _delete_project_batch(self, project_ids: list[UUID]) -> None:
+        # Their tasks first, batch_size rows per transaction
+        while True:
+            result = await self.db.execute(
+                select(Task.id).where(Task.project_id.in_(project_ids)).limit(self.batch_size)
+            )
+            task_ids = list(result.scalars().all())
+            if not task_ids:
+                break
+            await self._delete_task_batch(task_ids)
+            await self.db.commit()
+
+        if not self.cascades:
+            await self.db.execute(
+                delete(ProjectSchedule).where(ProjectSchedule.project_id.in_(project_ids))
+                .execution_options(synchronize_session=False)
+            )
+            launches = select(LaunchDetail.id).where(LaunchDetail.project_id.in_(project_ids))
+            gateways = select(InputGateway.id).where(InputGateway.launch_detail_id.in_(launches))
+            await self.db.execute(
+                delete(GatewayVersion).where(GatewayVersion.gateway_id.in_(gateways))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                delete(InputGateway).where(InputGateway.launch_detail_id.in_(launches))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                delete(LaunchDetail).where(LaunchDetail.project_id.in_(project_ids))
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.execute(
+            delete(Project).where(Project.id.in_(project_ids)).execution_options(synchronize_session=False)
+        )
+
+    async def _detach_successors(self, task_filter) -> set[UUID]:
+        """
+        Unlink surviving tasks from deleted predecessors. `Task.predecessor_id`
+        has no ON DELETE action, so it is cleared here; typed links cascade.
+        Returns the projects of every successor losing a predecessor.
+        """
+        deleted = select(Task.id).where(task_filter)
+        result = await self.db.execute(
+            select(Task.project_id)
+            .where(or_(
+                Task.predecessor_id.in_(deleted),
+                Task.id.in_(select(TaskDependency.successor_id).where(TaskDependency.predecessor_id.in_(deleted)))
+            ))
+            .distinct()
+        )
+        project_ids = set(result.scalars().all())
+
+        await self.db.execute(
+            update(Task)
+            .where(Task.predecessor_id.in_(deleted))
+            .values(predecessor_id=None, version=Task.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return project_ids
+
+    async def _delete_task_rows(self, task_filter) -> None:
+        """Delete the rows that reference tasks, where foreign keys do not cascade."""
+        deleted = select(Task.id).where(task_filter)
+        links = select(InitiativeTaskLink.id).where(InitiativeTaskLink.task_id.in_(deleted))
+        for statement in (
+            delete(InitiativeTaskValue).where(InitiativeTaskValue.link_id.in_(links)),
+            delete(InitiativeTaskLink).where(InitiativeTaskLink.task_id.in_(deleted)),
+            delete(TaskMarketStatus).where(TaskMarketStatus.task_id.in_(deleted)),
+            delete(TaskDependency).where(or_(
+                TaskDependency.predecessor_id.in_(deleted),
+                TaskDependency.successor_id.in_(deleted)
+            )),
+        ):
+            await self.db.execute(statement.execution_options(synchronize_session=False))
+
+
+async def bulk_delete_tasks(
+    db: AsyncSession,
+    org_id: UUID,
+    ids: Optional[list[UUID]] = None,
+    project_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    on_batch: Optional[BatchCallback] = None
+) -> dict:
+    """
+    Main entry point for deleting many tasks.
+
+    Args:
+        db: Database session
+        org_id: Organization the tasks must belong to
+        ids: Tasks to delete
+        project_id: Only tasks of this project
+        status: Only tasks with this status
+        on_batch: Awaited with the ids of each committed batch
+
+    Returns:
+        Deletion summary, see BulkDeleteService.delete_tasks
+    """
+    service = BulkDeleteService(db, org_id)
+    return await service.delete_tasks(ids, project_id, status, on_batch)
+
+
+async def bulk_delete_projects(
+    db: AsyncSession,
+    org_id: UUID,
+    ids: Optional[list[UUID]] = None,
+    status: Optional[str] = None,
+    on_batch: Optional[BatchCallback] = None
+) -> dict:
+    """
+    Main entry point for deleting many projects.
+
+    Args:
+        db: Database session
+        org_id: Organization the projects must belong to
+        ids: Projects to delete
+        status: Only projects with this status
+        on_batch: Awaited with the ids of each committed batch
+
+    Returns:
+        Deletion summary, see BulkDeleteService.delete_projects
+    """
+    service = BulkDeleteService(db, org_id)
+    return await service.delete_projects(ids, status, on_batch)
@@ -0,0 +1,231 @@
+"""
+Candidate Index
+
+Compact in-memory index of allocation candidates used by the auto-assign tiers.
+
+Resources are stored column-wise in parallel arrays (one slot per user/org
+assignment row) and grouped by (tier, team). For every (tier, team, bucket)
+a lazily-built max-heap orders slots by available hours, so finding a candidate
+or booking hours against one costs O(log n) instead of a scan over every resource.
+Bookings are tracked per user, so all slots belonging to one user see the same
+booked hours whichever tier they were reached through. Optionally each user also
+carries a cross-org total (shared between indexes of a portfolio-wide run) that
+caps them at their full capacity whichever org books them.
+"""
+
+import heapq
+from array import array
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+PRIMARY = 0
+SHARED = 1
+
+# Float slack when comparing spread hours
+EPSILON = 1e-9
+
+
+class CandidateIndex:
+    """Array-backed candidate lookup keyed by tier and team with max-heaps on availability."""
+
+    def __init__(self):
+        # Slot columns
+        self.ids: list[UUID] = []
+        self.names: list[str] = []
+        self.org_ids: list[UUID] = []
+        self.teams: list[Optional[str]] = []
+        self.tiers = array('b')
+        self.capacity = array('l')
+        self.allocation = array('l')
+        self.bucket_capacity = array('d')
+        self.cost_rate = array('d')
+        self.user_slot = array('l')  # slot -> user position in `booked`
+
+        # Per-user state
+        self.user_positions: dict[UUID, int] = {}
+        self.booked: list[dict[date, float]] = []
+        self.user_slots: list[list[int]] = []
+        self.totals: list[Optional[dict[date, float]]] = []
+        self.total_limit = array('d')
+
+        # (tier, team) -> slots in insertion order
+        self.groups: dict[tuple[int, Optional[str]], list[int]] = {}
+        # (tier, team, bucket) -> heap of (-available, slot)
+        self.heaps: dict[tuple, list[tuple[float, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(
+        self,
+        user_id: UUID,
+        name: str,
+        team: Optional[str],
+        org_id: UUID,
+        tier: int,
+        capacity: int,
+        allocation: int,
+        bucket_capacity: float,
+        booked: Optional[dict[date, float]] = None,
+        cost_rate: float = 0.0,
+        totals: Optional[dict[date, float]] = None,
+        total_limit: float = 0.0
+    ) -> int:
+        """
+        Add a slot for one user/org assignment row. Returns the slot number.
+
+        `totals` is the user's cross-org booked hours per bucket; it is used as is
+        (not copied) so bookings made through this index are visible to others.
+        """
+        position = self.user_positions.get(user_id)
+        if position is None:
+            position = len(self.booked)
+            self.user_positions[user_id] = position
+            self.booked.append(dict(booked or {}))
+            self.user_slots.append([])
+            self.totals.append(totals)
+            self.total_limit.append(total_limit)
+
+        slot = len(self.ids)
+        self.ids.append(user_id)
+        self.names.append(name)
+        self.org_ids.append(org_id)
+        self.teams.append(team)
+        self.tiers.append(tier)
+        self.capacity.append(capacity)
+        self.allocation.append(allocation)
+        self.bucket_capacity.append(bucket_capacity)
+        self.cost_rate.append(cost_rate)
+        self.user_slot.append(position)
+        self.user_slots[position].append(slot)
+        self.groups.setdefault((tier, team), []).append(slot)
+        return slot
+
+    def has_team(self, tier: int, team: Optional[str]) -> bool:
+        """Check whether any slot exists for a tier and team."""
+        return (tier, team) in self.groups
+
+    def available(self, slot: int, bucket: date) -> float:
+        """Available hours for a slot in one bucket."""
+        return self.bucket_capacity[slot] - self.booked[self.user_slot[slot]].get(bucket, 0)
+
+    def fits(self, slot: int, demand: dict[date, float]) -> bool:
+        """Check whether a slot can take a demand in every bucket."""
+        position = self.user_slot[slot]
+        limit = self.bucket_capacity[slot]
+        booked = self.booked[position]
+        if not all(limit - booked.get(b, 0) >= hours - EPSILON for b, hours in demand.items()):
+            return False
+        totals = self.totals[position]
+        if totals is None:
+            return True
+        total_limit = self.total_limit[position]
+        return all(total_limit - totals.get(b, 0) >= hours - EPSILON for b, hours in demand.items())
+
+    def find(self, tier: int, team: Optional[str], demand: dict[date, float]) -> Optional[int]:
+        """
+        Find the slot with the most available hours that fits a demand.
+
+        Returns None without scanning when the best slot cannot take it.
+        """
+        if (tier, team) not in self.groups:
+            return None
+        if not demand:
+            return self.groups[(tier, team)][0]
+
+        bucket = max(demand, key=demand.get)
+        need = demand[bucket]
+        heap = self._heap(tier, team, bucket)
+        held = []
+        found = None
+        while heap:
+            negative, slot = heap[0]
+            current = self.available(slot, bucket)
+            if -negative - current > EPSILON:
+                # Stale entry, a fresher one was pushed on booking
+                heapq.heappop(heap)
+                continue
+            if current < need - EPSILON:
+                break
+            heapq.heappop(heap)
+            held.append((negative, slot))
+            if self.fits(slot, demand):
+                found = slot
+                break
+
+        for entry in held:
+            heapq.heappush(heap, entry)
+        return found
+
+    def find_all(self, tier: int, team: Optional[str], demand: dict[date, float]) -> list[int]:
+        """Find every slot of a tier/team that fits a demand, best first."""
+        if (tier, team) not in self.groups:
+            return []
+        if not demand:
+            return list(self.groups[(tier, team)])
+
+        bucket = max(demand, key=demand.get)
+        need = demand[bucket]
+        heap = self._heap(tier, team, bucket)
+
+        # Walk the heap top-down; a max-heap lets us prune every subtree whose
+        # root is already below the need. Every slot keeps one exact entry,
+        # so pruning on stale entries never drops a slot that fits.
+        found = []
+        seen = set()
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            negative, slot = heap[i]
+            if -negative < need - EPSILON:
+                continue
+            if slot not in seen and self.fits(slot, demand):
+                seen.add(slot)
+                found.append(slot)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    stack.append(child)
+
+        found.sort(key=lambda s: (-self.available(s, bucket), s))
+        return found
+
+    def book(self, slot: int, demand: dict[date, float]) -> None:
+        """Book a demand against a slot's user and refresh the affected heaps."""
+        self._adjust(slot, demand, 1)
+
+    def unbook(self, slot: int, demand: dict[date, float]) -> None:
+        """Release a previously booked demand and refresh the affected heaps."""
+        self._adjust(slot, demand, -1)
+
+    def slots_for(self, team: Optional[str]) -> list[int]:
+        """All slots of a team across tiers, primary first."""
+        return self.groups.get((PRIMARY, team), []) + self.groups.get((SHARED, team), [])
+
+    def _adjust(self, slot: int, demand: dict[date, float], sign: int) -> None:
+        """Add or remove booked hours for a slot's user and push fresh heap entries."""
+        position = self.user_slot[slot]
+        booked = self.booked[position]
+        totals = self.totals[position]
+        for bucket, hours in demand.items():
+            booked[bucket] = booked.get(bucket, 0) + sign * hours
+            if totals is not None:
+                totals[bucket] = totals.get(bucket, 0) + sign * hours
+
+        # Older entries overstate availability after a booking and understate it
+        # after a release; either way the fresh exact entry pushed here wins.
+        for other in self.user_slots[position]:
+            for bucket in demand:
+                heap = self.heaps.get((self.tiers[other], self.teams[other], bucket))
+                if heap is not None:
+                    heapq.heappush(heap, (-self.available(other, bucket), other))
+
+    def _heap(self, tier: int, team: Optional[str], bucket: date) -> list[tuple[float, int]]:
+        """Get (building on first use) the availability heap for a tier/team/bucket."""
+        key = (tier, team, bucket)
+        heap = self.heaps.get(key)
+        if heap is None:
+            heap = [(-self.available(slot, bucket), slot) for slot in self.groups[(tier, team)]]
+            heapq.heapify(heap)
+            self.heaps[key] = heap
+        return heap
@@ -0,0 +1,337 @@
+"""
+Capacity Ledger Service
+
+Maintains a materialized, time-phased ledger of booked hours per assignee per org.
+A task's estimate is spread evenly over the days between its start and end date and
+booked into week or month buckets, so availability can be checked per bucket instead
+of against every task ever assigned. Tasks without dates are booked whole into
+the UNSCHEDULED bucket, whose hours count against every dated bucket on read.
+"""
+
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import date, timedelta
+from typing import Optional, Union
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, func, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.config import get_settings
+from app.models import Task, CapacityLedgerEntry
+
+# capacity_hours on users/resources is expressed per month
+WEEKS_PER_MONTH = 52 / 12
+
+# Bucket holding the bookings of tasks without dates
+UNSCHEDULED = date.min
+
+# Advisory lock key serializing startup rebuilds across workers (PostgreSQL)
+REBUILD_LOCK_KEY = 0x6C6564676572
+
+
+def bucket_start(day: date, period: str) -> date:
+    """Get the first day of the bucket containing a date."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_bucket(start: date, period: str) -> date:
+    """Get the first day of the bucket following the one starting at `start`."""
+    if period == 'week':
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def bucket_range(start: date, end: date, period: str) -> list[date]:
+    """List the bucket starts covering a date range (inclusive)."""
+    buckets = []
+    current = bucket_start(start, period)
+    while current <= end:
+        buckets.append(current)
+        current = next_bucket(current, period)
+    return buckets
+
+
+def bucket_capacity(capacity_hours: int, period: str) -> float:
+    """Convert a monthly capacity to the capacity of one bucket."""
+    if period == 'week':
+        return capacity_hours / WEEKS_PER_MONTH
+    return float(capacity_hours)
+
+
+def spread_hours(estimate: int, start: Optional[date], end: Optional[date], period: str) -> dict[date, float]:
+    """
+    Spread an estimate evenly over the days of a task and sum it per bucket.
+
+    Tasks with a single date are treated as one-day tasks. Tasks without dates
+    cannot be phased and are booked whole into the UNSCHEDULED bucket.
+    """
+    start = start or end
+    end = end or start
+    if not estimate:
+        return {}
+    if not start:
+        return {UNSCHEDULED: float(estimate)}
+    if end < start:
+        start, end = end, start
+
+    total_days = (end - start).days + 1
+    spread = {}
+    for bucket in bucket_range(start, end, period):
+        first = max(bucket, start)
+        last = min(next_bucket(bucket, period) - timedelta(days=1), end)
+        spread[bucket] = estimate * ((last - first).days + 1) / total_days
+    return spread
+
+
+def task_demand(
+    estimate: int, start: Optional[date], end: Optional[date], period: str, today: Optional[date] = None
+) -> dict[date, float]:
+    """
+    Hours a task needs per bucket when checking availability for it.
+
+    Like spread_hours, except that an undated task is checked against the
+    current bucket, where the UNSCHEDULED bookings are counted on read.
+    """
+    demand = spread_hours(estimate, start, end, period)
+    if UNSCHEDULED in demand:
+        return {bucket_start(today or date.today(), period): demand[UNSCHEDULED]}
+    return demand
+
+
+def ledger_totals(tasks, period: str) -> dict[tuple, float]:
+    """
+    Sum the bookings of many tasks per (org, assignee, bucket).
+
+    Args:
+        tasks: Rows of (org_id, assignee_id, estimate, start_date, end_date)
+    """
+    totals = defaultdict(float)
+    for org_id, assignee_id, estimate, start, end in tasks:
+        for bucket, hours in spread_hours(estimate, start, end, period).items():
+            totals[(org_id, assignee_id, bucket)] += hours
+    return totals
+
+
+def booking_snapshot(task: Union[Task, Mapping]) -> Optional[dict]:
+    """
+    Capture the fields of a task that contribute to the ledger.
+
+    `task` is a Task or a mapping of its columns (e.g. a row read for a batch).
+    """
+    fields = ('org_id', 'assignee_id', 'estimate', 'start_date', 'end_date')
+    if isinstance(task, Mapping):
+        snapshot = {field: task[field] for field in fields}
+    else:
+        snapshot = {field: getattr(task, field) for field in fields}
+    if not snapshot['assignee_id'] or not snapshot['estimate']:
+        return None
+    return snapshot
+
+
+class CapacityLedgerService:
+    """Reads and incrementally maintains the capacity ledger."""
+
+    def __init__(self, db: AsyncSession, period: Optional[str] = None):
+        self.db = db
+        self.period = period or get_settings().capacity_bucket
+
+    async def record_change(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """
+        Apply the difference between two booking snapshots of the same task.
+
+        Pass `before=None` for a created task and `after=None` for a deleted one.
+        """
+        await self.record_changes([(before, after)])
+
+    async def record_changes(self, changes: list[tuple[Optional[dict], Optional[dict]]]) -> None:
+        """Apply many (before, after) booking snapshot pairs in one read and one flush."""
+        deltas = defaultdict(float)
+        for before, after in changes:
+            for snapshot, sign in ((before, -1), (after, 1)):
+                if not snapshot:
+                    continue
+                spread = spread_hours(
+                    snapshot['estimate'], snapshot['start_date'], snapshot['end_date'], self.period
+                )
+                for bucket, hours in spread.items():
+                    deltas[(snapshot['org_id'], snapshot['assignee_id'], bucket)] += sign * hours
+
+        await self._apply_deltas({k: v for k, v in deltas.items() if abs(v) > 1e-9})
+
+    async def _apply_deltas(self, deltas: dict[tuple, float]) -> None:
+        """
+        Upsert (org, assignee, bucket) -> hours deltas into the ledger.
+
+        Buckets are incremented in the database (INSERT ... ON CONFLICT DO
+        UPDATE), so concurrent writers for the same assignee add up instead of
+        overwriting each other or colliding on a new bucket. Rows go in key
+        order so concurrent writers lock them in the same order.
+        """
+        if not deltas:
+            return
+
+        keys = sorted(deltas, key=lambda key: (str(key[0]), str(key[1]), key[2]))
+        insert = postgresql_insert if self.db.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        stmt = insert(CapacityLedgerEntry)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['org_id', 'assignee_id', 'period', 'bucket_start'],
+            set_={'booked_hours': CapacityLedgerEntry.booked_hours + stmt.excluded.booked_hours}
+        )
+        await self.db.execute(stmt, [
+            {
+                'id': uuid4(),
+                'org_id': org_id,
+                'assignee_id': assignee_id,
+                'period': self.period,
+                'bucket_start': bucket,
+                'booked_hours': deltas[(org_id, assignee_id, bucket)]
+            }
+            for org_id, assignee_id, bucket in keys
+        ])
+
+        # Bookings never go below zero (a release of hours the ledger never had)
+        await self.db.execute(
+            update(CapacityLedgerEntry)
+            .where(
+                CapacityLedgerEntry.org_id.in_({k[0] for k in keys}),
+                CapacityLedgerEntry.assignee_id.in_({k[1] for k in keys}),
+                CapacityLedgerEntry.period == self.period,
+                CapacityLedgerEntry.bucket_start.in_({k[2] for k in keys}),
+                CapacityLedgerEntry.booked_hours < 0
+            )
+            .values(booked_hours=0.0)
+        )
+
+    async def record_tasks_removed(self, task_filter) -> None:
+        """Remove the bookings of all tasks matching a filter, e.g. before a project delete."""
+        result = await self.db.execute(
+            select(Task.org_id, Task.assignee_id, Task.estimate, Task.start_date, Task.end_date)
+            .where(task_filter)
+            .where(Task.assignee_id.is_not(None))
+        )
+        await self.record_changes([
+            (row._asdict(), None) for row in result.all()
+        ])
+
+    async def rebuild(self, org_id: UUID) -> int:
+        """Recompute an org's ledger from its tasks. Returns the number of entries written."""
+        await self.db.execute(
+            delete(CapacityLedgerEntry).where(
+                CapacityLedgerEntry.org_id == org_id,
+                CapacityLedgerEntry.period == self.period
+            )
+        )
+        result = await self.db.execute(
+            select(Task.org_id, Task.assignee_id, Task.estimate, Task.start_date, Task.end_date)
+            .where(Task.org_id == org_id)
+            .where(Task.assignee_id.is_not(None))
+        )
+
+        totals = ledger_totals(result.all(), self.period)
+        for (_, assignee_id, bucket), hours in totals.items():
+            self.db.add(CapacityLedgerEntry(
+                org_id=org_id,
+                assignee_id=assignee_id,
+                period=self.period,
+                bucket_start=bucket,
+                booked_hours=hours
+            ))
+        await self.db.flush()
+        return len(totals)
+
+    async def rebuild_missing(self) -> list[UUID]:
+        """
+        Rebuild the ledger of every org with booked tasks but no entries for
+        this period, e.g. after an upgrade or a change of CAPACITY_BUCKET.
+
+        Returns the orgs rebuilt. Concurrent callers (workers starting
+        together) wait on each other on PostgreSQL; does not commit.
+        """
+        if self.db.get_bind().dialect.name == 'postgresql':
+            await self.db.execute(select(func.pg_advisory_xact_lock(REBUILD_LOCK_KEY)))
+
+        booked = await self.db.execute(
+            select(Task.org_id).distinct()
+            .where(Task.assignee_id.is_not(None))
+            .where(Task.estimate > 0)
+        )
+        ledgered = await self.db.execute(
+            select(CapacityLedgerEntry.org_id).distinct()
+            .where(CapacityLedgerEntry.period == self.period)
+        )
+        missing = sorted(set(booked.scalars().all()) - set(ledgered.scalars().all()), key=str)
+        for org_id in missing:
+            await self.rebuild(org_id)
+        return missing
+
+    async def get_booked_hours(
+        self,
+        start: date,
+        end: date,
+        org_id: Optional[UUID] = None,
+        assignee_ids: Optional[list[UUID]] = None,
+        spread_unscheduled: bool = True
+    ) -> dict[tuple[UUID, UUID], dict[date, float]]:
+        """
+        Get booked hours per (org, assignee) per bucket for a date range.
+
+        Undated bookings could fall in any bucket, so by default they are added
+        to every bucket of the range. With `spread_unscheduled=False` they are
+        returned once under the UNSCHEDULED key instead.
+
+        Returns:
+            {(org_id, assignee_id): {bucket_start: hours}}
+        """
+        query = select(
+            CapacityLedgerEntry.org_id,
+            CapacityLedgerEntry.assignee_id,
+            CapacityLedgerEntry.bucket_start,
+            CapacityLedgerEntry.booked_hours
+        ).where(
+            CapacityLedgerEntry.period == self.period,
+            or_(
+                CapacityLedgerEntry.bucket_start.between(bucket_start(start, self.period), end),
+                CapacityLedgerEntry.bucket_start == UNSCHEDULED
+            )
+        )
+        if org_id:
+            query = query.where(CapacityLedgerEntry.org_id == org_id)
+        if assignee_ids is not None:
+            query = query.where(CapacityLedgerEntry.assignee_id.in_(assignee_ids))
+
+        result = await self.db.execute(query)
+        booked = defaultdict(dict)
+        for entry_org_id, assignee_id, bucket, hours in result.all():
+            booked[(entry_org_id, assignee_id)][bucket] = hours
+
+        if spread_unscheduled:
+            buckets = bucket_range(start, end, self.period)
+            for entry in booked.values():
+                unscheduled = entry.pop(UNSCHEDULED, 0)
+                if unscheduled:
+                    for bucket in buckets:
+                        entry[bucket] = entry.get(bucket, 0) + unscheduled
+        return booked
+
+    async def get_user_totals(
+        self,
+        start: date,
+        end: date,
+        assignee_ids: Optional[list[UUID]] = None
+    ) -> dict[UUID, dict[date, float]]:
+        """
+        Get booked hours per assignee per bucket summed across every org.
+
+        Returns:
+            {assignee_id: {bucket_start: hours}}
+        """
+        booked = await self.get_booked_hours(start, end, assignee_ids=assignee_ids)
+        totals = defaultdict(dict)
+        for (_, assignee_id), buckets in booked.items():
+            user_totals = totals[assignee_id]
+            for bucket, hours in buckets.items():
+                user_totals[bucket] = user_totals.get(bucket, 0) + hours
+        return dict(totals)
@@ -0,0 +1,246 @@
+"""
+Critical Path Service
+
+Computes the critical path (CPM) of a project over its task dates and dependency
+links, so PMs can see which tasks drive the project's end date.
+
+Dates are converted to working-day numbers of the project's calendar once (an
+array lookup each, see working_calendar) and both passes run on integer arrays
+in topological order, O(V+E) per project. Results are cached per project until
+its schedule version changes (any change to its tasks, links or calendar).
+"""
+
+from array import array
+from collections import deque
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.models import Project, ProjectSchedule
+from app.services.dependency_graph import load_project_graph
+from app.services.project_schedule import schedule_changed
+from app.services.working_calendar import WorkingCalendar, get_project_calendar
+
+
+class CriticalPathCache:
+    """
+    In-process cache of critical path results keyed by project, each valid
+    for the schedule version it was computed at (see project_schedule).
+    """
+
+    def __init__(self):
+        self.entries: dict[UUID, tuple[int, dict]] = {}
+
+    def get(self, project_id: UUID, version: int) -> Optional[dict]:
+        entry = self.entries.get(project_id)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, project_id: UUID, version: int, result: dict) -> None:
+        self.entries[project_id] = (version, result)
+
+
+# Global cache instance
+critical_path_cache = CriticalPathCache()
+
+
+def compute_critical_path(
+    tasks: list[dict],
+    edges: list[tuple],
+    calendar: Optional[WorkingCalendar] = None
+) -> dict:
+    """
+    Run the CPM forward and backward passes over a project's tasks.
+
+    Each task's scheduled start acts as a start-no-earlier-than constraint and
+    links are FS/SS/FF/SF with lag. Late dates are anchored on the computed
+    project finish, so slack is the number of days a task can slip without
+    moving it. Durations, lags and slack count working days of `calendar`
+    (every day if omitted). Tasks without dates, and tasks on a dependency
+    cycle, are reported separately and left out of the schedule.
+
+    Args:
+        tasks: Dicts with id, title, start_date and end_date
+        edges: (predecessor_id, successor_id, type, lag_days) links
+        calendar: Working calendar the project is scheduled on
+
+    Returns:
+        Per-task early/late dates and slack, the critical chain and the finish
+    """
+    dated = [t for t in tasks if t['start_date'] or t['end_date']]
+    unscheduled = [str(t['id']) for t in tasks if not (t['start_date'] or t['end_date'])]
+
+    calendar = calendar or WorkingCalendar.every_day()
+    n = len(dated)
+    position = {t['id']: i for i, t in enumerate(dated)}
+    start = array('l', (calendar.index(t['start_date'] or t['end_date']) for t in dated))
+    finish = array('l', (calendar.last_index(t['end_date'] or t['start_date']) for t in dated))
+    duration = array('l', (max(f - s, 0) + 1 for s, f in zip(start, finish)))
+
+    # Links as (other task, type, lag) in both directions
+    incoming = [[] for _ in range(n)]
+    outgoing = [[] for _ in range(n)]
+    indegree = array('l', [0] * n)
+    for pred_id, succ_id, link_type, lag in edges:
+        i = position.get(pred_id)
+        j = position.get(succ_id)
+        if i is None or j is None:
+            continue
+        incoming[j].append((i, link_type, lag))
+        outgoing[i].append((j, link_type, lag))
+        indegree[j] += 1
+
+    # Topological order (Kahn); tasks on a cycle never become ready
+    order = []
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for j, _, _ in outgoing[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                queue.append(j)
+    ordered = set(order)
+    cyclic = [str(dated[i]['id']) for i in range(n) if i not in ordered]
+
+    # Forward pass: earliest start allowed by each link, remembering the driver
+    early_start = array('l', start)
+    early_finish = array('l', [0] * n)
+    driver = array('l', [-1] * n)
+    for j in order:
+        for i, link_type, lag in incoming[j]:
+            if link_type == 'SS':
+                bound = early_start[i] + lag
+            elif link_type == 'FF':
+                bound = early_finish[i] + lag - duration[j] + 1
+            elif link_type == 'SF':
+                bound = early_start[i] + lag - duration[j] + 1
+            else:
+                bound = early_finish[i] + 1 + lag
+            if bound >= early_start[j]:
+                early_start[j] = bound
+                driver[j] = i
+        early_finish[j] = early_start[j] + duration[j] - 1
+
+    if not order:
+        return {
+            'finish': None, 'tasks': [], 'critical_path': [],
+            'unscheduled': unscheduled, 'cyclic': cyclic
+        }
+    project_finish = max(early_finish[i] for i in order)
+
+    # Backward pass: latest finish allowed by each outgoing link
+    late_finish = array('l', [project_finish] * n)
+    late_start = array('l', [0] * n)
+    for i in reversed(order):
+        for j, link_type, lag in outgoing[i]:
+            if link_type == 'SS':
+                bound = late_start[j] - lag + duration[i] - 1
+            elif link_type == 'FF':
+                bound = late_finish[j] - lag
+            elif link_type == 'SF':
+                bound = late_finish[j] - lag + duration[i] - 1
+            else:
+                bound = late_start[j] - 1 - lag
+            if bound < late_finish[i]:
+                late_finish[i] = bound
+        late_start[i] = late_finish[i] - duration[i] + 1
+
+    # Critical chain: walk back from the task that sets the finish through
+    # critical drivers (the predecessors whose links set the early start)
+    last = max(
+        (i for i in order if late_start[i] == early_start[i]),
+        key=lambda i: (early_finish[i], -early_start[i])
+    )
+    chain = [last]
+    while driver[chain[-1]] >= 0 and late_start[driver[chain[-1]]] == early_start[driver[chain[-1]]]:
+        chain.append(driver[chain[-1]])
+    chain.reverse()
+
+    to_date = calendar.date_at
+    return {
+        'finish': to_date(project_finish),
+        'tasks': [
+            {
+                'id': str(dated[i]['id']),
+                'title': dated[i]['title'],
+                'start_date': dated[i]['start_date'],
+                'end_date': dated[i]['end_date'],
+                'early_start': to_date(early_start[i]),
+                'early_finish': to_date(early_finish[i]),
+                'late_start': to_date(late_start[i]),
+                'late_finish': to_date(late_finish[i]),
+                'slack_days': late_start[i] - early_start[i],
+                'critical': late_start[i] == early_start[i]
+            }
+            for i in order
+        ],
+        'critical_path': [str(dated[i]['id']) for i in chain],
+        'unscheduled': unscheduled,
+        'cyclic': cyclic
+    }
+
+
+class CriticalPathService:
+    """Computes and caches critical paths per project."""
+
+    def __init__(self, db: AsyncSession, cache: CriticalPathCache = critical_path_cache):
+        self.db = db
+        self.cache = cache
+
+    async def get_critical_path(self, project_id: UUID, org_id: UUID) -> dict:
+        """
+        Get a project's critical path, computing it on a cache miss.
+
+        Raises:
+            CalendarRangeError: If early or late dates fall outside the supported range
+            ValueError: If the project does not exist in the organization
+        """
+        result = await self.db.execute(
+            select(Project.id, Project.end_date, func.coalesce(ProjectSchedule.version, 0).label('schedule_version'))
+            .outerjoin(ProjectSchedule, ProjectSchedule.project_id == Project.id)
+            .where(Project.id == project_id, Project.org_id == org_id)
+        )
+        project = result.one_or_none()
+        if not project:
+            raise ValueError(f"Project {project_id} not found")
+
+        cacheable = not schedule_changed(self.db, project_id)
+        cached = self.cache.get(project_id, project.schedule_version) if cacheable else None
+        if cached is not None:
+            return {**cached, 'cached': True}
+
+        nodes, edges = await load_project_graph(self.db, project_id)
+        calendar = await get_project_calendar(self.db, project_id)
+        cpm = compute_critical_path([n for n in nodes.values() if not n['external']], edges, calendar)
+
+        finish = cpm.pop('finish')
+        computed = {
+            'project_id': project_id,
+            'project_end_date': project.end_date,
+            'computed_finish': finish,
+            'end_date_variance_days': (
+                (finish - project.end_date).days if finish and project.end_date else None
+            ),
+            **cpm
+        }
+        if cacheable:
+            self.cache.set(project_id, project.schedule_version, computed)
+        return {**computed, 'cached': False}
+
+
+async def get_project_critical_path(db: AsyncSession, project_id: UUID, org_id: UUID) -> dict:
+    """
+    Main entry point for a project's critical path.
+
+    Args:
+        db: Database session
+        project_id: Project to analyse
+        org_id: Organization the project must belong to
+
+    Returns:
+        Critical path analysis, see CriticalPathService.get_critical_path
+    """
+    service = CriticalPathService(db)
+    return await service.get_critical_path(project_id, org_id)
@@ -0,0 +1,254 @@
+"""
+Dependency Graph
+
+Shared loading and date propagation over the task dependency graph.
+
+Edges come from the typed `task_dependencies` table (FS/SS/FF/SF with lag) and
+from the legacy `Task.predecessor_id`, which counts as a finish-to-start link
+without lag. Propagation visits the affected subgraph once in topological order,
+resolving fan-in (every predecessor of a task) before the task itself moves,
+so it is O(V+E) whatever the shape of the graph. Date math runs on working-day
+numbers from the project's WorkingCalendar, one array lookup per conversion.
+"""
+
+from collections import deque
+from typing import Iterable, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, literal, union_all
+from app.models import Task, TaskDependency
+from app.services.working_calendar import WorkingCalendar
+
+DEPENDENCY_TYPES = ("FS", "SS", "FF", "SF")
+
+# (predecessor_id, successor_id, type, lag_days)
+Edge = tuple[UUID, UUID, str, int]
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a dependency link would make a task depend on itself."""
+
+
+class DependencyGraphTooLargeError(ValueError):
+    """Raised when an in-memory walk of the dependency graph reaches its size limit."""
+
+
+def dependency_edges():
+    """Selectable over all dependency edges: typed links plus legacy predecessor_id."""
+    legacy = select(
+        Task.predecessor_id.label('predecessor_id'),
+        Task.id.label('successor_id'),
+        literal('FS').label('type'),
+        literal(0).label('lag_days')
+    ).where(Task.predecessor_id.is_not(None))
+    linked = select(
+        TaskDependency.predecessor_id,
+        TaskDependency.successor_id,
+        TaskDependency.type,
+        TaskDependency.lag_days
+    )
+    return union_all(linked, legacy).subquery('dependency_edges')
+
+
+async def load_project_graph(db: AsyncSession, project_id: UUID) -> tuple[dict[UUID, dict], list[Edge]]:
+    """
+    Load a project's tasks and the dependency edges into them.
+
+    Predecessors in other projects are loaded too, flagged `external`, so their
+    dates still constrain the project's tasks; their own links are not loaded.
+
+    Returns:
+        ({task id: task columns}, [(predecessor_id, successor_id, type, lag_days)])
+    """
+    columns = (
+        Task.id, Task.title, Task.start_date, Task.end_date, Task.predecessor_id,
+        Task.project_id, Task.org_id, Task.assignee_id, Task.estimate
+    )
+    result = await db.execute(select(*columns).where(Task.project_id == project_id))
+    nodes = {row.id: {**row._asdict(), 'external': False} for row in result.all()}
+
+    result = await db.execute(
+        select(
+            TaskDependency.predecessor_id, TaskDependency.successor_id,
+            TaskDependency.type, TaskDependency.lag_days
+        )
+        .join(Task, Task.id == TaskDependency.successor_id)
+        .where(Task.project_id == project_id)
+    )
+    edges = [tuple(row) for row in result.all()]
+    edges.extend(
+        (node['predecessor_id'], node_id, 'FS', 0)
+        for node_id, node in nodes.items()
+        if node['predecessor_id']
+    )
+
+    external = {edge[0] for edge in edges} - nodes.keys()
+    if external:
+        result = await db.execute(select(*columns).where(Task.id.in_(external)))
+        nodes.update({row.id: {**row._asdict(), 'external': True} for row in result.all()})
+    return nodes, edges
+
+
+def task_span(node: dict, calendar: WorkingCalendar) -> tuple[Optional[int], Optional[int]]:
+    """(start, end) of a task as working-day numbers; None where a date is missing."""
+    start = calendar.index(node['start_date']) if node['start_date'] else None
+    end = calendar.last_index(node['end_date']) if node['end_date'] else None
+    return start, end
+
+
+def required_shift(predecessor: tuple, successor: tuple, link_type: str, lag_days: int) -> int:
+    """
+    Working days a successor has to move forward to satisfy one link (<= 0 if
+    satisfied), given both task spans from `task_span`.
+
+    Dates are inclusive, so finish-to-start means starting the working day
+    after the predecessor ends. Links with a missing date on either side are
+    ignored.
+    """
+    succ_start, succ_end = successor
+    if succ_start is None:
+        return 0
+    succ_end = succ_start if succ_end is None else max(succ_end, succ_start)
+
+    if link_type in ('FS', 'FF'):
+        anchor = predecessor[1]
+        if anchor is None:
+            return 0
+        if link_type == 'FS':
+            return anchor + 1 + lag_days - succ_start
+        return anchor + lag_days - succ_end
+
+    anchor = predecessor[0]
+    if anchor is None:
+        return 0
+    if link_type == 'SS':
+        return anchor + lag_days - succ_start
+    return anchor + lag_days - succ_end
+
+
+def propagate_dates(
+    nodes: dict[UUID, dict],
+    edges: list[Edge],
+    root_ids: Iterable[UUID],
+    calendar: Optional[WorkingCalendar] = None
+) -> list[UUID]:
+    """
+    Push tasks downstream of the roots forward until every link is satisfied.
+
+    Works in place on `nodes` ({task id: {'start_date', 'end_date', ...}}). The
+    roots keep their dates. Every other task reachable from them is visited once,
+    after all of its predecessors, and moved by the largest shift any of its
+    incoming links requires. Shifts, lags and durations count working days of
+    `calendar` (every day if omitted), so moved tasks never start or end on a
+    weekend or holiday. Tasks on a cycle never become ready and are left
+    untouched.
+
+    Returns:
+        Ids of the shifted tasks in propagation order; their previous dates are
+        kept on the node under 'old_start'/'old_end'
+    """
+    calendar = calendar or WorkingCalendar.every_day()
+
+    # Work on dense positions: UUIDs are hashed once per node and edge
+    ids = list(nodes)
+    position = {node_id: i for i, node_id in enumerate(ids)}
+    successors = [[] for _ in ids]
+    predecessors = [[] for _ in ids]
+    for pred_id, succ_id, link_type, lag in edges:
+        i = position.get(pred_id)
+        j = position.get(succ_id)
+        if i is not None and j is not None:
+            successors[i].append(j)
+            predecessors[j].append((i, link_type, lag))
+
+    roots = list(dict.fromkeys(position[r] for r in root_ids if r in position))
+    pinned = set(roots)
+
+    # In-degrees within the reachable subgraph
+    indegree = [0] * len(ids)
+    stack = list(roots)
+    seen = set(roots)
+    while stack:
+        for j in successors[stack.pop()]:
+            if j in pinned:
+                continue
+            indegree[j] += 1
+            if j not in seen:
+                seen.add(j)
+                stack.append(j)
+
+    spans = [None] * len(ids)
+
+    def span(i: int) -> tuple[Optional[int], Optional[int]]:
+        if spans[i] is None:
+            spans[i] = task_span(nodes[ids[i]], calendar)
+        return spans[i]
+
+    shifted = []
+    queue = deque(roots)
+    while queue:
+        i = queue.popleft()
+        if i not in pinned:
+            own = span(i)
+            shift = 0
+            for p, link_type, lag in predecessors[i]:
+                shift = max(shift, required_shift(span(p), own, link_type, lag))
+            if shift > 0:
+                node = nodes[ids[i]]
+                start, end = own
+                end = start if end is None else max(end, start)
+                node['old_start'] = node['start_date']
+                node['old_end'] = node['end_date']
+                node['start_date'] = calendar.date_at(start + shift)
+                node['end_date'] = calendar.date_at(end + shift)
+                spans[i] = (start + shift, end + shift)
+                shifted.append(ids[i])
+
+        for j in successors[i]:
+            if j in pinned:
+                continue
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                queue.append(j)
+
+    return shifted
+
+
+def find_cycle(
+    parents: dict[UUID, list[UUID]],
+    task_id: UUID,
+    predecessor_id: UUID,
+    max_nodes: int
+) -> tuple[bool, list[UUID], int]:
+    """
+    Check whether linking `task_id` after `predecessor_id` would close a cycle.
+
+    That happens exactly when the task is already an ancestor of the new
+    predecessor, so this walks up from the predecessor over every link,
+    visiting each ancestor once.
+
+    Returns:
+        (cycle, boundary, visited): `boundary` lists ancestors missing from
+        `parents` (e.g. in another project) where the walk has to continue
+        elsewhere
+
+    Raises:
+        DependencyGraphTooLargeError: If there are more than `max_nodes` ancestors
+    """
+    boundary = []
+    seen = {predecessor_id}
+    queue = deque([predecessor_id])
+    while queue:
+        current = queue.popleft()
+        if current == task_id:
+            return True, [], len(seen)
+        if current not in parents:
+            boundary.append(current)
+            continue
+        for parent in parents[current]:
+            if parent not in seen:
+                if len(seen) >= max_nodes:
+                    raise DependencyGraphTooLargeError(f"Dependency graph above {max_nodes} ancestors")
+                seen.add(parent)
+                queue.append(parent)
+    return False, boundary, len(seen)
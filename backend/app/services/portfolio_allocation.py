@@ -0,0 +1,166 @@
+"""
+Portfolio Allocation Service
+
+Runs auto-assignment for many organizations in one pass for Global Resource Managers.
+
+Orgs are partitioned into groups connected by users that more than one of them
+could book: their own users and the shared pool (users with spare allocation in
+another org) on a team their unassigned tasks need, the same candidates the
+allocation tiers use. Groups run concurrently, at most `max_workers` at a time,
+each org with its own session and its allocation in a worker thread; orgs inside
+a group run in a stable order. Every run reads users through one
+SharedCapacityView, so a user borrowed by several orgs can never be booked past
+their full capacity, and writes take per-user advisory locks rather than
+serializing the whole portfolio.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.database import async_session_maker
+from app.models import Task, Project, Organization, User, UserAssignment
+from app.services.capacity_ledger import CapacityLedgerService
+from app.services.resource_allocation import ResourceAllocationService
+
+
+class SharedCapacityView:
+    """Cross-org booked hours per user per bucket, shared by every org in a run."""
+
+    def __init__(self, booked: dict[UUID, dict[date, float]]):
+        self.booked = booked
+
+    @classmethod
+    async def load(cls, db: AsyncSession, org_ids: list[UUID]) -> "SharedCapacityView":
+        """Load totals across all orgs for the window spanned by the orgs' unassigned tasks."""
+        result = await db.execute(
+            select(
+                func.min(Task.start_date), func.max(Task.start_date),
+                func.min(Task.end_date), func.max(Task.end_date)
+            )
+            .where(Task.org_id.in_(org_ids))
+            .where(Task.assignee_id.is_(None))
+        )
+        # Undated tasks are checked against the current bucket
+        dates = [d for d in result.one() if d] + [date.today()]
+
+        return cls(await CapacityLedgerService(db).get_user_totals(min(dates), max(dates)))
+
+
+async def partition_orgs(db: AsyncSession, org_ids: list[UUID]) -> list[list[UUID]]:
+    """
+    Group orgs that could book the same user.
+
+    An org can book a user on a team its unassigned tasks need if the user is
+    assigned to it (primary) or has spare allocation in another org (shared).
+    """
+    parent = {org_id: org_id for org_id in org_ids}
+
+    def find(org_id):
+        while parent[org_id] != org_id:
+            parent[org_id] = parent[parent[org_id]]
+            org_id = parent[org_id]
+        return org_id
+
+    result = await db.execute(
+        select(Task.org_id, Project.type)
+        .join(Project, Task.project_id == Project.id)
+        .where(Task.org_id.in_(org_ids))
+        .where(Task.assignee_id.is_(None))
+        .distinct()
+    )
+    orgs_by_team = defaultdict(set)
+    for org_id, team in result.all():
+        orgs_by_team[team].add(org_id)
+
+    result = await db.execute(
+        select(UserAssignment.user_id, UserAssignment.org_id, UserAssignment.allocation_percent, User.default_role)
+        .join(User, User.id == UserAssignment.user_id)
+        .where(User.is_active == True)
+    )
+    teams, assigned, spare = {}, defaultdict(set), defaultdict(set)
+    for user_id, org_id, allocation, team in result.all():
+        teams[user_id] = team
+        assigned[user_id].add(org_id)
+        if (allocation or 100) < 100:
+            spare[user_id].add(org_id)
+
+    for user_id, team in teams.items():
+        bookers = [
+            org_id for org_id in orgs_by_team.get(team, ())
+            if org_id in assigned[user_id] or spare[user_id] - {org_id}
+        ]
+        for org_id in bookers[1:]:
+            parent[find(org_id)] = find(bookers[0])
+
+    groups = defaultdict(list)
+    for org_id in sorted(org_ids, key=str):
+        groups[find(org_id)].append(org_id)
+    return list(groups.values())
+
+
+async def run_portfolio_allocation(
+    org_ids: Optional[list[UUID]] = None,
+    mode: str = "greedy",
+    time_budget_ms: Optional[int] = None,
+    dry_run: bool = False,
+    max_workers: int = 4
+) -> dict:
+    """
+    Auto-assign tasks for many (or all) organizations in one pass.
+
+    Args:
+        org_ids: Organizations to run; all of them when omitted
+        mode: "greedy" or "optimize"
+        time_budget_ms: Solver time budget per org for optimize mode
+        dry_run: Compute proposals without writing anything
+        max_workers: Org groups allocated concurrently (allocation runs in worker threads)
+
+    Returns:
+        Per-org results (or errors), group layout and totals
+    """
+    started = time.perf_counter()
+
+    async with async_session_maker() as db:
+        if org_ids is None:
+            result = await db.execute(select(Organization.id))
+            org_ids = list(result.scalars().all())
+        view = await SharedCapacityView.load(db, org_ids) if org_ids else SharedCapacityView({})
+        groups = await partition_orgs(db, org_ids)
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run_org(org_id: UUID) -> dict:
+        async with async_session_maker() as session:
+            try:
+                service = ResourceAllocationService(session, org_id, capacity_view=view)
+                result = await service.auto_assign_tasks(mode, time_budget_ms, dry_run)
+                return {'org_id': str(org_id), **result}
+            except Exception as e:
+                await session.rollback()
+                return {'org_id': str(org_id), 'error': str(e)}
+
+    async def run_group(group: list[UUID]) -> list[dict]:
+        async with semaphore:
+            return [await run_org(org_id) for org_id in group]
+
+    grouped = await asyncio.gather(*(run_group(group) for group in groups))
+    results = [r for group in grouped for r in group]
+    succeeded = [r for r in results if 'error' not in r]
+
+    return {
+        'organizations': results,
+        'groups': [[str(org_id) for org_id in group] for group in groups],
+        'summary': {
+            'organizations': len(results),
+            'failed': len(results) - len(succeeded),
+            'assigned': sum(r['summary']['assigned'] for r in succeeded),
+            'unassigned': sum(r['summary']['unassigned'] for r in succeeded),
+            'used_shared_resources': sum(r['summary']['used_shared_resources'] for r in succeeded),
+            'wall_time_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+    }
@@ -0,0 +1,152 @@
+"""
+Project JSON Service
+
+Builds project read payloads (a ProjectRead with its launch details, gateways
+and versions) as JSON text inside the database. Reads then skip hydrating ORM
+objects and validating them with pydantic: each row of the query is the
+finished document of one project.
+
+The text is byte-for-byte what the ORM path returns through FastAPI (compact
+separators, schema field order, ISO dates, hyphenated UUIDs):
+- PostgreSQL: scalars via `to_json`, nested lists via ordered `string_agg`.
+  `json_build_object`/`json_agg` are not used because they emit `" : "` and
+  `", "` separators.
+- SQLite: scalars via `json_quote`, nested lists via `group_concat` over an
+  ordered subquery; UUIDs and datetimes are reformatted from their stored text.
+Nested lists follow the relationships' `order_by`, as the ORM path does.
+"""
+
+import json
+from functools import lru_cache, reduce
+from typing import Sequence
+
+from sqlalchemy import Boolean, DateTime, Integer, Select, String, Text, Uuid, case, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models import Project, LaunchDetail, InputGateway
+from app.schemas.project import ProjectRead, LaunchDetailRead, InputGatewayRead, InputGatewayVersionRead
+
+# Nested levels of a project read, outermost first: relationship and its read schema
+LEVELS = (
+    (Project.launch_details, LaunchDetailRead),
+    (LaunchDetail.input_gateways, InputGatewayRead),
+    (InputGateway.versions, InputGatewayVersionRead),
+)
+
+PROJECT_FIELDS = tuple(name for name in ProjectRead.model_fields if name != "launch_details")
+
+
+def _sql(text: str) -> ColumnElement:
+    """A string constant inlined in the SQL."""
+    return literal_column("'" + text.replace("'", "''") + "'", String)
+
+
+def _concat(*parts: ColumnElement) -> ColumnElement:
+    return reduce(lambda a, b: a + b, parts)
+
+
+class ProjectJsonService:
+    """Builds the JSON document expression of a project for one SQL dialect."""
+
+    def __init__(self, dialect: str, fields: Sequence[str] = PROJECT_FIELDS, depth: int = len(LEVELS)):
+        self.postgresql = dialect == "postgresql"
+        self.fields = fields
+        self.depth = depth
+
+    def document(self) -> ColumnElement:
+        """JSON text of the current `projects` row: `fields`, then `depth` nested levels."""
+        return self._object(Project, self.fields, 0)
+
+    def select(self) -> Select:
+        """`doc`, `created_at` and `id` of projects; add filters and ordering."""
+        return select(self.document().label("doc"), Project.created_at, Project.id)
+
+    def _object(self, model, names: Sequence[str], level: int) -> ColumnElement:
+        members = []
+        for name in names:
+            members.append((name, self._value(getattr(model, name).expression)))
+        if level < self.depth:
+            relationship, schema = LEVELS[level]
+            members.append((relationship.key, self._array(relationship, schema, level + 1)))
+
+        parts = []
+        for i, (name, value) in enumerate(members):
+            parts.append(_sql(("{" if i == 0 else ",") + json.dumps(name) + ":"))
+            parts.append(value)
+        parts.append(_sql("}" if members else "{}"))
+        return _concat(*parts)
+
+    def _array(self, relationship, schema, level: int) -> ColumnElement:
+        """Ordered JSON array of the related rows, `[]` when there are none."""
+        prop = relationship.property
+        child = prop.mapper.class_
+        nested = LEVELS[level][0].key if level < len(LEVELS) else None
+        names = [name for name in schema.model_fields if name != nested]
+        element = self._object(child, names, level)
+
+        if self.postgresql:
+            items = func.string_agg(element, aggregate_order_by(_sql(","), *prop.order_by))
+            rows = select(items).where(prop.primaryjoin)
+        else:
+            ordered = (
+                select(element.label("doc"))
+                .where(prop.primaryjoin)
+                .order_by(*prop.order_by)
+                .correlate(prop.parent.local_table)
+                .subquery()
+            )
+            items = func.group_concat(ordered.c.doc, _sql(","))
+            rows = select(items).select_from(ordered)
+        return _concat(_sql("["), func.coalesce(rows.scalar_subquery(), _sql("")), _sql("]"))
+
+    def _value(self, column: ColumnElement) -> ColumnElement:
+        """JSON text of a column value, as pydantic/FastAPI would encode it."""
+        kind = column.type
+        if self.postgresql:
+            if isinstance(kind, DateTime):
+                # isoformat() of the UTC datetime asyncpg returns
+                utc = func.timezone(_sql("UTC"), column)
+                microseconds = func.mod(cast(func.date_part(_sql("microseconds"), column), Integer), 1000000)
+                fraction = case((microseconds != 0, func.to_char(utc, _sql(".US"))), else_=_sql(""))
+                text = _concat(_sql('"'), func.to_char(utc, _sql('YYYY-MM-DD"T"HH24:MI:SS')), fraction, _sql('+00:00"'))
+                return case((column.is_(None), _sql("null")), else_=text)
+            return func.coalesce(cast(func.to_json(column), Text), _sql("null"))
+
+        if isinstance(kind, Uuid):
+            # Stored as 32 hex digits
+            text = _concat(
+                _sql('"'), func.substr(column, 1, 8), _sql("-"), func.substr(column, 9, 4), _sql("-"),
+                func.substr(column, 13, 4), _sql("-"), func.substr(column, 17, 4), _sql("-"),
+                func.substr(column, 21), _sql('"')
+            )
+            return case((column.is_(None), _sql("null")), else_=text)
+        if isinstance(kind, DateTime):
+            # Stored as "YYYY-MM-DD HH:MM:SS.ffffff"; isoformat() drops a zero fraction
+            text = func.replace(column, _sql(" "), _sql("T"))
+            text = case((column.like("%.000000"), func.substr(text, 1, 19)), else_=text)
+            return func.json_quote(text)
+        if isinstance(kind, Boolean):
+            return case((column.is_(None), _sql("null")), (column == True, _sql("true")), else_=_sql("false"))  # noqa: E712
+        # Strings, numbers and dates (stored ISO)
+        return func.json_quote(column)
+
+
+@lru_cache(maxsize=256)
+def _documents_query(dialect: str, fields: tuple[str, ...], depth: int) -> Select:
+    # Building the expression costs a few ms; statements are immutable, so it is shared
+    return ProjectJsonService(dialect, fields, depth).select()
+
+
+def project_documents(db: AsyncSession, fields: Sequence[str] = PROJECT_FIELDS, depth: int = len(LEVELS)) -> Select:
+    """
+    Query of project documents (`doc`, `created_at`, `id` columns) for the
+    session's database; the caller adds filters and ordering.
+    """
+    return _documents_query(db.get_bind().dialect.name, tuple(fields), depth)
+
+
+def json_array(documents: Sequence[str]) -> str:
+    """A JSON array of documents that are already JSON text."""
+    return "[" + ",".join(documents) + "]"
@@ -0,0 +1,77 @@
+"""
+Project Schedule Versions
+
+Every change to a project's task dates, dependency links or working calendar
+bumps the project's schedule version in the same transaction. Caches of
+schedule computations (critical paths, predecessor maps) are kept per worker
+and keyed on the version they were computed at, so they go stale in every
+worker exactly when the change commits, and never before.
+
+A session that changed a project's schedule reads its own uncommitted writes,
+so it neither uses nor fills those caches for that project.
+"""
+
+from typing import Iterable
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models import ProjectSchedule
+
+# Session.info key: projects whose schedule the session has changed
+CHANGED_KEY = 'changed_schedules'
+
+# First key of the advisory locks taken on projects by link writers (PostgreSQL)
+LINK_LOCK_SPACE = 0x5343
+
+
+async def bump_schedule_versions(db: AsyncSession, project_ids: Iterable[UUID]) -> None:
+    """
+    Mark the schedules of existing projects as changed. Does not commit.
+
+    Rows go in id order so concurrent writers lock them in the same order;
+    call it last in a transaction to hold the locks briefly.
+    """
+    project_ids = sorted(set(project_ids), key=str)
+    if not project_ids:
+        return
+
+    insert = postgresql_insert if db.get_bind().dialect.name == 'postgresql' else sqlite_insert
+    stmt = insert(ProjectSchedule)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['project_id'],
+        set_={'version': ProjectSchedule.version + 1}
+    )
+    await db.execute(stmt, [{'project_id': project_id, 'version': 1} for project_id in project_ids])
+    db.info.setdefault(CHANGED_KEY, set()).update(project_ids)
+
+
+async def lock_project_links(db: AsyncSession, project_ids: Iterable[UUID]) -> None:
+    """
+    Take a per-project advisory lock for the rest of the transaction (PostgreSQL only).
+
+    Writers of dependency links take it before checking a new link for cycles,
+    so they run one at a time per project and each sees the links committed
+    by the one before. Other schedule writers do not take it. Locks are taken
+    in id order; locking a project again in the same transaction does not wait.
+    """
+    if db.get_bind().dialect.name != 'postgresql':
+        return
+    for project_id in sorted(set(project_ids), key=str):
+        key = int.from_bytes(project_id.bytes[:4], 'big', signed=True)
+        await db.execute(select(func.pg_advisory_xact_lock(LINK_LOCK_SPACE, key)))
+
+
+def schedule_changed(db: AsyncSession, project_id: UUID) -> bool:
+    """Whether this session has changed the project's schedule."""
+    return project_id in db.info.get(CHANGED_KEY, ())
+
+
+async def get_schedule_version(db: AsyncSession, project_id: UUID) -> int:
+    """Current schedule version of a project (0 until its first change)."""
+    result = await db.execute(
+        select(ProjectSchedule.version).where(ProjectSchedule.project_id == project_id)
+    )
+    return result.scalar_one_or_none() or 0
+
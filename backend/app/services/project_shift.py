@@ -0,0 +1,196 @@
+"""
+Project Shift Service
+
+Moves a whole project in time: the project dates, every task, the launch
+go-live dates and the input gateway expected dates, by a number of months
+and/or days.
+
+Every table is moved with one set-based UPDATE, whatever the project size, in
+the caller's transaction. Task dates are then rolled forward to working days of
+the project's calendar and the project's own links are re-propagated (month
+ends clamp, so Jan 30 and Jan 31 both land on Feb 28). Successors in other
+projects that the move would violate are then pushed with the regular
+dependency cascade.
+"""
+
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, cast, func, Date
+from app.models import Project, LaunchDetail, InputGateway, Task
+from app.services.capacity_ledger import CapacityLedgerService
+from app.services.dependency_graph import load_project_graph, propagate_dates
+from app.services.project_schedule import bump_schedule_versions
+from app.services.task_dependencies import TaskDependencyService
+from app.services.working_calendar import get_project_calendar
+
+
+def shifted_date(column, months: int, days: int, dialect: str):
+    """
+    SQL expression for a date column moved by months then days.
+
+    Months are calendar months; PostgreSQL clamps to the end of shorter
+    months (Jan 31 + 1 month = Feb 28), like date-fns addMonths, while SQLite
+    (development) rolls over into the next month. NULL stays NULL.
+    """
+    if dialect == "postgresql":
+        return cast(column + func.make_interval(0, months, 0, days), Date)
+    return func.date(column, f"{months:+d} months", f"{days:+d} days")
+
+
+class ProjectShiftService:
+    """Moves a project and everything scheduled under it."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.ledger = CapacityLedgerService(db)
+
+    async def shift(self, project_id: UUID, org_id: UUID, months: int = 0, days: int = 0) -> dict:
+        """
+        Shift a project's timeline. Does not commit.
+
+        Args:
+            project_id: Project to move
+            org_id: Organization the project must belong to
+            months: Calendar months to move by (negative = earlier)
+            days: Days to move by, applied after the months
+
+        Returns:
+            Row counts per table and the tasks pushed in other projects
+
+        Raises:
+            CalendarRangeError: If a task would move past date.max
+            ValueError: If the project does not exist in the organization
+        """
+        result = await self.db.execute(
+            select(Project.id).where(Project.id == project_id, Project.org_id == org_id)
+        )
+        if not result.scalar_one_or_none():
+            raise ValueError(f"Project {project_id} not found")
+
+        dialect = self.db.get_bind().dialect.name
+
+        def moved(column):
+            return shifted_date(column, months, days, dialect)
+
+        bookings = await self._bookings(project_id)
+
+        await self.db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(start_date=moved(Project.start_date), end_date=moved(Project.end_date), version=Project.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        tasks = await self.db.execute(
+            update(Task)
+            .where(Task.project_id == project_id)
+            .values(start_date=moved(Task.start_date), end_date=moved(Task.end_date), version=Task.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        launches = await self.db.execute(
+            update(LaunchDetail)
+            .where(LaunchDetail.project_id == project_id)
+            .values(goal_live=moved(LaunchDetail.goal_live))
+            .execution_options(synchronize_session=False)
+        )
+        gateways = await self.db.execute(
+            update(InputGateway)
+            .where(InputGateway.launch_detail_id.in_(
+                select(LaunchDetail.id).where(LaunchDetail.project_id == project_id)
+            ))
+            .values(expected_date=moved(InputGateway.expected_date))
+            .execution_options(synchronize_session=False)
+        )
+        await self._settle_tasks(project_id)
+
+        # Move the bookings of assigned tasks along
+        after = await self._bookings(project_id)
+        await self.ledger.record_changes([
+            (before, after.get(task_id)) for task_id, before in bookings.items()
+        ])
+
+        # Push successors in other projects the move now violates
+        result = await self.db.execute(select(Task.id).where(Task.project_id == project_id))
+        cascaded = await TaskDependencyService(self.db).cascade_from_tasks(
+            [(project_id, task_id) for task_id in result.scalars().all()]
+        )
+        await bump_schedule_versions(self.db, [project_id])
+
+        return {
+            'project_id': project_id,
+            'months': months,
+            'days': days,
+            'tasks_shifted': tasks.rowcount,
+            'launches_shifted': launches.rowcount,
+            'gateways_shifted': gateways.rowcount,
+            'cascaded_tasks': cascaded
+        }
+
+    async def _settle_tasks(self, project_id: UUID) -> None:
+        """
+        Roll the project's moved task dates forward to working days, then push
+        tasks whose in-project links the move broke, from the tasks without an
+        in-project predecessor. Changed tasks are written with one bulk UPDATE.
+        """
+        nodes, edges = await load_project_graph(self.db, project_id)
+        calendar = await get_project_calendar(self.db, project_id)
+        internal = {node_id for node_id, node in nodes.items() if not node['external']}
+
+        changed = set()
+        for node_id in internal:
+            node = nodes[node_id]
+            start, end = node['start_date'], node['end_date']
+            if start:
+                node['start_date'] = calendar.date_at(calendar.index(start))
+            if end:
+                node['end_date'] = calendar.date_at(calendar.index(end))
+            if start and end:
+                node['end_date'] = max(node['end_date'], node['start_date'])
+            if (node['start_date'], node['end_date']) != (start, end):
+                changed.add(node_id)
+
+        linked = {succ for pred, succ, _, _ in edges if pred in internal and succ in internal}
+        changed.update(propagate_dates(nodes, edges, internal - linked, calendar))
+        if changed:
+            await self.db.execute(
+                update(Task),
+                [
+                    {'id': node_id, 'start_date': nodes[node_id]['start_date'], 'end_date': nodes[node_id]['end_date']}
+                    for node_id in changed
+                ]
+            )
+
+    async def _bookings(self, project_id: UUID) -> dict:
+        """Booking snapshots of the project's assigned tasks, by task id."""
+        result = await self.db.execute(
+            select(Task.id, Task.org_id, Task.assignee_id, Task.estimate, Task.start_date, Task.end_date)
+            .where(
+                Task.project_id == project_id,
+                Task.assignee_id.is_not(None),
+                Task.estimate.is_not(None)
+            )
+        )
+        return {row.id: row._asdict() for row in result.all()}
+
+
+async def shift_project(
+    db: AsyncSession,
+    project_id: UUID,
+    org_id: UUID,
+    months: int = 0,
+    days: int = 0
+) -> dict:
+    """
+    Main entry point for moving a project's timeline.
+
+    Args:
+        db: Database session
+        project_id: Project to move
+        org_id: Organization the project must belong to
+        months: Calendar months to move by
+        days: Days to move by
+
+    Returns:
+        Shift summary, see ProjectShiftService.shift
+    """
+    service = ProjectShiftService(db)
+    return await service.shift(project_id, org_id, months, days)
@@ -5,74 +5,285 @@ Resource Allocation Service
 1. Primary resources (belong to current portfolio)
 2. Shared resources (from other portfolios with available capacity)
 3. Cross-portfolio suggestions (candidates for reallocation)
+
+Availability is time-phased: each task's estimate is spread over the ledger
+buckets its dates cover and checked against booked hours from the capacity ledger.
 """
 
+import asyncio
+import base64
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
+from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import Task, Project, User, UserAssignment, Organization
+from sqlalchemy import select, update, func
+from app.models import Task, Project, User, UserAssignment
+from app.services.capacity_ledger import (
+    CapacityLedgerService, bucket_capacity, task_demand
+)
+from app.services.candidate_index import CandidateIndex, PRIMARY, SHARED
+from app.services.assignment_solver import AssignmentSolver, assignment_objective
+from app.config import get_settings
+
+# How long a dry-run proposal can be applied for
+PROPOSAL_TTL_MINUTES = 15
+
+
+class StaleProposalError(ValueError):
+    """Raised when a proposal no longer matches the tasks it was computed for."""
+
+
+# Hex digits of one packed (task_id, assignee_id, task version) entry
+PACKED_ENTRY = 32 + 32 + 8
+
+
+def create_proposal_token(org_id: UUID, assignments: list[tuple[UUID, UUID, int]]) -> str:
+    """
+    Sign a dry-run proposal so it can be applied later without server-side state.
+    
+    The (task_id, assignee_id, task version) entries are packed as hex and
+    zlib-compressed to keep the token compact for large proposals.
+    """
+    settings = get_settings()
+    packed = ''.join(
+        f"{task_id.hex}{assignee_id.hex}{version:08x}" for task_id, assignee_id, version in assignments
+    )
+    data = {
+        'org_id': str(org_id),
+        'proposal': base64.urlsafe_b64encode(zlib.compress(packed.encode())).decode(),
+        'exp': datetime.now(timezone.utc) + timedelta(minutes=PROPOSAL_TTL_MINUTES),
+    }
+    return jwt.encode(data, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_proposal_token(token: str, org_id: UUID) -> list[tuple[UUID, UUID, int]]:
+    """Verify a proposal token for an org and unpack its (task_id, assignee_id, task version) entries."""
+    settings = get_settings()
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        packed = zlib.decompress(base64.urlsafe_b64decode(payload['proposal'])).decode()
+    except (JWTError, KeyError, ValueError, zlib.error):
+        raise ValueError("Invalid or expired proposal token")
+    if payload.get('org_id') != str(org_id):
+        raise ValueError("Proposal token belongs to another organization")
+    return [
+        (UUID(packed[i:i + 32]), UUID(packed[i + 32:i + 64]), int(packed[i + 64:i + PACKED_ENTRY], 16))
+        for i in range(0, len(packed), PACKED_ENTRY)
+    ]
 
 
 class ResourceAllocationService:
     """Handles resource allocation and auto-assignment logic."""
     
-    def __init__(self, db: AsyncSession, org_id: UUID):
+    def __init__(self, db: AsyncSession, org_id: UUID, capacity_view=None):
+        """
+        Args:
+            db: Database session
+            org_id: Organization/portfolio to allocate for
+            capacity_view: Optional cross-org view of booked hours per user (see
+                portfolio_allocation.SharedCapacityView) that caps every user at
+                their full capacity across all orgs in a portfolio-wide run
+        """
         self.db = db
         self.org_id = org_id
+        self.ledger = CapacityLedgerService(db)
+        self.capacity_view = capacity_view
     
-    async def auto_assign_tasks(self) -> dict:
+    async def auto_assign_tasks(
+        self,
+        mode: str = "greedy",
+        time_budget_ms: Optional[int] = None,
+        dry_run: bool = False
+    ) -> dict:
         """
         Auto-assign unassigned tasks to available resources.
         
+        Loads everything the tiers need up front in a fixed number of queries,
+        runs the allocation in memory and writes all assignments in one bulk UPDATE.
+        The allocation (and the solver's time budget) runs in a worker thread so
+        it never blocks the event loop.
+        
+        Args:
+            mode: "greedy" (first fit in task order) or "optimize" (bin-packing solver)
+            time_budget_ms: Solver time budget for optimize mode
+            dry_run: Only compute the proposal; nothing is written. The result then
+                carries `proposed_assignments` and a `proposal_token` for `apply_proposal`
+        
         Returns a dictionary with:
         - gaps: Tasks that couldn't be assigned
         - shared_assignments: Tasks assigned to shared resources
         - cross_portfolio_suggestions: Candidates from other portfolios
         - summary: Assignment statistics
+        - solver: Mode, iterations, objective and wall time
         """
-        # Load tasks for this organization
+        # Load tasks (joined to their projects) and the resource matrix; a
+        # real run locks the bookable users first
         tasks = await self._get_unassigned_tasks()
-        resources = await self._get_available_resources()
+        index = await self._get_available_resources(tasks, lock=not dry_run)
+        result = await asyncio.to_thread(self.allocate, tasks, index, mode, time_budget_ms)
+        assignments = result.pop('assignments')
+        
+        if dry_run:
+            result['proposed_assignments'] = [
+                {
+                    'task_id': str(t['id']),
+                    'task_title': t['title'],
+                    'assignee_id': str(t['assignee_id']),
+                    'assigned_to': index.names[t['slot']],
+                }
+                for t in assignments
+            ]
+            result['proposal_token'] = create_proposal_token(
+                self.org_id, [(t['id'], t['assignee_id'], t['version']) for t in assignments]
+            )
+            return result
         
-        # Categorize resources
-        primary_resources = [r for r in resources if r['is_primary']]
-        shared_resources = [r for r in resources if not r['is_primary'] and r['allocation'] < 100]
+        await self._persist(assignments)
+        return result
+    
+    async def apply_proposal(self, token: str) -> dict:
+        """
+        Apply a dry-run proposal exactly as computed, in one bulk write.
+        
+        The proposed assignees are locked first; the tasks are then re-read
+        locked and must still be unassigned at the version the dry run saw,
+        and every assignee must still have the capacity for their tasks.
+        
+        Raises:
+            ValueError: The token is invalid, expired or for another org
+            StaleProposalError: Some proposed tasks were assigned, changed or
+                removed since, or an assignee no longer has the capacity
+        """
+        proposal = decode_proposal_token(token, self.org_id)
+        if not proposal:
+            return {'summary': {'assigned': 0}, 'proposed_assignments': []}
         
-        # Track assignments
+        await self._lock_users(assignee_id for _, assignee_id, _ in proposal)
+        versions = {task_id: version for task_id, _, version in proposal}
+        tasks = {t['id']: t for t in await self._get_unassigned_tasks(list(versions), lock=True)}
+        stale = sum(
+            1 for task_id, version in versions.items()
+            if task_id not in tasks or tasks[task_id]['version'] != version
+        )
+        if stale:
+            raise StaleProposalError(f"{stale} proposed tasks were assigned, changed or removed since the dry run")
+        
+        # Hours booked since the dry run count now (read under the user locks)
+        index = await self._get_available_resources(list(tasks.values()))
+        assignments = []
+        for task_id, assignee_id, _ in proposal:
+            task = tasks[task_id]
+            slot = self._proposed_slot(index, assignee_id, task)
+            if slot is None:
+                raise StaleProposalError(f"{task['title']}: the proposed assignee no longer has the capacity")
+            index.book(slot, task['demand'])
+            task['assignee_id'] = assignee_id
+            assignments.append(task)
+        await self._persist(assignments)
+        
+        return {
+            'summary': {'assigned': len(assignments)},
+            'proposed_assignments': [
+                {'task_id': str(t['id']), 'assignee_id': str(t['assignee_id'])}
+                for t in assignments
+            ]
+        }
+    
+    def _proposed_slot(self, index: CandidateIndex, assignee_id: UUID, task: dict) -> Optional[int]:
+        """A slot of the assignee on the task's team that fits it, primary first."""
+        position = index.user_positions.get(assignee_id)
+        if position is None:
+            return None
+        slots = [slot for slot in index.user_slots[position] if index.teams[slot] == task['required_team']]
+        for tier in (PRIMARY, SHARED):
+            for slot in slots:
+                if index.tiers[slot] == tier and index.fits(slot, task['demand']):
+                    return slot
+        return None
+    
+    async def _persist(self, assignments: list[dict]) -> None:
+        """Write assignments, book them in the capacity ledger and commit."""
+        await self._lock_users(t['assignee_id'] for t in assignments)
+        await self._write_assignments(assignments)
+        await self.ledger.record_changes([
+            (None, {
+                'org_id': self.org_id,
+                'assignee_id': t['assignee_id'],
+                'estimate': t['estimate'],
+                'start_date': t['start_date'],
+                'end_date': t['end_date'],
+            })
+            for t in assignments
+        ])
+        await self.db.commit()
+    
+    def allocate(
+        self,
+        tasks: list[dict],
+        index: CandidateIndex,
+        mode: str = "greedy",
+        time_budget_ms: Optional[int] = None
+    ) -> dict:
+        """
+        Run the three tiers in memory against a candidate index.
+        
+        In optimize mode tiers 1 and 2 are replaced by the assignment solver;
+        tier 3 suggestions and gaps are reported the same way for both modes.
+        
+        Sets `assignee_id` on every task that gets assigned and returns the
+        assigned tasks alongside the usual gaps/suggestions/summary payload.
+        """
+        started = time.perf_counter()
+        assignments = []
         gaps = []
         shared_assignments = []
         cross_portfolio_suggestions = []
-        assigned_count = 0
+        
+        chosen = {}
+        solver_stats = {'iterations': len(tasks)}
+        if mode == "optimize":
+            budget = time_budget_ms or get_settings().auto_assign_time_budget_ms
+            solver_stats = AssignmentSolver(tasks, index, budget).solve()
+            chosen = solver_stats.pop('slots')
         
         for task in tasks:
-            project = await self._get_project(task.project_id)
-            if not project:
-                continue
-                
-            required_team = project.type_name  # e.g., 'Website', 'Configurator'
-            estimate = task.estimate_hours or 0
-            
-            # TIER 1: Primary resources
-            assigned = await self._try_assign_primary(task, primary_resources, required_team, estimate)
-            if assigned:
-                assigned_count += 1
-                continue
+            required_team = task['required_team']  # e.g., 'Website', 'Configurator'
+            estimate = task['estimate']
+            demand = task['demand']
             
-            # TIER 2: Shared resources
-            assigned, shared_info = await self._try_assign_shared(task, shared_resources, required_team, estimate, project)
-            if assigned:
-                shared_assignments.append(shared_info)
-                assigned_count += 1
-                continue
+            if mode == "optimize":
+                slot = chosen.get(task['id'])
+                if slot is not None:
+                    task['assignee_id'] = index.ids[slot]
+                    task['slot'] = slot
+                    assignments.append(task)
+                    if index.tiers[slot] == SHARED:
+                        shared_assignments.append(self._shared_assignment_info(task, index, slot))
+                    continue
+            else:
+                # TIER 1: Primary resources
+                assigned = self._try_assign_primary(task, index, required_team, demand)
+                if assigned:
+                    assignments.append(task)
+                    continue
+                
+                # TIER 2: Shared resources
+                assigned, shared_info = self._try_assign_shared(task, index, required_team, demand)
+                if assigned:
+                    assignments.append(task)
+                    shared_assignments.append(shared_info)
+                    continue
             
             # TIER 3: Cross-portfolio suggestions
-            candidates = self._find_cross_portfolio_candidates(resources, required_team, estimate)
+            candidates = self._find_cross_portfolio_candidates(index, required_team, demand)
             if candidates:
                 cross_portfolio_suggestions.append({
-                    'task_id': str(task.id),
-                    'task_title': task.title,
-                    'project_name': project.name,
+                    'task_id': str(task['id']),
+                    'task_title': task['title'],
+                    'project_name': task['project_name'],
                     'required_team': required_team,
                     'estimate': estimate,
                     'candidates': candidates,
@@ -81,156 +292,241 @@ class ResourceAllocationService:
             
             # Record gap
             gaps.append({
-                'task_id': str(task.id),
-                'task_title': task.title,
-                'project_name': project.name,
+                'task_id': str(task['id']),
+                'task_title': task['title'],
+                'project_name': task['project_name'],
                 'required_team': required_team,
                 'estimate': estimate,
-                'reason': 'Primary Resources at Capacity' if any(r['team'] == required_team for r in primary_resources) else 'No Primary Team Members',
+                'reason': 'Primary Resources at Capacity' if index.has_team(PRIMARY, required_team) else 'No Primary Team Members',
                 'type': 'gap',
                 'has_cross_portfolio_option': len(candidates) > 0
             })
         
-        await self.db.commit()
-        
         return {
-            'gaps': [g for g in gaps if g['type'] == 'gap'],
+            'assignments': assignments,
+            'gaps': gaps,
             'shared_assignments': shared_assignments,
             'cross_portfolio_suggestions': cross_portfolio_suggestions,
             'summary': {
-                'assigned': assigned_count,
-                'unassigned': len([g for g in gaps if g['type'] == 'gap']),
+                'assigned': len(assignments),
+                'unassigned': len(gaps),
                 'used_shared_resources': len(shared_assignments),
                 'can_reallocate': len(cross_portfolio_suggestions)
+            },
+            'solver': {
+                **solver_stats,
+                'mode': mode,
+                'objective': round(assignment_objective(
+                    tasks, index, {t['id']: t['slot'] for t in assignments}
+                ), 2),
+                'wall_time_ms': round((time.perf_counter() - started) * 1000, 2)
             }
         }
     
-    async def _get_unassigned_tasks(self) -> list:
-        """Get all unassigned tasks for projects in this organization."""
-        result = await self.db.execute(
-            select(Task)
+    async def _get_unassigned_tasks(self, task_ids: Optional[list[UUID]] = None, lock: bool = False) -> list[dict]:
+        """
+        Get the unassigned tasks for this organization (all, or those of
+        `task_ids`), joined to their projects; `lock` locks the task rows.
+        """
+        query = (
+            select(
+                Task.id, Task.version, Task.title, Task.estimate, Task.start_date, Task.end_date,
+                Project.name, Project.type
+            )
             .join(Project, Task.project_id == Project.id)
             .where(Project.org_id == self.org_id)
-            .where(Task.assignee_id == None)
+            .where(Task.assignee_id.is_(None))
+            .order_by(Task.start_date, Task.id)
         )
-        return result.scalars().all()
+        if task_ids is not None:
+            query = query.where(Task.id.in_(task_ids))
+        if lock:
+            query = query.with_for_update(of=Task)
+        result = await self.db.execute(query)
+        today = date.today()
+        
+        tasks = []
+        for task_id, version, title, estimate, start, end, project_name, project_type in result.all():
+            estimate = estimate or 0
+            demand = task_demand(estimate, start, end, self.ledger.period, today)
+            tasks.append({
+                'id': task_id,
+                'version': version,
+                'title': title,
+                'estimate': estimate,
+                'start_date': start,
+                'end_date': end,
+                'demand': demand,
+                'project_name': project_name,
+                'required_team': project_type,
+                'assignee_id': None
+            })
+        return tasks
     
-    async def _get_available_resources(self) -> list:
+    async def _get_available_resources(self, tasks: list[dict], lock: bool = False) -> CandidateIndex:
         """
-        Get all available resources with their allocation info.
-        Returns primary resources (this org) and shared resources (other orgs with capacity).
+        Build the candidate index of available resources.
+        Holds primary resources (this org) and shared resources (other orgs with capacity).
+        
+        Each slot carries its per-bucket capacity share; booked hours come from the
+        capacity ledger for this org over the buckets the tasks span. Every user
+        is also capped at their full capacity across all orgs.
+        
+        With `lock`, the users on a team some task needs (the only ones that
+        can be booked) are locked before the ledger is read, so concurrent runs
+        of any org booking the same users see each other's committed hours.
         """
         # Get all users with assignments
         result = await self.db.execute(
-            select(User, UserAssignment)
+            select(
+                User.id, User.name, User.default_role, User.capacity_hours, User.cost_rate,
+                UserAssignment.org_id, UserAssignment.allocation_percent
+            )
             .join(UserAssignment, User.id == UserAssignment.user_id)
             .where(User.is_active == True)
         )
         rows = result.all()
         
-        resources = []
-        for user, assignment in rows:
-            # Calculate available capacity
-            capacity = user.capacity_hours or 160
-            used = await self._get_user_assigned_hours(user.id)
-            available = capacity - used
-            
-            resources.append({
-                'id': str(user.id),
-                'name': user.name,
-                'team': user.default_role,  # Maps to project type
-                'capacity': capacity,
-                'used': used,
-                'available': available,
-                'org_id': str(assignment.org_id),
-                'is_primary': assignment.org_id == self.org_id,
-                'allocation': assignment.allocation_percent or 100
-            })
+        teams = {t['required_team'] for t in tasks}
+        bookable = sorted({row.id for row in rows if row.default_role in teams})
+        if lock:
+            await self._lock_users(bookable)
         
-        return resources
+        buckets = [b for t in tasks for b in t['demand']]
+        booked = {}
+        totals = {}
+        if buckets:
+            start, end = min(buckets), max(buckets)
+            booked = await self.ledger.get_booked_hours(start, end, org_id=self.org_id)
+            if self.capacity_view is None or lock:
+                totals = await self.ledger.get_user_totals(start, end, assignee_ids=bookable)
+        if self.capacity_view is not None:
+            # Hours committed by now (read under the lock) replace the run's snapshot
+            self.capacity_view.booked.update(totals)
+            totals = self.capacity_view.booked
+        
+        index = CandidateIndex()
+        for user_id, name, default_role, capacity_hours, cost_rate, org_id, allocation_percent in rows:
+            capacity = capacity_hours or 160
+            allocation = allocation_percent or 100
+            is_primary = org_id == self.org_id
+            if not is_primary and allocation >= 100:
+                continue
+            # Primary rows get their allocation to this org, shared rows their spare share
+            share = allocation if is_primary else 100 - allocation
+            index.add(
+                user_id=user_id,
+                name=name,
+                team=default_role,  # Maps to project type
+                org_id=org_id,
+                tier=PRIMARY if is_primary else SHARED,
+                capacity=capacity,
+                allocation=allocation,
+                bucket_capacity=bucket_capacity(capacity, self.ledger.period) * share / 100,
+                booked=booked.get((self.org_id, user_id)),
+                cost_rate=float(cost_rate or 0),
+                totals=totals.setdefault(user_id, {}),
+                total_limit=bucket_capacity(capacity, self.ledger.period)
+            )
+        
+        return index
     
-    async def _get_user_assigned_hours(self, user_id: UUID) -> int:
-        """Calculate total hours already assigned to this user."""
-        result = await self.db.execute(
-            select(Task)
-            .where(Task.assignee_id == user_id)
-        )
-        tasks = result.scalars().all()
-        return sum(t.estimate_hours or 0 for t in tasks)
+    async def _lock_users(self, user_ids) -> None:
+        """
+        Take a per-user advisory lock for the rest of the transaction (PostgreSQL only).
+        
+        Locks are taken in a stable order so concurrent runs booking overlapping
+        users wait on each other instead of deadlocking or interleaving ledger writes.
+        Locking a user again in the same transaction does not wait.
+        """
+        if self.db.get_bind().dialect.name != 'postgresql':
+            return
+        for user_id in sorted(set(user_ids)):
+            key = int.from_bytes(user_id.bytes[:8], 'big', signed=True)
+            await self.db.execute(select(func.pg_advisory_xact_lock(key)))
     
-    async def _get_project(self, project_id: UUID) -> Optional[Project]:
-        """Get a project by ID."""
-        result = await self.db.execute(
-            select(Project).where(Project.id == project_id)
+    async def _write_assignments(self, tasks: list[dict]) -> None:
+        """Persist all assignments with a single bulk UPDATE by primary key."""
+        if not tasks:
+            return
+        await self.db.execute(
+            update(Task).values(version=Task.version + 1),
+            [{'id': t['id'], 'assignee_id': t['assignee_id']} for t in tasks]
         )
-        return result.scalar_one_or_none()
     
-    async def _try_assign_primary(self, task, resources: list, required_team: str, estimate: int) -> bool:
+    def _try_assign_primary(self, task: dict, index: CandidateIndex, required_team: str, demand: dict) -> bool:
         """Try to assign task to a primary resource. Returns True if successful."""
-        for resource in resources:
-            if resource['team'] == required_team and resource['available'] >= estimate:
-                task.assignee_id = UUID(resource['id'])
-                resource['used'] += estimate
-                resource['available'] -= estimate
-                return True
-        return False
+        slot = index.find(PRIMARY, required_team, demand)
+        if slot is None:
+            return False
+        task['assignee_id'] = index.ids[slot]
+        task['slot'] = slot
+        index.book(slot, demand)
+        return True
     
-    async def _try_assign_shared(self, task, resources: list, required_team: str, estimate: int, project) -> tuple:
+    def _try_assign_shared(self, task: dict, index: CandidateIndex, required_team: str, demand: dict) -> tuple:
         """
         Try to assign task to a shared resource.
         Returns (success: bool, assignment_info: dict or None)
         """
-        for resource in resources:
-            if resource['team'] == required_team and resource['available'] >= estimate:
-                task.assignee_id = UUID(resource['id'])
-                resource['used'] += estimate
-                resource['available'] -= estimate
-                
-                info = {
-                    'task_id': str(task.id),
-                    'task_title': task.title,
-                    'project_name': project.name,
-                    'required_team': required_team,
-                    'estimate': estimate,
-                    'assigned_to': resource['name'],
-                    'resource_id': resource['id'],
-                    'primary_portfolio_id': resource['org_id'],
-                    'target_portfolio_id': str(self.org_id),
-                    'current_allocation': resource['allocation'],
-                    'suggested_split': 30,
-                    'type': 'shared_assignment'
-                }
-                return True, info
-        return False, None
+        slot = index.find(SHARED, required_team, demand)
+        if slot is None:
+            return False, None
+        task['assignee_id'] = index.ids[slot]
+        task['slot'] = slot
+        index.book(slot, demand)
+        return True, self._shared_assignment_info(task, index, slot)
     
-    def _find_cross_portfolio_candidates(self, resources: list, required_team: str, estimate: int) -> list:
+    def _shared_assignment_info(self, task: dict, index: CandidateIndex, slot: int) -> dict:
+        """Describe a task assigned to a shared resource."""
+        return {
+            'task_id': str(task['id']),
+            'task_title': task['title'],
+            'project_name': task['project_name'],
+            'required_team': task['required_team'],
+            'estimate': task['estimate'],
+            'assigned_to': index.names[slot],
+            'resource_id': str(index.ids[slot]),
+            'primary_portfolio_id': str(index.org_ids[slot]),
+            'target_portfolio_id': str(self.org_id),
+            'current_allocation': index.allocation[slot],
+            'suggested_split': 30,
+            'type': 'shared_assignment'
+        }
+    
+    def _find_cross_portfolio_candidates(self, index: CandidateIndex, required_team: str, demand: dict) -> list:
         """Find candidates from other portfolios who could be reallocated."""
-        candidates = []
-        for resource in resources:
-            if (resource['team'] == required_team and 
-                not resource['is_primary'] and 
-                resource['allocation'] < 100 and 
-                resource['available'] >= estimate):
-                candidates.append({
-                    'id': resource['id'],
-                    'name': resource['name'],
-                    'current_allocation': resource['allocation'],
-                    'available_hours': int(resource['capacity'] * (100 - resource['allocation']) / 100),
-                    'portfolio_id': resource['org_id']
-                })
-        return candidates
+        return [
+            {
+                'id': str(index.ids[slot]),
+                'name': index.names[slot],
+                'current_allocation': index.allocation[slot],
+                'available_hours': int(index.capacity[slot] * (100 - index.allocation[slot]) / 100),
+                'portfolio_id': str(index.org_ids[slot])
+            }
+            for slot in index.find_all(SHARED, required_team, demand)
+        ]
 
 
-async def auto_assign_resources(db: AsyncSession, org_id: UUID) -> dict:
+async def auto_assign_resources(
+    db: AsyncSession,
+    org_id: UUID,
+    mode: str = "greedy",
+    time_budget_ms: Optional[int] = None,
+    dry_run: bool = False
+) -> dict:
     """
     Main entry point for auto-assigning resources.
     
     Args:
         db: Database session
         org_id: Current organization/portfolio ID
+        mode: "greedy" or "optimize"
+        time_budget_ms: Solver time budget for optimize mode
+        dry_run: Compute a proposal without writing anything
         
     Returns:
         Assignment results with gaps, shared assignments, and suggestions
     """
     service = ResourceAllocationService(db, org_id)
-    return await service.auto_assign_tasks()
+    return await service.auto_assign_tasks(mode, time_budget_ms, dry_run)
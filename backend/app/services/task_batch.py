@@ -0,0 +1,156 @@
+"""
+Task Batch Service
+
+Applies many task updates in one transaction, for editors (dashboard, Gantt)
+that produce bursts of single-task edits.
+
+All referenced tasks are read with one SELECT, valid updates are written with
+bulk UPDATEs, date changes are cascaded once for the whole batch and the
+results are reloaded with one query. Invalid items are reported per item and
+do not stop the rest of the batch.
+"""
+
+from collections import defaultdict
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+from app.models import Task
+from app.services.capacity_ledger import CapacityLedgerService, booking_snapshot
+from app.services.project_schedule import bump_schedule_versions
+from app.services.task_dependencies import DependencyCycleError, TaskDependencyService
+
+
+class TaskBatchService:
+    """Validates and applies a batch of task updates."""
+
+    def __init__(self, db: AsyncSession, org_id: UUID):
+        self.db = db
+        self.org_id = org_id
+        self.dependencies = TaskDependencyService(db)
+        self.ledger = CapacityLedgerService(db)
+
+    async def apply(self, items: list[dict]) -> dict:
+        """
+        Apply task updates; does not commit.
+
+        Args:
+            items: One dict per update with the task `id` and only the fields
+                to change
+
+        Returns:
+            Updated Task objects (in request order), per-item errors
+            ({'index', 'id', 'detail'}) and the tasks pushed by the cascade
+        """
+        ids = [item['id'] for item in items]
+        result = await self.db.execute(
+            select(
+                Task.id, Task.org_id, Task.project_id, Task.assignee_id, Task.estimate,
+                Task.start_date, Task.end_date, Task.predecessor_id
+            )
+            .where(Task.id.in_(ids), Task.org_id == self.org_id)
+        )
+        current = {row.id: row._asdict() for row in result.all()}
+
+        predecessor_ids = {item['predecessor_id'] for item in items if item.get('predecessor_id')}
+        known_predecessors = set()
+        if predecessor_ids:
+            result = await self.db.execute(
+                select(Task.id).where(Task.id.in_(predecessor_ids), Task.org_id == self.org_id)
+            )
+            known_predecessors = set(result.scalars().all())
+
+        errors = []
+        accepted = {}
+        seen = set()
+        for index, item in enumerate(items):
+            task_id = item['id']
+            fields = {k: v for k, v in item.items() if k != 'id'}
+            detail = None
+            if task_id in seen:
+                detail = "Task appears more than once in the batch"
+            elif task_id not in current:
+                detail = "Task not found"
+            elif fields.get('predecessor_id'):
+                detail = await self._link_predecessor(current[task_id], fields['predecessor_id'], known_predecessors)
+            seen.add(task_id)
+            if detail:
+                errors.append({'index': index, 'id': task_id, 'detail': detail})
+            else:
+                accepted[task_id] = fields
+
+        # One executemany per set of changed fields; new predecessors are
+        # already written, only their version bump is left
+        by_fields = defaultdict(list)
+        for task_id, fields in accepted.items():
+            if fields:
+                row = {k: v for k, v in fields.items() if k != 'predecessor_id' or v is None}
+                by_fields[tuple(sorted(row))].append({'id': task_id, **row})
+        for rows in by_fields.values():
+            await self.db.execute(update(Task).values(version=Task.version + 1), rows)
+
+        await self.ledger.record_changes([
+            (booking_snapshot(current[task_id]), booking_snapshot({**current[task_id], **fields}))
+            for task_id, fields in accepted.items()
+        ])
+
+        # Push successors after new dates, and tasks after new predecessors, in one cascade
+        roots = []
+        for task_id, fields in accepted.items():
+            project_id = current[task_id]['project_id']
+            if 'start_date' in fields or 'end_date' in fields:
+                roots.append((project_id, task_id))
+            if fields.get('predecessor_id'):
+                roots.append((project_id, fields['predecessor_id']))
+        cascaded = await self.dependencies.cascade_from_tasks(roots) if roots else []
+        await bump_schedule_versions(self.db, {current[task_id]['project_id'] for task_id in accepted})
+
+        tasks = []
+        if accepted:
+            result = await self.db.execute(
+                select(Task)
+                .where(Task.id.in_(accepted))
+                .options(selectinload(Task.market_statuses))
+                .execution_options(populate_existing=True)
+            )
+            loaded = {task.id: task for task in result.scalars().all()}
+            tasks = [loaded[task_id] for task_id in accepted]
+
+        return {'tasks': tasks, 'errors': errors, 'cascaded_tasks': cascaded}
+
+    async def _link_predecessor(self, task: dict, predecessor_id: UUID, known: set) -> Optional[str]:
+        """
+        Validate and write a new predecessor right away, so later items in the
+        batch are checked against it; the version is bumped with the task's
+        other fields. Returns an error message if rejected.
+        """
+        if predecessor_id not in known:
+            return "Predecessor not found"
+        try:
+            await self.dependencies.check_predecessor(task['id'], task['project_id'], predecessor_id)
+        except DependencyCycleError as e:
+            return str(e)
+
+        await self.db.execute(
+            update(Task).where(Task.id == task['id']).values(predecessor_id=predecessor_id)
+        )
+        # Later items of the project are then checked against this session's links
+        await bump_schedule_versions(self.db, [task['project_id']])
+        return None
+
+
+async def update_tasks_batch(db: AsyncSession, org_id: UUID, items: list[dict]) -> dict:
+    """
+    Main entry point for batch task updates.
+
+    Args:
+        db: Database session
+        org_id: Organization every task must belong to
+        items: Updates, each with the task `id` and the fields to change
+
+    Returns:
+        Batch results, see TaskBatchService.apply
+    """
+    service = TaskBatchService(db, org_id)
+    return await service.apply(items)
@@ -2,15 +2,85 @@
 Task Dependencies Service
 
 Handles cascading date resolution when task dates change.
-If a predecessor task's end date changes, dependent tasks are pushed forward.
+If a predecessor task's dates change, dependent tasks are pushed forward.
+
+Tasks can have many typed predecessors (FS/SS/FF/SF with lag, see
+dependency_graph); the legacy `Task.predecessor_id` still counts as a
+finish-to-start link. The cascade is set-based: the project's dependency graph
+is loaded up front, dates are propagated in topological order in memory, and
+every shifted task is written back with one bulk UPDATE, however long the chain.
+Shifts count working days of the project's calendar (see working_calendar).
 """
 
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date
 from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import Task
+from sqlalchemy import select, update, delete, literal, union_all
+from sqlalchemy.orm import aliased
+from app.models import Project, Task, TaskDependency
+from app.services.capacity_ledger import CapacityLedgerService, booking_snapshot
+from app.services.project_schedule import (
+    bump_schedule_versions, get_schedule_version, lock_project_links, schedule_changed
+)
+from app.services.working_calendar import get_project_calendar
+from app.services.dependency_graph import (
+    DependencyCycleError, DependencyGraphTooLargeError, dependency_edges, find_cycle, load_project_graph,
+    propagate_dates
+)
+
+# Upper bound on hops walked in either direction of a dependency closure
+MAX_DEPENDENCY_DEPTH = 10_000
+
+class PredecessorIndex:
+    """
+    Per-project map of task -> predecessors, used to reject cycles at write time.
+
+    Maps are loaded on first use and kept for the schedule version they were
+    loaded at (see project_schedule): every link change bumps the version, so
+    any worker reloads the map on its next check after the change commits.
+    Checking a new link then walks memory instead of the database.
+    """
+
+    def __init__(self):
+        self.projects: dict[UUID, tuple[int, dict[UUID, list[UUID]]]] = {}
+
+    def get(self, project_id: UUID, version: int) -> Optional[dict[UUID, list[UUID]]]:
+        entry = self.projects.get(project_id)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def load(self, project_id: UUID, version: int, parents: dict[UUID, list[UUID]]) -> None:
+        self.projects[project_id] = (version, parents)
+
+
+# Global index instance
+predecessor_index = PredecessorIndex()
+
+
+def project_finish(nodes: dict[UUID, dict]) -> Optional[date]:
+    """Latest task end of a loaded project graph (external tasks excluded)."""
+    return max(
+        (n['end_date'] or n['start_date'] for n in nodes.values()
+         if not n['external'] and (n['end_date'] or n['start_date'])),
+        default=None
+    )
+
+
+def describe_shift(node: dict) -> dict:
+    """Describe a task moved by a cascade."""
+    return {
+        'id': str(node['id']),
+        'title': node['title'],
+        'project_id': str(node['project_id']),
+        'change': 'cascaded',
+        'old_start': str(node['old_start']) if node['old_start'] else None,
+        'old_end': str(node['old_end']) if node['old_end'] else None,
+        'new_start': str(node['start_date']),
+        'new_end': str(node['end_date'])
+    }
 
 
 class TaskDependencyService:
@@ -18,10 +88,11 @@ class TaskDependencyService:
     
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.ledger = CapacityLedgerService(db)
     
     async def update_task_with_cascade(
-        self, 
-        task_id: UUID, 
+        self,
+        task_id: UUID,
         updates: dict,
         cascade_dates: bool = True
     ) -> dict:
@@ -43,19 +114,20 @@ class TaskDependencyService:
         if not task:
             raise ValueError(f"Task {task_id} not found")
         
-        # Track affected tasks
-        affected_tasks = [{'id': str(task_id), 'title': task.title, 'change': 'updated'}]
-        
         # Apply updates
+        before = booking_snapshot(task)
         for key, value in updates.items():
             if hasattr(task, key):
                 setattr(task, key, value)
+        await self.db.flush()
+        await self.ledger.record_change(before, booking_snapshot(task))
         
-        # If end_date changed, cascade to successors
-        if cascade_dates and 'end_date' in updates:
-            cascade_results = await self._resolve_dependencies(task)
-            affected_tasks.extend(cascade_results)
+        # If dates changed, cascade to successors
+        cascaded = []
+        if cascade_dates and ('start_date' in updates or 'end_date' in updates):
+            cascaded = await self.cascade_from(task)
         
+        await bump_schedule_versions(self.db, [task.project_id])
         await self.db.commit()
         
         return {
@@ -65,143 +137,480 @@ class TaskDependencyService:
                 'start_date': str(task.start_date) if task.start_date else None,
                 'end_date': str(task.end_date) if task.end_date else None
             },
-            'cascaded_tasks': affected_tasks[1:],
-            'total_affected': len(affected_tasks)
+            'cascaded_tasks': cascaded,
+            'total_affected': len(cascaded) + 1
         }
     
-    async def _resolve_dependencies(self, parent_task: Task) -> List[dict]:
+    async def cascade_from(self, task: Task) -> List[dict]:
         """
-        Recursively resolve task dependencies.
-        Push successor tasks when parent date changes.
+        Push the successors of a task after its (already applied) dates.
         
         Args:
-            parent_task: The task whose date changed
+            task: The task whose dates changed
             
         Returns:
-            List of affected tasks
+            List of affected tasks with old and new dates
+        """
+        return await self.cascade_from_tasks([(task.project_id, task.id)])
+    
+    async def propagate(
+        self,
+        roots: list[tuple[UUID, UUID]],
+        proposed: Optional[dict[UUID, dict]] = None
+    ) -> tuple[List[dict], dict[UUID, list]]:
         """
-        affected = []
+        Propagate date changes through the dependency graph, in memory only.
         
-        # Find tasks that depend on this task
-        result = await self.db.execute(
-            select(Task).where(Task.predecessor_id == parent_task.id)
-        )
-        successors = result.scalars().all()
+        Each project's graph is loaded once and propagated in one pass. When
+        shifted tasks have successors in other projects, those projects are
+        visited next with the shifted tasks as pinned external roots, until
+        nothing moves. Only reads from the database.
         
-        for successor in successors:
-            parent_end = parent_task.end_date
-            successor_start = successor.start_date
+        Args:
+            roots: (project_id, task_id) of every task whose dates changed
+            proposed: {task_id: {'start_date', 'end_date'}} to use instead of
+                the stored dates (e.g. for a preview)
             
-            # If parent ends on or after successor starts, push successor
-            if parent_end and successor_start and parent_end >= successor_start:
-                # Calculate duration of successor task
-                duration = (successor.end_date - successor.start_date) if successor.end_date and successor.start_date else timedelta(days=0)
-                
-                # New start is day after parent ends
-                new_start = parent_end + timedelta(days=1)
-                new_end = new_start + duration
-                
-                old_start = successor.start_date
-                old_end = successor.end_date
-                
-                successor.start_date = new_start
-                successor.end_date = new_end
+        Raises:
+            CalendarRangeError: If a task would be pushed past date.max
+            
+        Returns:
+            (shifted task nodes in propagation order,
+             {project_id: [finish before, finish after]} for every visited project)
+        """
+        edges = dependency_edges()
+        predecessor = aliased(Task)
+        successor = aliased(Task)
+        current = {task_id: dict(dates) for task_id, dates in (proposed or {}).items()}
+        graphs = {}
+        moved = {}
+        stored = {}
+        finishes = {}
+        pending = defaultdict(set)
+        for project_id, task_id in roots:
+            pending[project_id].add(task_id)
+        
+        # Links are acyclic, so this settles; the bound only guards bad data
+        visits = 0
+        while pending and visits < MAX_DEPENDENCY_DEPTH:
+            visits += 1
+            project_id, root_ids = pending.popitem()
+            if project_id not in graphs:
+                nodes, project_edges = await load_project_graph(self.db, project_id)
+                calendar = await get_project_calendar(self.db, project_id)
                 
-                affected.append({
-                    'id': str(successor.id),
-                    'title': successor.title,
-                    'change': 'cascaded',
-                    'old_start': str(old_start) if old_start else None,
-                    'old_end': str(old_end) if old_end else None,
-                    'new_start': str(new_start),
-                    'new_end': str(new_end)
-                })
+                # Links from this project's tasks into other projects
+                result = await self.db.execute(
+                    select(edges.c.predecessor_id, successor.project_id)
+                    .join(predecessor, predecessor.id == edges.c.predecessor_id)
+                    .join(successor, successor.id == edges.c.successor_id)
+                    .where(predecessor.project_id == project_id, successor.project_id != project_id)
+                )
+                outbound = defaultdict(set)
+                for predecessor_id, successor_project_id in result.all():
+                    outbound[predecessor_id].add(successor_project_id)
                 
-                # Recursively resolve for this successor
-                nested = await self._resolve_dependencies(successor)
-                affected.extend(nested)
+                graphs[project_id] = (nodes, project_edges, calendar, outbound)
+                finishes[project_id] = [project_finish(nodes), None]
+            nodes, project_edges, calendar, outbound = graphs[project_id]
+            # Changed tasks of this project push their successors elsewhere too
+            for node_id in root_ids:
+                for successor_project_id in outbound.get(node_id, ()):
+                    pending[successor_project_id].add(node_id)
+            for node_id, dates in current.items():
+                if node_id in nodes:
+                    nodes[node_id].update(dates)
+            
+            shifted = propagate_dates(nodes, project_edges, root_ids, calendar)
+            for node_id in shifted:
+                node = nodes[node_id]
+                current[node_id] = {'start_date': node['start_date'], 'end_date': node['end_date']}
+                # Report tasks moved on several visits against their stored dates
+                stored.setdefault(node_id, (node['old_start'], node['old_end']))
+                node['old_start'], node['old_end'] = stored[node_id]
+                moved[node_id] = node
+                for successor_project_id in outbound.get(node_id, ()):
+                    pending[successor_project_id].add(node_id)
+            finishes[project_id][1] = project_finish(nodes)
         
-        return affected
+        return list(moved.values()), finishes
     
-    async def get_dependency_chain(self, task_id: UUID) -> dict:
+    async def cascade_from_tasks(self, roots: list[tuple[UUID, UUID]]) -> List[dict]:
         """
-        Get the full dependency chain for a task.
+        Push the successors of many changed tasks, across projects, in one go.
+        
+        The changed tasks keep their dates. Dates are propagated in memory (see
+        `propagate`); all shifted tasks are written with a single bulk UPDATE
+        and the capacity ledger is moved along for assigned tasks. Flushes
+        pending changes first, does not commit.
         
         Args:
-            task_id: Task ID to get chain for
+            roots: (project_id, task_id) of every task whose dates changed
+            
+        Raises:
+            CalendarRangeError: If a task would be pushed past date.max
             
         Returns:
-            Dictionary with predecessors and successors chains
+            List of affected tasks with old and new dates
         """
-        result = await self.db.execute(select(Task).where(Task.id == task_id))
-        task = result.scalar_one_or_none()
+        await self.db.flush()
         
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
+        shifted, _ = await self.propagate(roots)
+        if not shifted:
+            return []
+        
+        await self.db.execute(
+            update(Task).values(version=Task.version + 1),
+            [{'id': n['id'], 'start_date': n['start_date'], 'end_date': n['end_date']} for n in shifted]
+        )
+        await bump_schedule_versions(self.db, {n['project_id'] for n in shifted})
+        await self.ledger.record_changes([
+            ({**n, 'start_date': n['old_start'], 'end_date': n['old_end']}, n)
+            for n in shifted
+            if n['assignee_id'] and n['estimate']
+        ])
+        
+        return [describe_shift(n) for n in shifted]
+    
+    async def preview_cascade(
+        self,
+        task: Task,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> dict:
+        """
+        Compute what moving a task to new dates would do, without writing.
         
-        predecessors = await self._get_predecessors_chain(task)
-        successors = await self._get_successors_chain(task)
+        Args:
+            task: Task to move
+            start_date: Proposed start (None keeps the current one)
+            end_date: Proposed end (None keeps the current one)
+            
+        Raises:
+            CalendarRangeError: If a task would be pushed past date.max
+            
+        Returns:
+            Affected tasks with old and new dates, and the projects whose
+            finish (latest task end) would change
+        """
+        proposed = {
+            'start_date': start_date or task.start_date,
+            'end_date': end_date or task.end_date
+        }
+        shifted, finishes = await self.propagate(
+            [(task.project_id, task.id)], {task.id: proposed}
+        )
+        
+        changed = {
+            project_id: (before, after)
+            for project_id, (before, after) in finishes.items()
+            if before != after
+        }
+        projects = {}
+        if changed:
+            result = await self.db.execute(
+                select(Project.id, Project.name, Project.end_date).where(Project.id.in_(changed))
+            )
+            projects = {row.id: row for row in result.all()}
         
         return {
-            'task': {'id': str(task.id), 'title': task.title},
-            'predecessors': predecessors,
-            'successors': successors
+            'task_id': task.id,
+            'start_date': proposed['start_date'],
+            'end_date': proposed['end_date'],
+            'affected_tasks': [describe_shift(n) for n in shifted],
+            'affected_task_count': len(shifted),
+            'affected_project_count': len({n['project_id'] for n in shifted}),
+            'project_changes': [
+                {
+                    'project_id': project_id,
+                    'name': projects[project_id].name,
+                    'end_date': projects[project_id].end_date,
+                    'old_finish': before,
+                    'new_finish': after,
+                    'slip_days': (after - before).days if before and after else None
+                }
+                for project_id, (before, after) in changed.items()
+                if project_id in projects
+            ]
         }
     
-    async def _get_predecessors_chain(self, task: Task) -> List[dict]:
-        """Get all predecessors recursively."""
-        chain = []
-        current = task
+    async def check_predecessor(
+        self,
+        task_id: UUID,
+        project_id: UUID,
+        predecessor_id: Optional[UUID]
+    ) -> None:
+        """
+        Reject a predecessor link that would create a dependency cycle.
         
-        while current.predecessor_id:
-            result = await self.db.execute(
-                select(Task).where(Task.id == current.predecessor_id)
+        Walks the project's predecessor index in memory (loading it when its
+        schedule version moved on, or from this session's own uncommitted
+        changes); ancestors in other projects are walked with a recursive CTE.
+        The walk in memory stops at MAX_DEPENDENCY_DEPTH ancestors, and a larger
+        graph is checked with the recursive CTE alone, MAX_DEPENDENCY_DEPTH
+        links deep.
+        
+        The projects of the task and the predecessor are locked first (see
+        lock_project_links) so concurrent link writers cannot both pass the
+        check and close a cycle together.
+        
+        Raises:
+            DependencyCycleError: If the link would close a cycle
+        """
+        if predecessor_id is None:
+            return
+        
+        result = await self.db.execute(select(Task.project_id).where(Task.id == predecessor_id))
+        await lock_project_links(self.db, {project_id, result.scalar_one_or_none() or project_id})
+        
+        version = None
+        parents = None
+        if not schedule_changed(self.db, project_id):
+            version = await get_schedule_version(self.db, project_id)
+            parents = predecessor_index.get(project_id, version)
+        if parents is None:
+            nodes, edges = await load_project_graph(self.db, project_id)
+            parents = {node_id: [] for node_id, node in nodes.items() if not node['external']}
+            for pred, succ, _, _ in edges:
+                if succ in parents:
+                    parents[succ].append(pred)
+            if version is not None:
+                predecessor_index.load(project_id, version, parents)
+        
+        try:
+            cycle, boundary, visited = find_cycle(parents, task_id, predecessor_id, MAX_DEPENDENCY_DEPTH)
+        except DependencyGraphTooLargeError:
+            cycle, boundary = await self._is_ancestor(task_id, [predecessor_id], MAX_DEPENDENCY_DEPTH), []
+        if not cycle and boundary:
+            # The graph continues in other projects
+            cycle = await self._is_ancestor(task_id, boundary, MAX_DEPENDENCY_DEPTH)
+        if cycle:
+            raise DependencyCycleError("Predecessor would create a dependency cycle")
+    
+    async def _is_ancestor(self, ancestor_id: UUID, task_ids: list[UUID], max_depth: int) -> bool:
+        """Check in the database whether a task is upstream of any of the given tasks."""
+        edges = dependency_edges()
+        chain = select(Task.id, literal(0).label('depth')).where(
+            Task.id.in_(task_ids)
+        ).cte('ancestors', recursive=True)
+        chain = chain.union(
+            select(edges.c.predecessor_id, chain.c.depth + 1).where(
+                edges.c.successor_id == chain.c.id, chain.c.depth < max_depth
             )
-            pred = result.scalar_one_or_none()
-            if not pred:
-                break
-            chain.append({
-                'id': str(pred.id),
-                'title': pred.title,
-                'end_date': str(pred.end_date) if pred.end_date else None
-            })
-            current = pred
-        
-        return chain
+        )
+        result = await self.db.execute(select(chain.c.id).where(chain.c.id == ancestor_id).limit(1))
+        return result.first() is not None
+    
+    async def add_dependency(
+        self,
+        successor: Task,
+        predecessor_id: UUID,
+        link_type: str = "FS",
+        lag_days: int = 0
+    ) -> tuple[TaskDependency, List[dict]]:
+        """
+        Link a task after a predecessor and push it (and its successors) to fit.
+        
+        Raises:
+            DependencyCycleError: If the link would close a cycle
+            
+        Returns:
+            The link and the tasks the cascade moved
+        """
+        await self.check_predecessor(successor.id, successor.project_id, predecessor_id)
+        
+        link = TaskDependency(
+            org_id=successor.org_id,
+            predecessor_id=predecessor_id,
+            successor_id=successor.id,
+            type=link_type,
+            lag_days=lag_days
+        )
+        self.db.add(link)
+        await self.db.flush()
+        
+        cascaded = await self.cascade_from_tasks([(successor.project_id, predecessor_id)])
+        await bump_schedule_versions(self.db, [successor.project_id])
+        return link, cascaded
     
-    async def _get_successors_chain(self, task: Task) -> List[dict]:
-        """Get all successors recursively (can branch)."""
-        chain = []
+    async def remove_dependency(self, successor: Task, predecessor_id: UUID) -> bool:
+        """
+        Remove every link from a predecessor to a task, typed or legacy.
         
+        Returns:
+            Whether anything was removed
+        """
         result = await self.db.execute(
-            select(Task).where(Task.predecessor_id == task.id)
+            delete(TaskDependency).where(
+                TaskDependency.predecessor_id == predecessor_id,
+                TaskDependency.successor_id == successor.id
+            )
         )
-        successors = result.scalars().all()
+        removed = result.rowcount > 0
+        if successor.predecessor_id == predecessor_id:
+            successor.predecessor_id = None
+            removed = True
         
-        for succ in successors:
-            chain.append({
-                'id': str(succ.id),
-                'title': succ.title,
-                'start_date': str(succ.start_date) if succ.start_date else None,
-                'successors': await self._get_successors_chain(succ)
-            })
+        if removed:
+            await self.db.flush()
+            await bump_schedule_versions(self.db, [successor.project_id])
+        return removed
+    
+    async def list_predecessors(self, task: Task) -> List[dict]:
+        """Direct predecessors of a task with link type and lag."""
+        edges = dependency_edges()
+        result = await self.db.execute(
+            select(edges.c.predecessor_id, edges.c.type, edges.c.lag_days, Task.title)
+            .join(Task, Task.id == edges.c.predecessor_id)
+            .where(edges.c.successor_id == task.id)
+        )
+        return [
+            {
+                'predecessor_id': row.predecessor_id,
+                'successor_id': task.id,
+                'predecessor_title': row.title,
+                'type': row.type,
+                'lag_days': row.lag_days
+            }
+            for row in result.all()
+        ]
+    
+    async def get_dependencies(
+        self,
+        task_id: UUID,
+        org_id: Optional[UUID] = None,
+        max_depth: Optional[int] = None
+    ) -> dict:
+        """
+        Get the full upstream and downstream closure of a task in one round trip.
         
-        return chain
+        Both directions are walked over every link by recursive CTEs in a single
+        statement (works on PostgreSQL and SQLite). Recursion stops at `max_depth`
+        hops, and UNION keeps at most one row per task, parent and depth, so a
+        cycle costs at most `max_depth` rounds instead of looping forever.
+        
+        Args:
+            task_id: Task to get the closure for
+            org_id: Restrict the walk to one organization
+            max_depth: Maximum number of hops in each direction
+            
+        Returns:
+            The task, its predecessors and successors (nearest first, with depth
+            and the task they were reached through), plus whether the walk was
+            truncated or came back to the task
+        """
+        max_depth = min(max_depth or MAX_DEPENDENCY_DEPTH, MAX_DEPENDENCY_DEPTH)
+        edges = dependency_edges()
+        
+        def walk(name: str, near, far):
+            anchor = select(
+                Task.id, literal(None, type_=Task.id.type).label('via'), literal(0).label('depth')
+            ).where(Task.id == task_id)
+            if org_id:
+                anchor = anchor.where(Task.org_id == org_id)
+            cte = anchor.cte(name, recursive=True)
+            cte = cte.union(
+                select(far, cte.c.id, cte.c.depth + 1).where(near == cte.c.id, cte.c.depth < max_depth)
+            )
+            query = select(
+                literal(name).label('direction'), cte.c.depth, cte.c.via,
+                Task.id, Task.title, Task.start_date, Task.end_date, Task.predecessor_id, Task.project_id
+            ).join(Task, Task.id == cte.c.id)
+            if org_id:
+                query = query.where(Task.org_id == org_id)
+            return query
+        
+        upstream = walk('upstream', edges.c.successor_id, edges.c.predecessor_id)
+        downstream = walk('downstream', edges.c.predecessor_id, edges.c.successor_id)
+        result = await self.db.execute(union_all(upstream, downstream))
+        
+        task = None
+        closure = {'upstream': {}, 'downstream': {}}
+        deepest = 0
+        cycle_detected = False
+        for row in result.all():
+            if row.depth == 0:
+                task = row
+                continue
+            deepest = max(deepest, row.depth)
+            if row.id == task_id:
+                cycle_detected = True
+                continue
+            seen = closure[row.direction]
+            if row.id not in seen or row.depth < seen[row.id].depth:
+                seen[row.id] = row
+        
+        if task is None:
+            raise ValueError(f"Task {task_id} not found")
+        
+        def describe(row) -> dict:
+            return {
+                'id': str(row.id),
+                'title': row.title,
+                'start_date': str(row.start_date) if row.start_date else None,
+                'end_date': str(row.end_date) if row.end_date else None,
+                'predecessor_id': str(row.predecessor_id) if row.predecessor_id else None,
+                'project_id': str(row.project_id),
+                'depth': row.depth,
+                'via': str(row.via) if row.via else None
+            }
+        
+        return {
+            'task': describe(task),
+            'predecessors': [describe(r) for r in sorted(closure['upstream'].values(), key=lambda r: r.depth)],
+            'successors': [describe(r) for r in sorted(closure['downstream'].values(), key=lambda r: r.depth)],
+            'max_depth': max_depth,
+            'truncated': deepest >= max_depth,
+            'cycle_detected': cycle_detected
+        }
+    
+    async def get_dependency_chain(self, task_id: UUID) -> dict:
+        """
+        Get the full dependency chain for a task.
+        
+        Args:
+            task_id: Task ID to get chain for
+            
+        Returns:
+            Dictionary with predecessors and successors chains
+        """
+        closure = await self.get_dependencies(task_id)
+        
+        # Nest successors under the task they were first reached through (can branch)
+        nodes = {closure['task']['id']: {'successors': []}}
+        for succ in closure['successors']:
+            nodes[succ['id']] = {
+                'id': succ['id'],
+                'title': succ['title'],
+                'start_date': succ['start_date'],
+                'successors': []
+            }
+        for succ in closure['successors']:
+            nodes[succ['via']]['successors'].append(nodes[succ['id']])
+        
+        return {
+            'task': {'id': closure['task']['id'], 'title': closure['task']['title']},
+            'predecessors': [
+                {'id': p['id'], 'title': p['title'], 'end_date': p['end_date']}
+                for p in closure['predecessors']
+            ],
+            'successors': nodes[closure['task']['id']]['successors']
+        }
 
 
 async def update_task_cascade(
-    db: AsyncSession, 
-    task_id: UUID, 
+    db: AsyncSession,
+    task_id: UUID,
     updates: dict
 ) -> dict:
     """
     Main entry point for updating a task with dependency cascade.
-    
+
     Args:
         db: Database session
         task_id: Task to update
         updates: Fields to update
-        
+
     Returns:
         Update results with cascade info
     """
@@ -0,0 +1,264 @@
+"""
+Working Calendar Service
+
+Per-organization working calendars: the org's work week plus public holidays,
+either org-wide or per Market. A project follows its org's calendar plus the
+holidays of every market it launches in.
+
+Calendars are compiled into a business-day index (in the spirit of NumPy's
+busday offsets): over a window of dates, `rank[d]` counts the working days
+before `d` and `days[i]` is the i-th working day. Converting a date to a
+working-day number and back is then one array lookup each way, so shifting a
+task by N working days is O(1) whatever N is. The window grows on demand.
+
+Every change to an org's work week or holidays bumps its calendar version in
+the same transaction. Compiled calendars are cached per worker under the
+version they were compiled at, so they go stale in every worker when the
+change commits.
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import Iterable, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, or_
+from app.models import Holiday, LaunchDetail, Market, Organization, Project
+
+# Monday..Sunday, "1" = working day
+DEFAULT_WORKWEEK = "1111100"
+
+# Days compiled either side of a date outside the current window
+WINDOW_PADDING_DAYS = 2 * 366
+
+# Largest window kept; dates further apart recompile instead of growing it
+MAX_WINDOW_DAYS = 50 * 366
+
+# Session.info key: organizations whose calendar the session has changed
+CHANGED_KEY = 'changed_calendars'
+
+MIN_ORDINAL = date.min.toordinal()
+MAX_ORDINAL = date.max.toordinal()
+
+
+class CalendarRangeError(ValueError):
+    """Raised when a working day falls outside the dates that can be represented."""
+
+
+def validate_workweek(workweek: str) -> str:
+    """Check a Monday..Sunday mask such as "1111100"."""
+    if len(workweek) != 7 or set(workweek) - {"0", "1"} or "1" not in workweek:
+        raise ValueError("workweek must be 7 characters of 0/1 (Monday first) with at least one working day")
+    return workweek
+
+
+class WorkingCalendar:
+    """
+    Business-day index over a work week and a set of holidays.
+
+    Working-day numbers are absolute (counted from date.min), so they stay
+    valid when the compiled window grows.
+    """
+
+    def __init__(self, workweek: str = DEFAULT_WORKWEEK, holidays: Iterable[date] = ()):
+        self.workweek = validate_workweek(workweek)
+        self.weekmask = tuple(c == "1" for c in workweek)
+        self.per_week = sum(self.weekmask)
+        # Only holidays on working weekdays change the count
+        self.holidays = sorted({
+            d.toordinal() for d in holidays if self.weekmask[d.weekday()]
+        })
+        self.holiday_set = frozenset(self.holidays)
+
+        self.first = 0
+        self.rank = array('l')
+        self.days = array('l')
+        self.days_offset = 0
+
+    @classmethod
+    def every_day(cls) -> "WorkingCalendar":
+        """Calendar where every day is a working day (plain date arithmetic)."""
+        return cls("1111111")
+
+    def is_working(self, day: date) -> bool:
+        return self.weekmask[day.weekday()] and day.toordinal() not in self.holiday_set
+
+    def _count_before(self, ordinal: int) -> int:
+        """Working days in [date.min, ordinal), computed without the window."""
+        weeks, rest = divmod(ordinal - 1, 7)  # ordinal 1 is a Monday
+        count = weeks * self.per_week + sum(self.weekmask[:rest])
+        return count - bisect_left(self.holidays, ordinal)
+
+    def _compile(self, first: int, last: int) -> None:
+        """Build rank/days over [first, last]; rank also holds the count up to last + 1."""
+        first = max(first, MIN_ORDINAL)
+        last = min(last, MAX_ORDINAL)
+        count = self._count_before(first)
+        weekmask, holidays = self.weekmask, self.holiday_set
+
+        rank = array('l')
+        days = array('l')
+        self.days_offset = count
+        weekday = (first - 1) % 7
+        for ordinal in range(first, last + 2):
+            rank.append(count)
+            if weekmask[weekday] and ordinal not in holidays:
+                days.append(ordinal)
+                count += 1
+            weekday = weekday + 1 if weekday < 6 else 0
+        self.first, self.rank, self.days = first, rank, days
+
+    def _cover(self, first: int, last: int) -> None:
+        """
+        Make sure rank covers [first, last], clamped to the representable dates.
+        The window grows geometrically, or is recompiled around the request if
+        merging would exceed MAX_WINDOW_DAYS.
+        """
+        first = max(first, MIN_ORDINAL)
+        last = min(last, MAX_ORDINAL)
+        end = self.first + len(self.rank) - 2
+        if self.rank and first >= self.first and last <= end:
+            return
+        span = WINDOW_PADDING_DAYS
+        if self.rank and max(last, end) - min(first, self.first) <= MAX_WINDOW_DAYS:
+            span = min(max(len(self.rank), span), MAX_WINDOW_DAYS)
+            first = min(first, self.first)
+            last = max(last, end)
+        self._compile(first - span, last + span)
+
+    def index(self, day: date) -> int:
+        """Working-day number of `day`, or of the next working day if it is off."""
+        offset = day.toordinal() - self.first
+        if not 0 <= offset < len(self.rank) - 1:
+            self._cover(offset + self.first, offset + self.first)
+            offset = day.toordinal() - self.first
+        return self.rank[offset]
+
+    def last_index(self, day: date) -> int:
+        """Working-day number of `day`, or of the previous working day if it is off."""
+        offset = day.toordinal() + 1 - self.first
+        if not 0 < offset < len(self.rank):
+            self._cover(day.toordinal(), day.toordinal())
+            offset = day.toordinal() + 1 - self.first
+        return self.rank[offset] - 1
+
+    def date_at(self, index: int) -> date:
+        """
+        The date of working day number `index`.
+
+        Raises:
+            CalendarRangeError: If the working day falls before date.min or after date.max
+        """
+        if not 0 <= index < self._count_before(MAX_ORDINAL + 1):
+            raise CalendarRangeError("Date is outside the supported range")
+        position = index - self.days_offset
+        while not 0 <= position < len(self.days):
+            # Estimate where the day falls from the work week and compile there
+            if position < 0:
+                target = self.first + position * 7 // self.per_week - 7
+            else:
+                target = self.first + len(self.rank) + (position - len(self.days)) * 7 // self.per_week + 7
+            self._cover(target, target)
+            position = index - self.days_offset
+        return date.fromordinal(self.days[position])
+
+    def add(self, day: date, working_days: int) -> date:
+        """Move `day` (rolled forward to a working day) by a number of working days."""
+        return self.date_at(self.index(day) + working_days)
+
+    def working_days_between(self, start: date, end: date) -> int:
+        """Working days in [start, end]."""
+        return max(self.last_index(end) - self.index(start) + 1, 0)
+
+
+class CalendarCache:
+    """In-process cache of compiled calendars keyed by (org, markets) and calendar version."""
+
+    def __init__(self):
+        self.entries: dict[tuple[UUID, frozenset], tuple[int, WorkingCalendar]] = {}
+
+    def get(self, org_id: UUID, markets: frozenset, version: int) -> Optional[WorkingCalendar]:
+        entry = self.entries.get((org_id, markets))
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, org_id: UUID, markets: frozenset, version: int, calendar: WorkingCalendar) -> None:
+        self.entries[(org_id, markets)] = (version, calendar)
+
+
+# Global cache instance
+calendar_cache = CalendarCache()
+
+
+async def bump_calendar_version(db: AsyncSession, org_id: UUID) -> None:
+    """Mark an organization's work week or holidays as changed. Does not commit."""
+    await db.execute(
+        update(Organization)
+        .where(Organization.id == org_id)
+        .values(calendar_version=Organization.calendar_version + 1)
+    )
+    db.info.setdefault(CHANGED_KEY, set()).add(org_id)
+
+
+async def get_org_calendar(
+    db: AsyncSession,
+    org_id: UUID,
+    markets: Iterable[str] = ()
+) -> WorkingCalendar:
+    """
+    Compiled calendar of an organization, including the holidays of `markets`.
+
+    Args:
+        db: Database session
+        org_id: Organization whose work week and holidays apply
+        markets: Market names whose public holidays also apply
+
+    Returns:
+        WorkingCalendar, cached unless this session changed the calendar
+    """
+    markets = frozenset(markets)
+    result = await db.execute(
+        select(Organization.workweek, Organization.calendar_version).where(Organization.id == org_id)
+    )
+    row = result.one_or_none()
+    workweek, version = row if row else (DEFAULT_WORKWEEK, 0)
+    # Uncommitted changes of this session stay out of the shared cache
+    cacheable = org_id not in db.info.get(CHANGED_KEY, ())
+    if cacheable:
+        calendar = calendar_cache.get(org_id, markets, version)
+        if calendar is not None:
+            return calendar
+
+    query = (
+        select(Holiday.day)
+        .outerjoin(Market, Market.id == Holiday.market_id)
+        .where(Holiday.org_id == org_id)
+    )
+    if markets:
+        query = query.where(or_(Holiday.market_id.is_(None), Market.name.in_(markets)))
+    else:
+        query = query.where(Holiday.market_id.is_(None))
+    result = await db.execute(query)
+
+    calendar = WorkingCalendar(workweek, result.scalars().all())
+    if cacheable:
+        calendar_cache.set(org_id, markets, version, calendar)
+    return calendar
+
+
+async def get_project_calendar(db: AsyncSession, project_id: UUID) -> WorkingCalendar:
+    """
+    Calendar a project's tasks are scheduled on: its org's work week plus
+    org-wide holidays and those of the markets it launches in.
+    """
+    result = await db.execute(select(Project.org_id).where(Project.id == project_id))
+    org_id = result.scalar_one_or_none()
+    if org_id is None:
+        return WorkingCalendar.every_day()
+
+    result = await db.execute(
+        select(LaunchDetail.market).where(LaunchDetail.project_id == project_id)
+    )
+    return await get_org_calendar(db, org_id, result.scalars().all())
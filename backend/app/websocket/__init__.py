@@ -1,59 +1,236 @@
 """WebSocket connection manager for real-time updates."""
 
+import asyncio
 import uuid
 import json
+import logging
 from typing import Any
 from fastapi import WebSocket
 
+from app.config import get_settings
+from app.websocket.bus import EventBus, create_event_bus
+from app.websocket.coalesce import EventCoalescer
+from app.websocket.connection import Connection, SLOW_CONSUMER_POLICIES
+from app.websocket.delta import entity_delta
+from app.websocket.replay import ReplayBuffer, RESYNC_REQUIRED
+
+logger = logging.getLogger(__name__)
+
 
 class ConnectionManager:
-    """Manages WebSocket connections, scoped by organization."""
+    """
+    Manages WebSocket connections, scoped by organization.
+    
+    Every connection has a bounded send queue drained by its own writer task
+    (see `Connection`): a broadcast serializes the message once and enqueues
+    it, so it never waits on a client. Clients that fall behind lose frames or
+    are evicted according to `slow_consumer_policy`.
+    
+    Broadcasts go through an event bus (see app.websocket.bus) so that every
+    worker with clients of the org delivers them, not just the one handling
+    the request. The worker subscribes to an org while it has clients in it.
     
-    def __init__(self):
-        # Map of org_id -> list of active connections
-        self.active_connections: dict[uuid.UUID, list[WebSocket]] = {}
+    With a coalescing window, broadcasts are first held per org, merged per
+    entity and published as one frame (see app.websocket.coalesce).
     
-    async def connect(self, websocket: WebSocket, org_id: uuid.UUID):
-        """Accept a new WebSocket connection and register it to an org."""
+    Broadcast frames carry the org's sequence number, and the last
+    `replay_buffer_size` of them are kept per org so a reconnecting client
+    gets what it missed (see app.websocket.replay). The worker keeps listening
+    to an org for `replay_retention` seconds after its last client leaves.
+    """
+    
+    def __init__(
+        self,
+        queue_size: int | None = None,
+        slow_consumer_policy: str | None = None,
+        send_timeout: float | None = None,
+        event_bus: str | None = None,
+        coalesce_window_ms: int | None = None,
+        replay_buffer_size: int | None = None,
+        replay_retention: float | None = None
+    ):
+        settings = get_settings()
+        self.bus: EventBus = create_event_bus(event_bus or settings.ws_event_bus, self.deliver, settings.database_url)
+        self.queue_size = queue_size or settings.ws_send_queue_size
+        self.slow_consumer_policy = slow_consumer_policy or settings.ws_slow_consumer_policy
+        self.send_timeout = send_timeout or settings.ws_send_timeout_seconds
+        if self.slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(
+                f"Unknown slow consumer policy {self.slow_consumer_policy!r}; "
+                f"use one of {', '.join(SLOW_CONSUMER_POLICIES)}"
+            )
+        if coalesce_window_ms is None:
+            coalesce_window_ms = settings.ws_coalesce_window_ms
+        self.coalescer: EventCoalescer | None = None
+        if coalesce_window_ms > 0:
+            self.coalescer = EventCoalescer(coalesce_window_ms / 1000, self._publish, SNAPSHOT_EVENTS)
+        self.replay_buffer_size = replay_buffer_size or settings.ws_replay_buffer_size
+        self.replay_retention = settings.ws_replay_retention_seconds if replay_retention is None else replay_retention
+        # Map of org_id -> active connections by socket
+        self.active_connections: dict[uuid.UUID, dict[WebSocket, Connection]] = {}
+        # Recent frames of every org this worker listens to, and the pending
+        # release of orgs without clients
+        self.streams: dict[uuid.UUID, ReplayBuffer] = {}
+        self.releases: dict[uuid.UUID, asyncio.TimerHandle] = {}
+        # Counters for metrics(); frames sent by closed connections are kept here
+        self.frames_dropped = 0
+        self.frames_sent_closed = 0
+        self.clients_evicted = 0
+        self.frames_replayed = 0
+        self.resyncs_sent = 0
+    
+    async def connect(self, websocket: WebSocket, org_id: uuid.UUID, since: int | None = None):
+        """
+        Accept a new WebSocket connection and register it to an org. With
+        `since`, the frames broadcast after that sequence number are replayed
+        first, or the client is told to resync.
+        """
         await websocket.accept()
-        if org_id not in self.active_connections:
-            self.active_connections[org_id] = []
-        self.active_connections[org_id].append(websocket)
+        release = self.releases.pop(org_id, None)
+        if release is not None:
+            release.cancel()
+        if org_id not in self.streams:
+            last = await self.bus.subscribe(org_id)
+            self.streams.setdefault(org_id, ReplayBuffer(self.replay_buffer_size, last))
+        connection = Connection(
+            websocket, self.queue_size, self.slow_consumer_policy, self.send_timeout,
+            on_close=lambda closed: self._forget(closed, org_id)
+        )
+        # No await from here on: no broadcast can land between the replay and
+        # the registration
+        self.active_connections.setdefault(org_id, {})[websocket] = connection
+        if since is not None:
+            self._replay(connection, org_id, since)
+    
+    def _replay(self, connection: Connection, org_id: uuid.UUID, since: int):
+        stream = self.streams[org_id]
+        frames = stream.since(since)
+        # More than fits in the send queue would be dropped: refetching is cheaper
+        if frames is None or len(frames) > self.queue_size:
+            self.resyncs_sent += 1
+            connection.offer(json.dumps({"type": RESYNC_REQUIRED, "payload": {"seq": stream.last}}))
+            return
+        for text in frames:
+            connection.offer(text)
+        self.frames_replayed += len(frames)
+    
+    def last_seq(self, org_id: uuid.UUID) -> int | None:
+        """Sequence number of the org's latest frame on this worker, if known."""
+        stream = self.streams.get(org_id)
+        return stream.last if stream else None
     
     def disconnect(self, websocket: WebSocket, org_id: uuid.UUID):
-        """Remove a WebSocket connection."""
+        """Remove a WebSocket connection and stop its writer."""
+        connection = self.active_connections.get(org_id, {}).get(websocket)
+        if connection:
+            connection.close()
+    
+    def _forget(self, connection: Connection, org_id: uuid.UUID):
+        connections = self.active_connections.get(org_id)
+        if connections is None or connections.get(connection.websocket) is not connection:
+            return
+        del connections[connection.websocket]
+        # Clean up empty org maps; keep buffering for clients that come back
+        if not connections:
+            del self.active_connections[org_id]
+            if self.replay_retention > 0:
+                self.releases[org_id] = asyncio.get_running_loop().call_later(
+                    self.replay_retention, self._release, org_id
+                )
+            else:
+                self._release(org_id)
+        self.frames_sent_closed += connection.sent
+        if connection.closing is not None:
+            self.clients_evicted += 1
+    
+    def _release(self, org_id: uuid.UUID):
+        """Stop listening to an org that has had no clients for the retention period."""
+        self.releases.pop(org_id, None)
         if org_id in self.active_connections:
-            if websocket in self.active_connections[org_id]:
-                self.active_connections[org_id].remove(websocket)
-            # Clean up empty org lists
-            if not self.active_connections[org_id]:
-                del self.active_connections[org_id]
+            return
+        self.streams.pop(org_id, None)
+        self.bus.unsubscribe(org_id)
     
     async def broadcast_to_org(self, org_id: uuid.UUID, message: dict[str, Any]):
-        """Broadcast a message to all connections in an organization."""
-        if org_id not in self.active_connections:
+        """Publish a message to all connections in an organization, on every worker."""
+        if self.coalescer is not None:
+            self.coalescer.add(org_id, message)
+        else:
+            await self._publish(org_id, json.dumps(message, default=str))
+    
+    async def _publish(self, org_id: uuid.UUID, message_str: str):
+        try:
+            await self.bus.publish(org_id, message_str)
+        except Exception:
+            # Other workers miss it, but this worker's clients still get it
+            logger.warning("Event bus publish failed; delivering locally only", exc_info=True)
+            # Unnumbered: clients resuming from before it have to resync
+            stream = self.streams.get(org_id)
+            if stream:
+                stream.break_continuity()
+            self._fan_out(org_id, message_str)
+    
+    def deliver(self, org_id: uuid.UUID, seq: int, message_str: str):
+        """Record a published message for replay and queue it for this worker's connections of the org."""
+        stream = self.streams.get(org_id)
+        if stream and not stream.add(seq, message_str):
+            return  # already delivered
+        self._fan_out(org_id, message_str)
+    
+    def _fan_out(self, org_id: uuid.UUID, message_str: str):
+        """Queue a message for this worker's connections of the org; never waits on a client."""
+        connections = self.active_connections.get(org_id)
+        if not connections:
             return
         
-        message_str = json.dumps(message, default=str)
-        disconnected = []
-        
-        for connection in self.active_connections[org_id]:
-            try:
-                await connection.send_text(message_str)
-            except Exception:
-                disconnected.append(connection)
-        
-        # Clean up failed connections
-        for conn in disconnected:
-            self.disconnect(conn, org_id)
+        for connection in list(connections.values()):
+            if not connection.offer(message_str):
+                self.frames_dropped += 1
     
-    async def send_personal_message(self, websocket: WebSocket, message: dict[str, Any]):
-        """Send a message to a specific connection."""
-        await websocket.send_text(json.dumps(message, default=str))
-
-
-# Global connection manager instance
-manager = ConnectionManager()
+    async def send_personal_message(self, websocket: WebSocket, message: dict[str, Any] | str):
+        """Queue a message (a dict, or text sent as is) for a specific connection."""
+        text = message if isinstance(message, str) else json.dumps(message, default=str)
+        for connections in self.active_connections.values():
+            connection = connections.get(websocket)
+            if connection:
+                if not connection.offer(text):
+                    self.frames_dropped += 1
+                return
+        await websocket.send_text(text)
+    
+    def metrics(self) -> dict[str, Any]:
+        """Connection counts, queue depths and dropped frames across all orgs."""
+        connections = [c for org in self.active_connections.values() for c in org.values()]
+        return {
+            "connections": len(connections),
+            "orgs": len(self.active_connections),
+            "queue_size": self.queue_size,
+            "slow_consumer_policy": self.slow_consumer_policy,
+            "queued_frames": sum(c.depth for c in connections),
+            "max_queue_depth": max((c.depth for c in connections), default=0),
+            "frames_sent": self.frames_sent_closed + sum(c.sent for c in connections),
+            "frames_dropped": self.frames_dropped,
+            "clients_evicted": self.clients_evicted,
+            "event_bus": type(self.bus).__name__,
+            # True when the PostgreSQL bus found LISTEN deaf (pooled connection)
+            "event_bus_local_only": getattr(self.bus, "local_only", None),
+            "coalesce_window_ms": self.coalescer.window * 1000 if self.coalescer else 0,
+            "events_coalesced": self.coalescer.events_merged if self.coalescer else 0,
+            "coalesced_frames": self.coalescer.frames_published if self.coalescer else 0,
+            "replay_buffers": len(self.streams),
+            "replay_buffer_size": self.replay_buffer_size,
+            "frames_replayed": self.frames_replayed,
+            "resyncs_sent": self.resyncs_sent,
+        }
+    
+    async def close(self):
+        """Publish held broadcasts and stop the event bus (application shutdown)."""
+        if self.coalescer is not None:
+            await self.coalescer.close()
+        for release in self.releases.values():
+            release.cancel()
+        self.releases.clear()
+        await self.bus.close()
 
 
 # Event types for real-time updates
@@ -61,9 +238,13 @@ class EventType:
     PROJECT_CREATED = "PROJECT_CREATED"
     PROJECT_UPDATED = "PROJECT_UPDATED"
     PROJECT_DELETED = "PROJECT_DELETED"
+    PROJECT_SHIFTED = "PROJECT_SHIFTED"
+    PROJECTS_DELETED = "PROJECTS_DELETED"
     TASK_CREATED = "TASK_CREATED"
     TASK_UPDATED = "TASK_UPDATED"
     TASK_DELETED = "TASK_DELETED"
+    TASKS_UPDATED = "TASKS_UPDATED"
+    TASKS_DELETED = "TASKS_DELETED"
     RESOURCE_CREATED = "RESOURCE_CREATED"
     RESOURCE_UPDATED = "RESOURCE_UPDATED"
     RESOURCE_DELETED = "RESOURCE_DELETED"
@@ -72,3 +253,17 @@ class EventType:
     INITIATIVE_DELETED = "INITIATIVE_DELETED"
     GATEWAY_UPDATED = "GATEWAY_UPDATED"
     TASKS_AUTO_ASSIGNED = "TASKS_AUTO_ASSIGNED"
+    CALENDAR_UPDATED = "CALENDAR_UPDATED"
+    # Several coalesced events: payload {"events": [...]}
+    BATCH = "BATCH"
+    # Sent instead of a replay when missed frames are gone: payload {"seq": ...}
+    RESYNC_REQUIRED = "RESYNC_REQUIRED"
+
+
+# Events whose payload is the whole entity: a later one replaces an earlier
+# one for the same entity in the coalescing window
+SNAPSHOT_EVENTS = (EventType.RESOURCE_UPDATED, EventType.INITIATIVE_UPDATED)
+
+
+# Global connection manager instance
+manager = ConnectionManager()
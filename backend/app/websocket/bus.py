@@ -0,0 +1,322 @@
+"""
+Event buses carrying org broadcasts between workers.
+
+`ConnectionManager.broadcast_to_org` publishes to the bus; every worker
+subscribed to the org receives the message and fans it out to its own
+clients. A worker subscribes to an org while it has clients of that org.
+
+The bus also numbers each org's messages: the sequence number is added as
+the first key of the JSON object, and clients resume from it after a
+reconnect (see app.websocket.replay).
+
+- InProcessEventBus: delivers straight back to this process (single worker,
+  tests).
+- PostgresEventBus: LISTEN/NOTIFY on the application database, one channel
+  per org, so any number of workers share events.
+
+LISTEN does not work through transaction-pooling proxies: it succeeds, but
+no notification ever arrives. "auto" therefore picks the in-process bus for
+pooled URLs, and the PostgreSQL bus checks that its listener receives before
+relying on it; either way a warning is logged and broadcasts only reach the
+publishing worker's clients.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+# Called with (org_id, sequence number, message text) for each message of a
+# subscribed org
+Deliver = Callable[[uuid.UUID, int, str], None]
+
+SEQ_PREFIX = '{"seq": '
+
+
+def with_seq(seq: int, text: str) -> str:
+    """The JSON object `text` with `seq` added as its first key."""
+    return f"{SEQ_PREFIX}{seq}, {text[1:]}"
+
+
+def seq_of(text: str) -> int:
+    """The sequence number of a message made by `with_seq`."""
+    return int(text[len(SEQ_PREFIX):text.index(",")])
+
+
+class EventBus(ABC):
+    """Publish/subscribe of serialized org messages."""
+
+    def __init__(self, deliver: Deliver):
+        self.deliver = deliver
+        self.orgs: set[uuid.UUID] = set()
+
+    @abstractmethod
+    async def publish(self, org_id: uuid.UUID, text: str) -> None:
+        """Number the message and deliver it to every worker subscribed to the org."""
+
+    async def subscribe(self, org_id: uuid.UUID) -> int | None:
+        """
+        Start receiving the org's messages (idempotent). Returns the org's last
+        sequence number, or None if it could not be read.
+        """
+        self.orgs.add(org_id)
+        return None
+
+    def unsubscribe(self, org_id: uuid.UUID) -> None:
+        """Stop receiving the org's messages; may finish in the background."""
+        self.orgs.discard(org_id)
+
+    async def close(self) -> None:
+        self.orgs.clear()
+
+
+class InProcessEventBus(EventBus):
+    """
+    Delivers published messages to this process only.
+
+    Sequence numbers start from the current time in milliseconds, so they keep
+    increasing across restarts and clients from before one resync.
+    """
+
+    def __init__(self, deliver: Deliver):
+        super().__init__(deliver)
+        self.seqs: dict[uuid.UUID, int] = {}
+
+    def _last(self, org_id: uuid.UUID) -> int:
+        return self.seqs.setdefault(org_id, time.time_ns() // 1_000_000)
+
+    async def publish(self, org_id: uuid.UUID, text: str) -> None:
+        seq = self.seqs[org_id] = self._last(org_id) + 1
+        if org_id in self.orgs:
+            self.deliver(org_id, seq, with_seq(seq, text))
+
+    async def subscribe(self, org_id: uuid.UUID) -> int | None:
+        await super().subscribe(org_id)
+        return self._last(org_id)
+
+
+class PostgresEventBus(EventBus):
+    """
+    LISTEN/NOTIFY on PostgreSQL, one channel per org.
+
+    One connection LISTENs for all subscribed orgs (reconnecting and
+    re-subscribing if it drops) and one publishes, so a worker's messages keep
+    their order. Each message increments the org's row in
+    `org_event_sequences` in the transaction that sends it: the row lock
+    orders publishers, so numbers are gapless and match delivery order on
+    every worker. NOTIFY payloads are limited to 8000 bytes; longer messages
+    are split into chunks sent in the same transaction, which PostgreSQL
+    delivers together and in order. Needs a direct connection:
+    transaction-pooling proxies (PgBouncer, pooled Neon endpoints) do not
+    support LISTEN. The first listening connection sends itself a probe
+    notification; if it does not arrive, messages are delivered to this
+    worker's subscribers only (still numbered in `org_event_sequences`).
+    """
+
+    CHUNK_BYTES = 7000
+    RECONNECT_SECONDS = 2.0
+    PROBE_SECONDS = 5.0
+
+    def __init__(self, deliver: Deliver, database_url: str):
+        super().__init__(deliver)
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.listening: set[uuid.UUID] = set()
+        self.listener = None
+        self.publisher = None
+        self.listen_lock = asyncio.Lock()
+        self.publish_lock = asyncio.Lock()
+        self.chunks: dict[str, list[str]] = {}
+        self.tasks: set[asyncio.Task] = set()
+        self.watchdog: asyncio.Task | None = None
+        # None until the listener has been probed
+        self.local_only: bool | None = None
+
+    @staticmethod
+    def channel(org_id: uuid.UUID) -> str:
+        return f"org_events_{org_id.hex}"
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self.dsn)
+
+    async def publish(self, org_id: uuid.UUID, text: str) -> None:
+        async with self.publish_lock:
+            if self.publisher is None or self.publisher.is_closed():
+                self.publisher = await self._connect()
+            async with self.publisher.transaction():
+                seq = await self.publisher.fetchval(
+                    "INSERT INTO org_event_sequences (org_id, seq) VALUES ($1, 1) "
+                    "ON CONFLICT (org_id) DO UPDATE SET seq = org_event_sequences.seq + 1 RETURNING seq",
+                    org_id
+                )
+                text = with_seq(seq, text)
+                if not self.local_only:
+                    await self._notify(self.channel(org_id), text)
+        if self.local_only and org_id in self.orgs:
+            self.deliver(org_id, seq, text)
+
+    async def _notify(self, channel: str, text: str) -> None:
+        """NOTIFY a message, in chunks if it is too long (publish lock and transaction held)."""
+        if len(text.encode()) <= self.CHUNK_BYTES:
+            await self.publisher.execute("SELECT pg_notify($1, $2)", channel, text)
+            return
+        parts = self._split(text)
+        message_id = uuid.uuid4().hex
+        for index, part in enumerate(parts):
+            await self.publisher.execute(
+                "SELECT pg_notify($1, $2)", channel, f"{message_id}:{index}:{len(parts)}:{part}"
+            )
+
+    def _split(self, text: str) -> list[str]:
+        """Pieces of at most CHUNK_BYTES UTF-8 bytes, cut between characters."""
+        data = text.encode()
+        parts = []
+        while data:
+            cut = min(self.CHUNK_BYTES, len(data))
+            while cut < len(data) and data[cut] & 0xC0 == 0x80:  # continuation byte
+                cut -= 1
+            parts.append(data[:cut].decode())
+            data = data[cut:]
+        return parts
+
+    async def subscribe(self, org_id: uuid.UUID) -> int | None:
+        await super().subscribe(org_id)
+        await self._sync(org_id)
+        # Read after LISTEN, so every later message is delivered
+        async with self.listen_lock:
+            if self.listener is None or self.listener.is_closed():
+                return None
+            try:
+                seq = await self.listener.fetchval("SELECT seq FROM org_event_sequences WHERE org_id = $1", org_id)
+            except Exception:
+                logger.warning("Reading the event sequence failed", exc_info=True)
+                return None
+        return seq or 0
+
+    def unsubscribe(self, org_id: uuid.UUID) -> None:
+        super().unsubscribe(org_id)
+        task = asyncio.create_task(self._sync(org_id))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _sync(self, org_id: uuid.UUID) -> None:
+        """LISTEN or UNLISTEN so the connection matches the wanted orgs."""
+        async with self.listen_lock:
+            try:
+                if self.listener is None or self.listener.is_closed():
+                    await self._reconnect()
+                elif org_id in self.orgs and org_id not in self.listening:
+                    await self.listener.add_listener(self.channel(org_id), self._on_notify)
+                    self.listening.add(org_id)
+                elif org_id not in self.orgs and org_id in self.listening:
+                    await self.listener.remove_listener(self.channel(org_id), self._on_notify)
+                    self.listening.discard(org_id)
+            except Exception:
+                logger.exception("Event bus LISTEN failed; retrying")
+        if self.watchdog is None:
+            self.watchdog = asyncio.create_task(self._watch())
+
+    async def _reconnect(self) -> None:
+        """Open the listening connection and LISTEN on every wanted org (lock held)."""
+        self.listening.clear()
+        self.chunks.clear()
+        self.listener = await self._connect()
+        if self.local_only is None:
+            await self._probe()
+        for org_id in list(self.orgs):
+            await self.listener.add_listener(self.channel(org_id), self._on_notify)
+            self.listening.add(org_id)
+
+    async def _probe(self) -> None:
+        """Check that the listening connection receives notifications (lock held)."""
+        channel = f"org_events_probe_{uuid.uuid4().hex}"
+        received = asyncio.Event()
+
+        def on_probe(connection, pid: int, channel: str, payload: str) -> None:
+            received.set()
+
+        await self.listener.add_listener(channel, on_probe)
+        try:
+            async with self.publish_lock:
+                if self.publisher is None or self.publisher.is_closed():
+                    self.publisher = await self._connect()
+                await self.publisher.execute("SELECT pg_notify($1, $2)", channel, "probe")
+            await asyncio.wait_for(received.wait(), self.PROBE_SECONDS)
+            self.local_only = False
+        except asyncio.TimeoutError:
+            self.local_only = True
+            logger.warning(
+                "Event bus LISTEN receives no notifications (is DATABASE_URL a transaction-pooling "
+                "proxy?); broadcasts only reach this worker's clients. Use a direct connection URL "
+                "to share them across workers."
+            )
+        finally:
+            await self.listener.remove_listener(channel, on_probe)
+
+    async def _watch(self) -> None:
+        """Reconnect the listening connection when it drops."""
+        while True:
+            await asyncio.sleep(self.RECONNECT_SECONDS)
+            if self.orgs and (self.listener is None or self.listener.is_closed()):
+                async with self.listen_lock:
+                    try:
+                        await self._reconnect()
+                    except Exception:
+                        logger.warning("Event bus listener reconnect failed", exc_info=True)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        org_id = uuid.UUID(channel.rsplit("_", 1)[1])
+        if not payload.startswith("{"):
+            # A chunk: "<message id>:<index>:<count>:<text>"
+            message_id, _, count, part = payload.split(":", 3)
+            parts = self.chunks.setdefault(message_id, [])
+            parts.append(part)
+            if len(parts) < int(count):
+                return
+            payload = "".join(self.chunks.pop(message_id))
+        self.deliver(org_id, seq_of(payload), payload)
+
+    async def close(self) -> None:
+        await super().close()
+        if self.watchdog is not None:
+            self.watchdog.cancel()
+        for connection in (self.listener, self.publisher):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        self.listening.clear()
+
+
+def is_pooled(database_url: str) -> bool:
+    """Whether a URL points at a transaction-pooling proxy (pooled Neon endpoint, PgBouncer)."""
+    url = make_url(database_url)
+    return "-pooler" in (url.host or "") or url.port == 6432 or url.query.get("pgbouncer") == "true"
+
+
+def create_event_bus(kind: str, deliver: Deliver, database_url: str) -> EventBus:
+    """
+    The bus named by the `ws_event_bus` setting; "auto" uses PostgreSQL when
+    the database is PostgreSQL and reached directly, not through a pooler.
+    """
+    if kind == "auto":
+        kind = "memory"
+        if make_url(database_url).get_backend_name() == "postgresql":
+            if is_pooled(database_url):
+                logger.warning(
+                    "DATABASE_URL goes through a connection pooler, which does not support LISTEN; "
+                    "broadcasts only reach the publishing worker's clients. Use a direct connection "
+                    "URL to share them across workers."
+                )
+            else:
+                kind = "postgres"
+    if kind == "memory":
+        return InProcessEventBus(deliver)
+    if kind == "postgres":
+        return PostgresEventBus(deliver, database_url)
+    raise ValueError(f"Unknown event bus {kind!r}; use auto, memory or postgres")
@@ -0,0 +1,135 @@
+"""
+Coalescing of bursty org broadcasts.
+
+Broadcasts for an org are held for a short window (`ws_coalesce_window_ms`)
+from the first one, then published together: as the event itself if only one
+is left, otherwise as one frame
+
+    {"type": "BATCH", "payload": {"events": [...]}}
+
+Repeated updates to the same entity (the payload `id`) are merged while they
+wait:
+
+- two delta events of the same type where the second starts at the version
+  the first ends on become one delta with both patches;
+- a later event of a snapshot type (the payload is the entity) or an
+  identical event replaces the earlier one.
+
+A merged event moves to the position of the later one, and nothing is merged
+across another event of the same entity, so each entity's events keep their
+order. Events without an `id` are never merged.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Collection
+
+logger = logging.getLogger(__name__)
+
+# Frame carrying several coalesced events
+BATCH = "BATCH"
+
+# Called with (org_id, frame text) when a window closes
+Publish = Callable[[uuid.UUID, str], Awaitable[None]]
+
+
+class _Pending:
+    """Events of one org waiting for the window to close, in order."""
+
+    def __init__(self):
+        self.events: dict[int, dict[str, Any]] = {}
+        # Entity id -> key of its last event in `events`
+        self.last: dict[str, int] = {}
+        self.next_key = 0
+        self.received = 0
+
+
+class EventCoalescer:
+    """Per-org window that merges and batches broadcasts before publishing."""
+
+    def __init__(self, window: float, publish: Publish, snapshot_types: Collection[str] = ()):
+        self.window = window
+        self.publish = publish
+        self.snapshot_types = frozenset(snapshot_types)
+        self.pending: dict[uuid.UUID, _Pending] = {}
+        self.timers: dict[uuid.UUID, asyncio.Task] = {}
+        self.events_received = 0
+        self.events_merged = 0
+        self.frames_published = 0
+
+    def add(self, org_id: uuid.UUID, message: dict[str, Any]) -> None:
+        """Hold a message until the org's window closes; never waits."""
+        pending = self.pending.get(org_id)
+        if pending is None:
+            pending = self.pending[org_id] = _Pending()
+            self.timers[org_id] = asyncio.create_task(self._flush_later(org_id))
+        pending.received += 1
+        self.events_received += 1
+
+        payload = message.get("payload")
+        entity = payload.get("id") if isinstance(payload, dict) else None
+        if entity is not None:
+            entity = str(entity)
+            key = pending.last.get(entity)
+            if key is not None:
+                merged = self._merge(pending.events[key], message)
+                if merged is not None:
+                    del pending.events[key]
+                    message = merged
+                    self.events_merged += 1
+
+        key = pending.next_key
+        pending.next_key += 1
+        pending.events[key] = message
+        if entity is not None:
+            pending.last[entity] = key
+
+    def _merge(self, earlier: dict[str, Any], later: dict[str, Any]) -> dict[str, Any] | None:
+        """One event equivalent to `earlier` then `later`, or None if they must stay apart."""
+        if earlier.get("type") != later.get("type"):
+            return None
+        before, after = earlier["payload"], later["payload"]
+        if "patch" in before and "patch" in after:
+            if after.get("base_version") != before.get("version"):
+                return None  # a change in between was not sent as a delta
+            payload = {**before, **after}
+            payload["base_version"] = before["base_version"]
+            payload["patch"] = before["patch"] + after["patch"]
+            for name, value in after.items():
+                if isinstance(value, list) and isinstance(before.get(name), list) and name != "patch":
+                    payload[name] = before[name] + value
+            return {**later, "payload": payload}
+        if later["type"] in self.snapshot_types or before == after:
+            return later
+        return None
+
+    async def _flush_later(self, org_id: uuid.UUID) -> None:
+        await asyncio.sleep(self.window)
+        await self.flush(org_id)
+
+    async def flush(self, org_id: uuid.UUID) -> None:
+        """Publish the org's held events now."""
+        self.timers.pop(org_id, None)
+        pending = self.pending.pop(org_id, None)
+        if pending is None:
+            return
+        events = list(pending.events.values())
+        if len(events) == 1:
+            frame = events[0]
+        else:
+            frame = {"type": BATCH, "payload": {"events": events}}
+        self.frames_published += 1
+        try:
+            await self.publish(org_id, json.dumps(frame, default=str))
+        except Exception:
+            logger.exception("Publishing %d coalesced events failed", pending.received)
+
+    async def close(self) -> None:
+        """Publish everything still held (application shutdown)."""
+        for org_id, timer in list(self.timers.items()):
+            if timer is not asyncio.current_task():
+                timer.cancel()
+        for org_id in list(self.pending):
+            await self.flush(org_id)
@@ -0,0 +1,107 @@
+"""One WebSocket client: a bounded send queue drained by its own writer task."""
+
+import asyncio
+from typing import Callable
+
+from fastapi import WebSocket
+
+# What to do with a frame for a client whose queue is full
+DROP_OLDEST = "drop_oldest"  # discard the oldest queued frame to make room
+DROP_NEWEST = "drop_newest"  # discard the new frame
+DISCONNECT = "disconnect"  # evict the slow client; it reconnects and refetches
+SLOW_CONSUMER_POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT)
+
+# Close code sent to evicted clients ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class Connection:
+    """
+    A client socket with its own send queue.
+
+    `offer` never waits: broadcasts enqueue and return, and the writer task
+    sends frames in order at the client's pace. A send that takes longer than
+    `send_timeout` evicts the client; one that fails (the client left) closes
+    the connection. Either way `on_close` is called.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        queue_size: int,
+        policy: str,
+        send_timeout: float,
+        on_close: Callable[["Connection"], None]
+    ):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.on_close = on_close
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.closing: asyncio.Task | None = None
+        self.writer = asyncio.create_task(self._write())
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be sent."""
+        return self.queue.qsize()
+
+    def offer(self, text: str) -> bool:
+        """
+        Queue a frame without waiting. Returns False if a frame was dropped or
+        the client was evicted because its queue is full.
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.policy == DISCONNECT:
+            self.close(SLOW_CONSUMER_CLOSE_CODE, "Too slow to keep up with updates")
+            return False
+        self.dropped += 1
+        if self.policy == DROP_OLDEST:
+            self.queue.get_nowait()
+            self.queue.put_nowait(text)
+        return False
+
+    def close(self, code: int | None = None, reason: str = "") -> None:
+        """
+        Stop the writer and drop queued frames. With `code`, the socket is
+        also closed (server-side eviction); otherwise the client already left.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.writer is not asyncio.current_task():
+            self.writer.cancel()
+        if code is not None:
+            self.closing = asyncio.create_task(self._close_socket(code, reason))
+        self.on_close(self)
+
+    async def _close_socket(self, code: int, reason: str) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code, reason=reason), self.send_timeout)
+        except Exception:
+            pass  # the socket is already gone
+
+    async def _write(self) -> None:
+        while True:
+            text = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(text), self.send_timeout)
+            except asyncio.TimeoutError:
+                # Stalled past the timeout
+                self.close(SLOW_CONSUMER_CLOSE_CODE, "Send timed out")
+                return
+            except Exception:
+                # Disconnected
+                self.close()
+                return
+            self.sent += 1
@@ -0,0 +1,73 @@
+"""
+Delta-encoded entity events.
+
+Update events carry a JSON Patch (RFC 6902 subset: add, remove, replace)
+between two serialized versions of an entity instead of the whole entity:
+
+    {"id": ..., "version": 8, "base_version": 7, "patch": [
+        {"op": "replace", "path": "/status", "value": "Active"},
+        {"op": "add", "path": "/launch_details/0/input_gateways/1/versions/-", "value": {...}}
+    ]}
+
+A client whose copy is at `base_version` applies the patch and moves to
+`version`; any other client missed a change and refetches the entity.
+"""
+
+from typing import Any
+
+
+def _pointer(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def diff(before: Any, after: Any, path: str = "") -> list[dict]:
+    """
+    Patch turning `before` into `after` (both JSON-ready values). Objects are
+    compared key by key and lists index by index; a changed scalar, or a value
+    changing type, is replaced whole.
+    """
+    if isinstance(before, dict) and isinstance(after, dict):
+        ops = []
+        for key, value in after.items():
+            child = f"{path}/{_pointer(key)}"
+            if key not in before:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(before[key], value, child))
+        for key in before:
+            if key not in after:
+                ops.append({"op": "remove", "path": f"{path}/{_pointer(key)}"})
+        return ops
+
+    if isinstance(before, list) and isinstance(after, list):
+        ops = []
+        for index, (old, new) in enumerate(zip(before, after)):
+            ops.extend(diff(old, new, f"{path}/{index}"))
+        for value in after[len(before):]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+        # Remove from the end so earlier indexes stay valid
+        for index in range(len(before) - 1, len(after) - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{index}"})
+        return ops
+
+    if before == after and type(before) is type(after):
+        return []
+    return [{"op": "replace", "path": path, "value": after}]
+
+
+def entity_delta(before: dict, after: dict, **extra: Any) -> dict:
+    """
+    Event payload for an entity that changed from `before` to `after`
+    (`model_dump(mode="json")` of its read schema, with `id` and `version`).
+    """
+    patch = diff(
+        {k: v for k, v in before.items() if k != "version"},
+        {k: v for k, v in after.items() if k != "version"}
+    )
+    return {
+        "id": after["id"],
+        "version": after["version"],
+        "base_version": before["version"],
+        "patch": patch,
+        **extra
+    }
@@ -0,0 +1,62 @@
+"""
+Replay of recently broadcast frames for reconnecting clients.
+
+Every frame broadcast to an org carries the org's sequence number:
+
+    {"seq": 1042, "type": "TASK_UPDATED", "payload": {...}}
+
+Numbers increase by one per frame. A client remembers the last one it saw
+and reconnects with `/ws?since=<seq>`; the worker replays the newer frames
+from its buffer, or sends
+
+    {"type": "RESYNC_REQUIRED", "payload": {"seq": 1042}}
+
+if some of them are no longer there (evicted, or missed while the worker was
+not listening). The client then refetches and continues from `seq`.
+"""
+
+from collections import deque
+
+RESYNC_REQUIRED = "RESYNC_REQUIRED"
+
+
+class ReplayBuffer:
+    """
+    The last `size` frames of one org, with their sequence numbers.
+
+    `floor` is the oldest position a client can resume from: every frame after
+    it is in the buffer. A jump in the numbers (frames this worker never
+    received) empties the buffer and moves the floor past the gap.
+    """
+
+    def __init__(self, size: int, last: int | None):
+        self.frames: deque[tuple[int, str]] = deque(maxlen=size)
+        # Sequence number of the newest frame (or the stream position when
+        # the buffer was created); None until known
+        self.last = last
+        self.floor = last
+
+    def add(self, seq: int, text: str) -> bool:
+        """Record a frame. Returns False for a frame already recorded."""
+        if self.last is not None and seq <= self.last:
+            return False
+        if self.last is None or seq != self.last + 1:
+            self.frames.clear()
+            self.floor = seq - 1
+        if len(self.frames) == self.frames.maxlen:
+            self.floor = self.frames[0][0]
+        self.frames.append((seq, text))
+        self.last = seq
+        return True
+
+    def break_continuity(self) -> None:
+        """A frame went out without a number; no earlier position can be resumed."""
+        if self.last is not None:
+            self.frames.clear()
+            self.floor = self.last + 1
+
+    def since(self, seq: int) -> list[str] | None:
+        """Frames after `seq`, or None if the client must resync."""
+        if self.floor is None or seq < self.floor or seq > self.last:
+            return None
+        return [text for number, text in self.frames if number > seq]
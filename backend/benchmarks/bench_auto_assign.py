@@ -0,0 +1,102 @@
+"""
+Benchmark for the in-memory auto-assign tiers.
+
+Builds a synthetic portfolio (users spread over teams, some shared from other
+orgs) and times ResourceAllocationService.allocate against the candidate index
+at increasing sizes, up to 50k tasks x 5k users, in greedy and optimize mode.
+No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auto_assign
+"""
+
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.services.capacity_ledger import bucket_capacity, spread_hours
+from app.services.candidate_index import CandidateIndex, PRIMARY, SHARED
+from app.services.resource_allocation import ResourceAllocationService
+
+TEAMS = ["Website", "Configurator", "Asset Production", "CRM", "Analytics"]
+PERIOD = "month"
+SIZES = [(1_000, 100), (10_000, 1_000), (50_000, 5_000)]
+TIME_BUDGET_MS = 10000
+
+
+def build_index(org_id: uuid.UUID, users: int, rng: random.Random) -> CandidateIndex:
+    """Build an index where ~20% of users are shared from other orgs."""
+    index = CandidateIndex()
+    for i in range(users):
+        shared = rng.random() < 0.2
+        allocation = rng.choice([50, 60, 80]) if shared else 100
+        capacity = 160
+        index.add(
+            user_id=uuid.uuid4(),
+            name=f"User {i}",
+            team=rng.choice(TEAMS),
+            org_id=uuid.uuid4() if shared else org_id,
+            tier=SHARED if shared else PRIMARY,
+            capacity=capacity,
+            allocation=allocation,
+            bucket_capacity=bucket_capacity(capacity, PERIOD) * (100 - allocation if shared else allocation) / 100,
+            cost_rate=rng.choice([45.0, 60.0, 75.0, 90.0]),
+        )
+    return index
+
+
+def build_tasks(count: int, rng: random.Random) -> list[dict]:
+    """Build unassigned tasks over one quarter, enough to oversubscribe capacity."""
+    base = date(2026, 1, 1)
+    tasks = []
+    for i in range(count):
+        start = base + timedelta(days=rng.randrange(90))
+        end = start + timedelta(days=rng.randrange(1, 10))
+        estimate = rng.choice([8, 24, 40, 80, 120])
+        tasks.append({
+            'id': uuid.uuid4(),
+            'title': f"Task {i}",
+            'estimate': estimate,
+            'start_date': start,
+            'end_date': end,
+            'demand': spread_hours(estimate, start, end, PERIOD),
+            'project_name': f"Project {i % 500}",
+            'required_team': rng.choice(TEAMS),
+            'assignee_id': None,
+        })
+    # The service loads unassigned tasks ordered by start date
+    tasks.sort(key=lambda t: t['start_date'])
+    return tasks
+
+
+def run(task_count: int, user_count: int, mode: str) -> None:
+    rng = random.Random(42)
+    org_id = uuid.uuid4()
+    service = ResourceAllocationService(None, org_id)
+
+    started = time.perf_counter()
+    index = build_index(org_id, user_count, rng)
+    tasks = build_tasks(task_count, rng)
+    setup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = service.allocate(tasks, index, mode, TIME_BUDGET_MS)
+    elapsed = time.perf_counter() - started
+
+    summary = result['summary']
+    solver = result['solver']
+    print(
+        f"{mode:>8} {task_count:>7} tasks x {user_count:>5} users: "
+        f"allocate {elapsed * 1000:8.1f} ms "
+        f"({elapsed / task_count * 1e6:6.1f} us/task), setup {setup * 1000:7.1f} ms, "
+        f"assigned {summary['assigned']}, shared {summary['used_shared_resources']}, "
+        f"gaps {summary['unassigned']}, objective {solver['objective']:.0f}, "
+        f"iterations {solver['iterations']}"
+    )
+
+
+if __name__ == "__main__":
+    for task_count, user_count in SIZES:
+        for mode in ("greedy", "optimize"):
+            run(task_count, user_count, mode)
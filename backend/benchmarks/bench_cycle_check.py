@@ -0,0 +1,85 @@
+"""
+Benchmark for write-time predecessor cycle detection.
+
+Builds synthetic projects (short chains with fan-in plus one long chain) and
+times find_cycle over the in-memory predecessor index for the worst case: linking the
+head of the longest chain after its own tail, which walks the whole chain. Also
+times a best case (a short chain) and building the index from rows. No database
+is needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cycle_check
+"""
+
+import random
+import time
+import uuid
+
+from app.services.task_dependencies import MAX_DEPENDENCY_DEPTH, PredecessorIndex, find_cycle
+
+# (tasks in project, length of the longest chain)
+SIZES = [(1_000, 100), (10_000, 1_000), (100_000, 9_999)]
+REPEAT = 200
+
+
+def build_parents(task_count: int, longest: int, rng: random.Random) -> tuple[dict, list]:
+    """
+    Build task -> predecessors rows: one long chain, the rest in chains of 1-20
+    where every other task also waits on a random earlier task (fan-in).
+    """
+    parents = {}
+    chain = []
+    previous = None
+    for _ in range(longest):
+        task_id = uuid.uuid4()
+        parents[task_id] = [previous] if previous else []
+        chain.append(task_id)
+        previous = task_id
+
+    earlier = list(chain)
+    while len(parents) < task_count:
+        previous = None
+        for _ in range(min(rng.randint(1, 20), task_count - len(parents))):
+            task_id = uuid.uuid4()
+            parents[task_id] = [previous] if previous else []
+            if rng.random() < 0.5:
+                parents[task_id].append(rng.choice(earlier))
+            previous = task_id
+            earlier.append(task_id)
+    return parents, chain
+
+
+def timed(fn, repeat: int = REPEAT) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def run(task_count: int, longest: int) -> None:
+    rng = random.Random(42)
+    parents, chain = build_parents(task_count, longest, rng)
+    rows = list(parents.items())
+    project_id = uuid.uuid4()
+    index = PredecessorIndex()
+
+    load = timed(lambda: index.load(project_id, 1, {k: list(v) for k, v in rows}), repeat=5)
+    indexed = index.get(project_id, 1)
+
+    head, tail = chain[0], chain[-1]
+    worst = timed(lambda: find_cycle(indexed, head, tail, MAX_DEPENDENCY_DEPTH))
+    assert find_cycle(indexed, head, tail, MAX_DEPENDENCY_DEPTH)[0]
+
+    task_id = rng.choice(list(parents))
+    best = timed(lambda: find_cycle(indexed, task_id, head, MAX_DEPENDENCY_DEPTH))
+
+    print(
+        f"{task_count:>7} tasks, longest chain {longest:>5}: "
+        f"worst check {worst * 1e6:8.1f} us ({worst / longest * 1e9:5.1f} ns/ancestor), "
+        f"short check {best * 1e6:6.2f} us, index load {load * 1000:7.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for task_count, longest in SIZES:
+        run(task_count, longest)
@@ -0,0 +1,141 @@
+"""
+Benchmark for project reads: ORM path vs JSON assembled in the database.
+
+Seeds projects with launch details, gateways and versions, then times a full
+list page and a single-project read both ways: loading ORM objects and
+serializing them as the router does (ProjectView.dump + FastAPI's JSON
+encoding), and fetching the documents built by `project_documents`. Each
+response body is checked to be byte-identical between the two paths.
+
+Uses a temporary SQLite file by default; pass --url to run it against a
+scratch PostgreSQL database (tables are created and seeded in it).
+
+Usage (from backend/):
+    python -m benchmarks.bench_project_json
+    python -m benchmarks.bench_project_json --url postgresql+asyncpg://.../scratch
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.database import Base
+from app.models import Organization, Project, LaunchDetail, InputGateway, GatewayVersion
+from app.pagination import MAX_PAGE_SIZE
+from app.routers.projects import ProjectView
+from app.services.project_json import project_documents, json_array
+
+PROJECTS = MAX_PAGE_SIZE
+MARKETS = ["Global", "UK", "DE", "FR"]
+GATEWAYS_PER_LAUNCH = 3
+VERSIONS_PER_GATEWAY = 3
+REPEAT = 10
+
+
+def seed_rows() -> tuple[list[tuple], uuid.UUID]:
+    """Rows to insert, in foreign-key order, and the organization id."""
+    now = datetime(2026, 1, 1, 9, 30)
+    org_id = uuid.uuid4()
+    projects, launches, gateways, versions = [], [], [], []
+    for p in range(PROJECTS):
+        project_id = uuid.uuid4()
+        start = date(2026, 1, 5) + timedelta(days=p % 300)
+        projects.append({
+            'id': project_id, 'org_id': org_id, 'name': f"Project {p}", 'status': "Active", 'health': "On Track",
+            'type': "Website", 'scale': "Large", 'start_date': start, 'end_date': start + timedelta(days=90),
+            'original_end_date': start + timedelta(days=90), 'created_at': now + timedelta(minutes=p, microseconds=p)
+        })
+        for market in MARKETS:
+            launch_id = uuid.uuid4()
+            launches.append({'id': launch_id, 'project_id': project_id, 'market': market, 'goal_live': start})
+            for g in range(GATEWAYS_PER_LAUNCH):
+                gateway_id = uuid.uuid4()
+                gateways.append({
+                    'id': gateway_id, 'launch_detail_id': launch_id, 'name': f"Gateway {g}", 'status': "Received",
+                    'expected_date': start + timedelta(days=7 * g), 'received_date': start + timedelta(days=7 * g + 1)
+                })
+                for v in range(VERSIONS_PER_GATEWAY):
+                    versions.append({
+                        'id': uuid.uuid4(), 'gateway_id': gateway_id, 'version_number': v + 1, 'status': "Received",
+                        'date': start + timedelta(days=v), 'notes': f"Revision {v + 1}", 'is_on_time': v % 2 == 0,
+                        'created_at': now
+                    })
+    org = {'id': org_id, 'name': "Benchmark", 'slug': "benchmark", 'created_at': now}
+    ordered = [(Organization, [org]), (Project, projects), (LaunchDetail, launches), (InputGateway, gateways),
+               (GatewayVersion, versions)]
+    return ordered, org_id
+
+
+async def orm_body(session, org_id: uuid.UUID, project_id: uuid.UUID | None) -> bytes:
+    view = ProjectView(include=None, fields=None)
+    query = select(Project).where(Project.org_id == org_id).options(*view.options())
+    if project_id:
+        result = await session.execute(query.where(Project.id == project_id))
+        return JSONResponse(jsonable_encoder(view.dump(result.scalar_one()))).body
+    result = await session.execute(query.order_by(Project.created_at.desc(), Project.id.desc()).limit(PROJECTS))
+    return JSONResponse(jsonable_encoder([view.dump(p) for p in result.scalars().all()])).body
+
+
+async def json_body(session, org_id: uuid.UUID, project_id: uuid.UUID | None) -> bytes:
+    query = project_documents(session).where(Project.org_id == org_id)
+    if project_id:
+        result = await session.execute(query.where(Project.id == project_id))
+        return result.scalar_one().encode()
+    result = await session.execute(query.order_by(Project.created_at.desc(), Project.id.desc()).limit(PROJECTS))
+    return json_array([r.doc for r in result.all()]).encode()
+
+
+async def timed(sessions, read, org_id: uuid.UUID, project_id: uuid.UUID | None) -> tuple[float, bytes]:
+    """Median seconds of REPEAT reads, each in a fresh session, and the body."""
+    times = []
+    for _ in range(REPEAT):
+        async with sessions() as session:
+            started = time.perf_counter()
+            body = await read(session, org_id, project_id)
+            times.append(time.perf_counter() - started)
+    return statistics.median(times), body
+
+
+async def main(url: str) -> None:
+    engine = create_async_engine(url)
+    ordered, org_id = seed_rows()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for model, items in ordered:
+            await conn.execute(insert(model), items)
+    project_id = ordered[1][1][0]['id']
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    print(f"{engine.dialect.name}: {PROJECTS} projects x {len(MARKETS)} launches x {GATEWAYS_PER_LAUNCH} gateways "
+          f"x {VERSIONS_PER_GATEWAY} versions")
+    for label, target in [(f"list ({PROJECTS} projects)", None), ("detail (1 project)", project_id)]:
+        orm_time, orm = await timed(sessions, orm_body, org_id, target)
+        json_time, doc = await timed(sessions, json_body, org_id, target)
+        print(
+            f"{label:<22} ORM {orm_time * 1000:8.1f} ms   DB JSON {json_time * 1000:8.1f} ms   "
+            f"x{orm_time / json_time:4.1f}   {len(doc)} bytes, {'identical' if doc == orm else 'DIFFERENT'}"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Scratch database URL (default: a temporary SQLite file)")
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(main(args.url))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(main(f"sqlite+aiosqlite:///{os.path.join(directory, 'projects.db')}"))
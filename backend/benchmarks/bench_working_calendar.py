@@ -0,0 +1,87 @@
+"""
+Benchmark for working-day date math.
+
+Times WorkingCalendar.add for growing offsets (it should not depend on the
+offset), then propagates a date change through synthetic projects of FS chains
+on a plain calendar and on a Mon-Fri calendar with ten years of holidays. No
+database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_working_calendar
+"""
+
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.services.dependency_graph import propagate_dates
+from app.services.working_calendar import WorkingCalendar
+
+OFFSETS = [1, 100, 10_000]
+TASK_COUNTS = [1_000, 10_000, 100_000]
+REPEAT = 100_000
+
+
+def holidays(rng: random.Random) -> list[date]:
+    """Twelve random holidays a year over ten years."""
+    return [
+        date(year, rng.randint(1, 12), rng.randint(1, 28))
+        for year in range(2026, 2036)
+        for _ in range(12)
+    ]
+
+
+def build_project(task_count: int, rng: random.Random) -> tuple[dict, list, list]:
+    """Chains of 1-50 two-day tasks, each chain starting on the same Monday."""
+    nodes = {}
+    edges = []
+    roots = []
+    start = date(2026, 1, 5)
+    while len(nodes) < task_count:
+        previous = None
+        for _ in range(min(rng.randint(1, 50), task_count - len(nodes))):
+            task_id = uuid.uuid4()
+            nodes[task_id] = {'id': task_id, 'start_date': start, 'end_date': start + timedelta(days=1)}
+            if previous:
+                edges.append((previous, task_id, 'FS', 0))
+            else:
+                roots.append(task_id)
+            previous = task_id
+    return nodes, edges, roots
+
+
+def bench_offsets(calendar: WorkingCalendar) -> None:
+    day = date(2026, 3, 2)
+    for offset in OFFSETS:
+        calendar.add(day, offset)  # compile the window outside the timing
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            calendar.add(day, offset)
+        elapsed = (time.perf_counter() - started) / REPEAT
+        print(f"add({offset:>6} working days): {elapsed * 1e9:6.0f} ns")
+
+
+def bench_propagation(task_count: int, calendar: WorkingCalendar, label: str) -> None:
+    rng = random.Random(42)
+    nodes, edges, roots = build_project(task_count, rng)
+    # Roots end a week later, so every task downstream has to move
+    for root in roots:
+        nodes[root]['end_date'] += timedelta(days=7)
+
+    started = time.perf_counter()
+    shifted = propagate_dates(nodes, edges, roots, calendar)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{task_count:>7} tasks, {label:<22}: {len(shifted):>6} shifted in {elapsed * 1000:7.1f} ms "
+        f"({elapsed / max(len(shifted), 1) * 1e6:4.1f} us/task)"
+    )
+
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+    workdays = WorkingCalendar("1111100", holidays(rng))
+    bench_offsets(workdays)
+    for task_count in TASK_COUNTS:
+        bench_propagation(task_count, WorkingCalendar.every_day(), "every day")
+        bench_propagation(task_count, WorkingCalendar("1111100", holidays(rng)), "Mon-Fri with holidays")
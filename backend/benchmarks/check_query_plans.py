@@ -0,0 +1,320 @@
+"""
+Query-plan regression check.
+
+Seeds a database with a few organizations' worth of projects, tasks, launches,
+gateways and initiatives, then EXPLAINs the main query of each router (and the
+child lookups their selectinloads issue) and fails if any of them reads a
+table with a full sequential scan instead of an index. The task and project
+lists, including project documents, are built by the routers' own query
+builders.
+
+SQLite (default, a temporary file) flags `SCAN <table>` plan steps that use
+no index; PostgreSQL runs with `enable_seqscan = off` and flags `Seq Scan`
+nodes, so a small seed still shows whether a usable index exists. Point
+--url at a scratch database only: tables are created and seeded in it.
+
+Usage (from backend/):
+    python -m benchmarks.check_query_plans
+    python -m benchmarks.check_query_plans --url postgresql+asyncpg://.../scratch
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.database import Base
+from app.models import (
+    Organization, User, UserAssignment, Resource, Project, LaunchDetail, InputGateway, GatewayVersion,
+    Task, TaskMarketStatus, TaskDependency, Initiative, InitiativeValueMetric, InitiativeTaskLink,
+    InitiativeTaskValue, TaskTemplate, GatewayTemplate, Team, Market, Holiday, CapacityLedgerEntry
+)
+from app.pagination import DEFAULT_PAGE_SIZE, PageParams, encode_cursor
+from app.routers.projects import project_list_query
+from app.routers.tasks import task_list_query
+from app.services import project_documents
+
+ORGS = 3
+PROJECTS_PER_ORG = 40
+TASKS_PER_PROJECT = 50
+MARKETS = ["UK", "DE", "FR"]
+
+
+def seed_rows(rng: random.Random) -> tuple[list[tuple], dict]:
+    """Rows to insert, in foreign-key order, and the ids the queries filter on."""
+    now = datetime(2026, 1, 1)
+    orgs, users, assignments, resources, projects, launches, gateways, versions = [], [], [], [], [], [], [], []
+    tasks, statuses, dependencies, initiatives, metrics, links, values = [], [], [], [], [], [], []
+    task_templates, gateway_templates, teams, markets, holidays, ledger = [], [], [], [], [], []
+
+    for o in range(ORGS):
+        org_id = uuid.uuid4()
+        orgs.append({'id': org_id, 'name': f"Org {o}", 'slug': f"org-{o}", 'created_at': now})
+        for m in MARKETS:
+            markets.append({'id': uuid.uuid4(), 'org_id': org_id, 'name': m})
+            holidays.append({'id': uuid.uuid4(), 'org_id': org_id, 'day': date(2026, 12, 25), 'name': "Christmas"})
+        for team in ["Web", "Content"]:
+            teams.append({'id': uuid.uuid4(), 'org_id': org_id, 'name': team})
+            for scale in ["Small", "Large"]:
+                gateway_templates.append({
+                    'id': uuid.uuid4(), 'org_id': org_id, 'team': team, 'scale': scale, 'name': "Copy", 'offset_weeks': 1
+                })
+                for order in range(5):
+                    task_templates.append({
+                        'id': uuid.uuid4(), 'org_id': org_id, 'team': team, 'scale': scale,
+                        'task_order': order, 'title': f"Step {order}"
+                    })
+
+        org_resources = []
+        for r in range(20):
+            user_id = uuid.uuid4()
+            users.append({
+                'id': user_id, 'email': f"u{o}-{r}@example.com", 'name': f"User {r:02d}",
+                'global_role': "standard", 'capacity_hours': 160, 'is_active': True, 'created_at': now
+            })
+            assignments.append({
+                'id': uuid.uuid4(), 'user_id': user_id, 'org_id': org_id, 'is_primary': True,
+                'allocation_percent': 100, 'created_at': now + timedelta(minutes=r)
+            })
+            resource_id = uuid.uuid4()
+            org_resources.append(resource_id)
+            resources.append({
+                'id': resource_id, 'org_id': org_id, 'user_id': user_id, 'name': f"User {r:02d}",
+                'capacity': 160, 'leave_hours': 0
+            })
+            ledger.append({
+                'id': uuid.uuid4(), 'org_id': org_id, 'assignee_id': resource_id, 'period': "month",
+                'bucket_start': date(2026, 1, 1), 'booked_hours': 40.0
+            })
+
+        org_initiatives = []
+        for i in range(10):
+            initiative_id = uuid.uuid4()
+            org_initiatives.append(initiative_id)
+            initiatives.append({
+                'id': initiative_id, 'org_id': org_id, 'name': f"Initiative {i}", 'status': "Active",
+                'created_at': now + timedelta(hours=i)
+            })
+            metrics.append({'id': uuid.uuid4(), 'initiative_id': initiative_id, 'metric_name': "Revenue"})
+
+        for p in range(PROJECTS_PER_ORG):
+            project_id = uuid.uuid4()
+            start = date(2026, 1, 5) + timedelta(days=rng.randint(0, 300))
+            projects.append({
+                'id': project_id, 'org_id': org_id, 'name': f"Project {p}", 'status': rng.choice(["Planning", "Active"]),
+                'health': "On Track", 'start_date': start, 'end_date': start + timedelta(days=90),
+                'created_at': now + timedelta(hours=p)
+            })
+            for market in MARKETS:
+                launch_id = uuid.uuid4()
+                launches.append({'id': launch_id, 'project_id': project_id, 'market': market, 'goal_live': start})
+                gateway_id = uuid.uuid4()
+                gateways.append({'id': gateway_id, 'launch_detail_id': launch_id, 'name': "Copy", 'status': "Pending"})
+                versions.append({'id': uuid.uuid4(), 'gateway_id': gateway_id, 'version_number': 1, 'date': start, 'created_at': now})
+
+            previous = None
+            for t in range(TASKS_PER_PROJECT):
+                task_id = uuid.uuid4()
+                day = start + timedelta(days=t)
+                tasks.append({
+                    'id': task_id, 'org_id': org_id, 'project_id': project_id, 'title': f"Task {t}",
+                    'status': rng.choice(["Planning", "Done"]), 'assignee_id': rng.choice(org_resources),
+                    'estimate': 8, 'actual': 0, 'start_date': day, 'end_date': day + timedelta(days=1),
+                    'predecessor_id': previous, 'is_market_specific': True, 'is_rework': False,
+                    'linked_initiative_id': rng.choice(org_initiatives) if t % 10 == 0 else None
+                })
+                statuses.append({'id': uuid.uuid4(), 'task_id': task_id, 'market': "UK", 'status': "Planning"})
+                if previous and t % 5 == 0:
+                    dependencies.append({
+                        'id': uuid.uuid4(), 'org_id': org_id, 'predecessor_id': previous, 'successor_id': task_id,
+                        'type': "SS", 'lag_days': 1
+                    })
+                if t % 10 == 0:
+                    link_id = uuid.uuid4()
+                    links.append({
+                        'id': link_id, 'initiative_id': tasks[-1]['linked_initiative_id'], 'task_id': task_id,
+                        'date_linked': now
+                    })
+                    values.append({'id': uuid.uuid4(), 'link_id': link_id, 'metric_name': "Revenue", 'value': 10})
+                previous = task_id
+
+    # Tasks reference their predecessor, so insert them without it and link afterwards
+    task_links = [{'id': t['id'], 'predecessor_id': t['predecessor_id']} for t in tasks if t['predecessor_id']]
+    tasks = [{**t, 'predecessor_id': None} for t in tasks]
+
+    ordered = [
+        (Organization, orgs), (User, users), (UserAssignment, assignments),
+        (Resource, resources), (Market, markets), (Team, teams), (Holiday, holidays),
+        (TaskTemplate, task_templates), (GatewayTemplate, gateway_templates),
+        (Initiative, initiatives), (InitiativeValueMetric, metrics), (Project, projects),
+        (LaunchDetail, launches), (InputGateway, gateways), (GatewayVersion, versions),
+        (Task, tasks), (TaskMarketStatus, statuses), (TaskDependency, dependencies),
+        (InitiativeTaskLink, links), (InitiativeTaskValue, values), (CapacityLedgerEntry, ledger),
+    ]
+    sample = tasks[len(tasks) // 2]
+    ids = {
+        'org': orgs[0]['id'],
+        'project': sample['project_id'],
+        'task': sample['id'],
+        'assignee': sample['assignee_id'],
+        'initiative': initiatives[0]['id'],
+        'launch': launches[0]['id'],
+        'gateway': gateways[0]['id'],
+        'user': users[0]['id'],
+        'task_links': task_links,
+    }
+    return ordered, ids
+
+
+def queries(ids: dict, db: AsyncSession) -> dict:
+    """Main query of each list/detail route, plus the child lookups of its selectinloads."""
+    org, window = ids['org'], (date(2026, 3, 1), date(2026, 3, 31))
+    first_page = PageParams(limit=DEFAULT_PAGE_SIZE, cursor=None)
+    next_tasks = PageParams(limit=DEFAULT_PAGE_SIZE, cursor=encode_cursor([date(2026, 3, 1), ids['task']]))
+    next_projects = PageParams(limit=DEFAULT_PAGE_SIZE, cursor=encode_cursor([datetime(2026, 1, 2), ids['project']]))
+    return {
+        # projects router
+        "projects: list page": project_list_query(select(Project), org, first_page),
+        "projects: list next page": project_list_query(select(Project), org, next_projects),
+        "projects: list by status and window": project_list_query(
+            select(Project), org, first_page, "Active", None, *window
+        ),
+        "projects: documents page": project_list_query(project_documents(db), org, first_page),
+        "projects: documents by status and window": project_list_query(
+            project_documents(db), org, first_page, "Active", None, *window
+        ),
+        "projects: launch details (selectin)": select(LaunchDetail).where(LaunchDetail.project_id.in_([ids['project']])),
+        "projects: gateways (selectin)": select(InputGateway).where(InputGateway.launch_detail_id.in_([ids['launch']])),
+        "projects: gateway versions (selectin)": select(GatewayVersion).where(GatewayVersion.gateway_id.in_([ids['gateway']])),
+        "projects: project markets (calendar)": select(LaunchDetail.market).where(LaunchDetail.project_id == ids['project']),
+        # tasks router
+        "tasks: list page": task_list_query(org, first_page),
+        "tasks: list next page": task_list_query(org, next_tasks),
+        "tasks: list by project": task_list_query(org, first_page, project_id=ids['project']),
+        "tasks: list by assignee": task_list_query(org, first_page, assignee_id=ids['assignee']),
+        "tasks: list by window": task_list_query(org, first_page, start=window[0], end=window[1]),
+        "tasks: market statuses (selectin)": select(TaskMarketStatus).where(TaskMarketStatus.task_id.in_([ids['task']])),
+        "tasks: legacy successors": select(Task.id).where(Task.predecessor_id == ids['task']),
+        "tasks: typed predecessors": select(TaskDependency).where(TaskDependency.successor_id == ids['task']),
+        "tasks: typed successors": select(TaskDependency).where(TaskDependency.predecessor_id == ids['task']),
+        "tasks: initiative tasks": select(Task.id).where(Task.linked_initiative_id == ids['initiative']),
+        # resources router
+        "resources: list page": select(Resource).where(Resource.org_id == org)
+            .order_by(Resource.name, Resource.id).limit(101),
+        "resources: ledger by assignee": select(CapacityLedgerEntry).where(
+            CapacityLedgerEntry.assignee_id == ids['assignee'], CapacityLedgerEntry.period == "month"
+        ),
+        # initiatives router
+        "initiatives: list page": select(Initiative).where(Initiative.org_id == org)
+            .order_by(Initiative.created_at.desc(), Initiative.id.desc()).limit(101),
+        "initiatives: value metrics (selectin)": select(InitiativeValueMetric)
+            .where(InitiativeValueMetric.initiative_id.in_([ids['initiative']])),
+        "initiatives: task links (selectin)": select(InitiativeTaskLink)
+            .where(InitiativeTaskLink.initiative_id.in_([ids['initiative']])),
+        "initiatives: link values (selectin)": select(InitiativeTaskValue)
+            .where(InitiativeTaskValue.link_id.in_(select(InitiativeTaskLink.id).where(
+                InitiativeTaskLink.initiative_id == ids['initiative']
+            ))),
+        "initiatives: links of a task": select(InitiativeTaskLink).where(InitiativeTaskLink.task_id == ids['task']),
+        # admin router
+        "admin: users page": select(User).order_by(User.name, User.id).limit(101),
+        "admin: assignments page": select(UserAssignment)
+            .order_by(UserAssignment.created_at, UserAssignment.id).limit(101),
+        "admin: assignments of a user": select(UserAssignment).where(UserAssignment.user_id == ids['user']),
+        # templates and calendar
+        "templates: task templates": select(TaskTemplate).where(
+            TaskTemplate.org_id == org, TaskTemplate.team == "Web", TaskTemplate.scale == "Small"
+        ).order_by(TaskTemplate.task_order),
+        "templates: gateway templates": select(GatewayTemplate).where(
+            GatewayTemplate.org_id == org, GatewayTemplate.team == "Web", GatewayTemplate.scale == "Small"
+        ),
+        "templates: teams": select(Team).where(Team.org_id == org),
+        "templates: markets": select(Market).where(Market.org_id == org, Market.name == "UK"),
+        "calendar: holidays": select(Holiday).where(Holiday.org_id == org).order_by(Holiday.day),
+    }
+
+
+def sqlite_full_scans(plan: list) -> list[str]:
+    """
+    `SCAN <table>` steps that use no index (EXPLAIN QUERY PLAN detail column).
+    Scans of subquery results (co-routines, materialized views) read rows
+    that were already looked up, and are not counted.
+    """
+    subqueries = {
+        row[-1].split(" ", 1)[1] for row in plan if row[-1].startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    }
+    return [
+        row[-1] for row in plan
+        if row[-1].startswith("SCAN ") and "USING" not in row[-1] and "CONSTANT ROW" not in row[-1]
+        and row[-1].split(" ")[1] not in subqueries
+    ]
+
+
+def postgres_full_scans(node: dict) -> list[str]:
+    """`Seq Scan` nodes of an EXPLAIN (FORMAT JSON) plan tree."""
+    found = []
+    if node.get("Node Type") == "Seq Scan":
+        found.append(f"Seq Scan on {node.get('Relation Name')}")
+    for child in node.get("Plans", []):
+        found.extend(postgres_full_scans(child))
+    return found
+
+
+async def main(url: str) -> int:
+    engine = create_async_engine(url)
+    dialect = engine.dialect.name
+    ordered, ids = seed_rows(random.Random(42))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for model, items in ordered:
+            if items:
+                await conn.execute(insert(model), items)
+        for link in ids['task_links']:
+            await conn.execute(
+                Task.__table__.update().where(Task.id == link['id']).values(predecessor_id=link['predecessor_id'])
+            )
+        await conn.execute(text("ANALYZE"))
+
+    failures = 0
+    async with AsyncSession(engine) as db:
+        conn = await db.connection()
+        if dialect == "postgresql":
+            await conn.execute(text("SET enable_seqscan = off"))
+        checked = queries(ids, db)
+        for name, query in checked.items():
+            sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            if dialect == "postgresql":
+                result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                plan = result.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                scans = postgres_full_scans(plan[0]["Plan"])
+            else:
+                result = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+                scans = sqlite_full_scans(result.all())
+            failures += bool(scans)
+            print(f"{'FAIL' if scans else 'ok  '}  {name}" + (f"  ({'; '.join(scans)})" if scans else ""))
+
+    await engine.dispose()
+    print(f"\n{failures} of {len(checked)} queries fall back to a full scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Scratch database URL (default: a temporary SQLite file)")
+    args = parser.parse_args()
+
+    if args.url:
+        sys.exit(asyncio.run(main(args.url)))
+    with tempfile.TemporaryDirectory() as directory:
+        sys.exit(asyncio.run(main(f"sqlite+aiosqlite:///{os.path.join(directory, 'plans.db')}")))
@@ -4,6 +4,9 @@
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || (import.meta.env.DEV ? 'http://localhost:8000/api' : '/api');
 
+// Largest page the list endpoints serve
+const PAGE_SIZE = 500;
+
 class ApiClient {
     constructor() {
         this.baseUrl = API_BASE_URL;
@@ -29,7 +32,7 @@ class ApiClient {
         return headers;
     }
 
-    async request(method, endpoint, data = null) {
+    async send(method, endpoint, data = null) {
         const url = `${this.baseUrl}${endpoint}`;
         const options = {
             method,
@@ -49,7 +52,7 @@ class ApiClient {
         }
 
         if (response.status === 204) {
-            return null;
+            return [null, response];
         }
 
         const json = await response.json();
@@ -58,9 +61,29 @@ class ApiClient {
             throw new Error(json.detail || 'Request failed');
         }
 
+        return [json, response];
+    }
+
+    async request(method, endpoint, data = null) {
+        const [json] = await this.send(method, endpoint, data);
         return json;
     }
 
+    // Fetch every page of a paginated list, following the X-Next-Cursor header
+    async getAll(endpoint) {
+        const items = [];
+        const separator = endpoint.includes('?') ? '&' : '?';
+        let cursor = null;
+        do {
+            const page = `${endpoint}${separator}limit=${PAGE_SIZE}` +
+                (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+            const [json, response] = await this.send('GET', page);
+            items.push(...json);
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        return items;
+    }
+
     get(endpoint) {
         return this.request('GET', endpoint);
     }
@@ -120,7 +143,7 @@ export const authApi = {
 // Projects API
 export const projectsApi = {
     list: () =>
-        apiClient.get('/projects'),
+        apiClient.getAll('/projects'),
 
     get: (id) =>
         apiClient.get(`/projects/${id}`),
@@ -142,7 +165,7 @@ export const projectsApi = {
 export const tasksApi = {
     list: (projectId = null) => {
         const endpoint = projectId ? `/tasks?project_id=${projectId}` : '/tasks';
-        return apiClient.get(endpoint);
+        return apiClient.getAll(endpoint);
     },
 
     get: (id) =>
@@ -164,7 +187,7 @@ export const tasksApi = {
 // Resources API
 export const resourcesApi = {
     list: () =>
-        apiClient.get('/resources'),
+        apiClient.getAll('/resources'),
 
     // Get tiered resources (primary vs shared) for task assignment
     getAvailable: () =>
@@ -187,7 +210,7 @@ export const resourcesApi = {
 // Initiatives API
 export const initiativesApi = {
     list: () =>
-        apiClient.get('/initiatives'),
+        apiClient.getAll('/initiatives'),
 
     get: (id) =>
         apiClient.get(`/initiatives/${id}`),
@@ -7,6 +7,7 @@ import { useQueryClient } from '@tanstack/react-query';
 import { useWebSocket } from '../hooks/useWebSocket';
 import { useAuth } from './AuthContext';
 import { queryKeys } from '../hooks/useApi';
+import { applyDelta } from '../utils/jsonPatch';
 
 const RealTimeContext = createContext(null);
 
@@ -14,22 +15,97 @@ export function RealTimeProvider({ children }) {
     const queryClient = useQueryClient();
     const { isAuthenticated } = useAuth();
 
+    // Patch the cached copies of an entity (lists and detail) with a delta
+    // event; returns false if a copy missed a version and must be refetched.
+    const patchCached = useCallback((queryKey, delta) => {
+        let current = true;
+        for (const [key, data] of queryClient.getQueriesData({ queryKey })) {
+            if (Array.isArray(data)) {
+                const index = data.findIndex((item) => item.id === delta.id);
+                if (index === -1) continue;
+                const patched = applyDelta(data[index], delta);
+                if (!patched) { current = false; continue; }
+                queryClient.setQueryData(key, data.map((item, i) => (i === index ? patched : item)));
+            } else if (data && data.id === delta.id) {
+                const patched = applyDelta(data, delta);
+                if (!patched) { current = false; continue; }
+                queryClient.setQueryData(key, patched);
+            }
+        }
+        return current;
+    }, [queryClient]);
+
+    // Drop deleted entities from cached lists and their cached details;
+    // `keep` may also rewrite the items that stay.
+    const removeCached = useCallback((queryKey, isDeleted, keep = (item) => item) => {
+        for (const [key, data] of queryClient.getQueriesData({ queryKey })) {
+            if (Array.isArray(data)) {
+                queryClient.setQueryData(key, data.filter((item) => !isDeleted(item)).map(keep));
+            } else if (data && isDeleted(data)) {
+                queryClient.removeQueries({ queryKey: key, exact: true });
+            }
+        }
+    }, [queryClient]);
+
     // Handle incoming WebSocket messages
     const handleMessage = useCallback((message) => {
         const { type, payload } = message;
 
         // Invalidate relevant queries based on event type
         switch (type) {
-            case 'PROJECT_CREATED':
             case 'PROJECT_UPDATED':
-            case 'PROJECT_DELETED':
             case 'GATEWAY_UPDATED':
+                if (!payload.patch || !patchCached(queryKeys.projects, payload)) {
+                    queryClient.invalidateQueries({ queryKey: queryKeys.projects });
+                }
+                queryClient.invalidateQueries({ queryKey: queryKeys.portfolioHealth });
+                break;
+
+            case 'PROJECT_SHIFTED':
+                // The project moved with all its tasks (and pushed successors elsewhere)
+                queryClient.invalidateQueries({ queryKey: queryKeys.projects });
+                queryClient.invalidateQueries({ queryKey: queryKeys.tasks });
+                queryClient.invalidateQueries({ queryKey: queryKeys.portfolioHealth });
+                break;
+
+            case 'PROJECTS_DELETED': {
+                const deleted = new Set(payload.ids);
+                removeCached(queryKeys.projects, (project) => deleted.has(project.id));
+                // Their tasks went with them
+                removeCached(queryKeys.tasks, (task) => deleted.has(task.project_id));
+                queryClient.invalidateQueries({ queryKey: queryKeys.portfolioHealth });
+                break;
+            }
+
+            case 'PROJECT_CREATED':
+            case 'PROJECT_DELETED':
                 queryClient.invalidateQueries({ queryKey: queryKeys.projects });
                 queryClient.invalidateQueries({ queryKey: queryKeys.portfolioHealth });
                 break;
 
-            case 'TASK_CREATED':
             case 'TASK_UPDATED':
+                // Pushed successors are other tasks: refetch when there are any
+                if (!payload.patch || !patchCached(queryKeys.tasks, payload) || payload.cascaded_tasks?.length) {
+                    queryClient.invalidateQueries({ queryKey: queryKeys.tasks });
+                }
+                break;
+
+            case 'TASKS_UPDATED':
+                // A batch of edits, plus the successors it pushed
+                queryClient.invalidateQueries({ queryKey: queryKeys.tasks });
+                queryClient.invalidateQueries({ queryKey: queryKeys.projects });
+                break;
+
+            case 'TASKS_DELETED': {
+                const deleted = new Set(payload.ids);
+                // Surviving successors lost the deleted tasks as predecessors
+                removeCached(queryKeys.tasks, (task) => deleted.has(task.id), (task) => (
+                    deleted.has(task.predecessor_id) ? { ...task, predecessor_id: null } : task
+                ));
+                break;
+            }
+
+            case 'TASK_CREATED':
             case 'TASK_DELETED':
             case 'TASKS_AUTO_ASSIGNED':
                 queryClient.invalidateQueries({ queryKey: queryKeys.tasks });
@@ -48,6 +124,22 @@ export function RealTimeProvider({ children }) {
                 queryClient.invalidateQueries({ queryKey: queryKeys.initiativeValue });
                 break;
 
+            case 'CALENDAR_UPDATED':
+                // Working days moved: schedules are counted on the new calendar
+                queryClient.invalidateQueries({ queryKey: queryKeys.projects });
+                queryClient.invalidateQueries({ queryKey: queryKeys.tasks });
+                break;
+
+            case 'BATCH':
+                // Coalesced events, in order for each entity
+                payload.events.forEach(handleMessage);
+                break;
+
+            case 'RESYNC_REQUIRED':
+                // Missed updates could not be replayed
+                queryClient.invalidateQueries();
+                break;
+
             case 'CONNECTED':
                 console.log('Real-time connection established:', payload.message);
                 break;
@@ -55,7 +147,7 @@ export function RealTimeProvider({ children }) {
             default:
                 console.log('Unknown WebSocket event:', type);
         }
-    }, [queryClient]);
+    }, [queryClient, patchCached, removeCached]);
 
     const { isConnected, disconnect, reconnect } = useWebSocket(
         isAuthenticated ? handleMessage : null
@@ -1,5 +1,10 @@
 /**
  * WebSocket hook for real-time updates
+ *
+ * Broadcast frames carry the org's sequence number (`seq`). The hook keeps the
+ * last one seen and reconnects with `?since=<seq>`, so the server replays what
+ * was missed. When it cannot (or a number is skipped), the handler receives a
+ * RESYNC_REQUIRED message and should refetch.
  */
 
 import { useEffect, useRef, useCallback, useState } from 'react';
@@ -9,6 +14,7 @@ const WS_BASE_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/ws';
 export function useWebSocket(onMessage) {
     const wsRef = useRef(null);
     const reconnectTimeoutRef = useRef(null);
+    const lastSeqRef = useRef(null);
     const [isConnected, setIsConnected] = useState(false);
 
     const connect = useCallback(() => {
@@ -18,7 +24,8 @@ export function useWebSocket(onMessage) {
             return;
         }
 
-        const wsUrl = `${WS_BASE_URL}?token=${token}`;
+        const since = lastSeqRef.current;
+        const wsUrl = `${WS_BASE_URL}?token=${token}${since !== null ? `&since=${since}` : ''}`;
 
         try {
             wsRef.current = new WebSocket(wsUrl);
@@ -32,6 +39,17 @@ export function useWebSocket(onMessage) {
                 try {
                     const data = JSON.parse(event.data);
                     console.log('WebSocket message:', data);
+                    const lastSeq = lastSeqRef.current;
+                    if (data.seq !== undefined) {
+                        if (lastSeq !== null && data.seq <= lastSeq) return; // already seen
+                        lastSeqRef.current = data.seq;
+                        if (lastSeq !== null && data.seq > lastSeq + 1 && onMessage) {
+                            // Frames were dropped on the way: refetch, then carry on
+                            onMessage({ type: 'RESYNC_REQUIRED', payload: { seq: data.seq } });
+                        }
+                    } else if (data.type === 'RESYNC_REQUIRED' || (data.type === 'CONNECTED' && lastSeq === null)) {
+                        lastSeqRef.current = data.payload.seq ?? null;
+                    }
                     if (onMessage) {
                         onMessage(data);
                     }
@@ -69,6 +87,7 @@ export function useWebSocket(onMessage) {
             wsRef.current.close(1000, 'User disconnected');
             wsRef.current = null;
         }
+        lastSeqRef.current = null;
         setIsConnected(false);
     }, []);
 
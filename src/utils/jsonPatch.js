@@ -0,0 +1,47 @@
+/**
+ * Delta-encoded real-time events
+ *
+ * Update events carry a JSON Patch (add/remove/replace) between two versions
+ * of an entity: { id, version, base_version, patch }. A cached copy at
+ * base_version is patched forward; any other copy missed a change and the
+ * caller refetches it.
+ */
+
+const unescape = (token) => token.replace(/~1/g, '/').replace(/~0/g, '~');
+
+/** Apply a patch to a copy of `doc` and return the copy. */
+export function applyPatch(doc, patch) {
+    const result = structuredClone(doc);
+    for (const { op, path, value } of patch) {
+        const tokens = path.split('/').slice(1).map(unescape);
+        const last = tokens.pop();
+        let target = result;
+        for (const token of tokens) {
+            target = target[Array.isArray(target) ? Number(token) : token];
+        }
+        if (Array.isArray(target)) {
+            if (op === 'add') {
+                if (last === '-') target.push(value);
+                else target.splice(Number(last), 0, value);
+            } else if (op === 'remove') {
+                target.splice(Number(last), 1);
+            } else {
+                target[Number(last)] = value;
+            }
+        } else if (op === 'remove') {
+            delete target[last];
+        } else {
+            target[last] = value;
+        }
+    }
+    return result;
+}
+
+/**
+ * Move a cached entity to the event's version.
+ * Returns the patched entity, or null if the copy is not at base_version.
+ */
+export function applyDelta(entity, delta) {
+    if (!entity || entity.version !== delta.base_version) return null;
+    return { ...applyPatch(entity, delta.patch), version: delta.version };
+}